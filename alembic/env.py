@@ -13,9 +13,10 @@ from alembic import context
 # Import our application's Base and settings
 from app.db.base import Base
 from app.core.config import settings
+from app.db.session import get_sync_database_url
 
 # Import all models so Alembic can detect them
-from app.db.models import Role, User, RefreshToken  # noqa: F401
+from app.db.models import Permission, Role, User, RefreshToken  # noqa: F401
 
 # This is the Alembic Config object
 config = context.config
@@ -27,7 +28,7 @@ if config.config_file_name is not None:
 
 # Set the SQLAlchemy URL from our settings
 # This overrides the sqlalchemy.url in alembic.ini
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+config.set_main_option("sqlalchemy.url", get_sync_database_url(settings.DATABASE_URL))
 
 # Add your model's MetaData object here for 'autogenerate' support
 target_metadata = Base.metadata
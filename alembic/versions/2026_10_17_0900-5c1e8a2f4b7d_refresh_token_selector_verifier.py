@@ -0,0 +1,56 @@
+"""Refresh tokens: jti selector + SHA-256 verifier
+
+Replaces the non-unique `token_hash` String(255) column with:
+- `jti`: unique-indexed selector carried in the refresh JWT
+- `token_digest`: 32-byte SHA-256 of the token (compact binary verifier)
+
+Existing rows were issued without a `jti` claim, so they can never be
+presented with a matching selector. They get a placeholder `jti`, a
+digest derived from the old value, and are marked revoked; affected
+clients simply log in again.
+
+Revision ID: 5c1e8a2f4b7d
+Revises: 39371510b6b2
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8a2f4b7d'
+down_revision: Union[str, None] = '39371510b6b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('jti', sa.String(length=64), nullable=True, comment='Token identifier (selector) from the JWT jti claim'))
+    op.add_column('refresh_tokens', sa.Column('token_digest', sa.LargeBinary(length=32), nullable=True, comment='SHA-256 digest of the refresh token (never store plain tokens!)'))
+
+    # Backfill legacy rows: unreachable without a jti, so revoke them
+    op.execute(
+        "UPDATE refresh_tokens "
+        "SET jti = 'legacy-' || id::text, "
+        "    token_digest = sha256(convert_to(token_hash, 'UTF8')), "
+        "    is_revoked = true"
+    )
+
+    op.alter_column('refresh_tokens', 'jti', nullable=False)
+    op.alter_column('refresh_tokens', 'token_digest', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_jti'), 'refresh_tokens', ['jti'], unique=True)
+    op.drop_index(op.f('ix_refresh_tokens_token_hash'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
+
+
+def downgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.String(length=255), nullable=True, comment='Hashed refresh token (never store plain tokens!)'))
+    op.execute("UPDATE refresh_tokens SET token_hash = encode(token_digest, 'hex')")
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.create_index(op.f('ix_refresh_tokens_token_hash'), 'refresh_tokens', ['token_hash'], unique=False)
+    op.drop_index(op.f('ix_refresh_tokens_jti'), table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_digest')
+    op.drop_column('refresh_tokens', 'jti')
@@ -0,0 +1,40 @@
+"""Refresh tokens: revoked_at for purge retention, trim redundant indexes
+
+- Adds `revoked_at` with a partial index (WHERE is_revoked) used by the
+  purger to find long-revoked rows.
+- Drops `ix_refresh_tokens_id` (duplicates the primary key index) and
+  `ix_refresh_tokens_is_revoked` (boolean, never selective); both only
+  slowed down every insert.
+
+Revision ID: 8d2b6f1a9e43
+Revises: 5c1e8a2f4b7d
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2b6f1a9e43'
+down_revision: Union[str, None] = '5c1e8a2f4b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('revoked_at', sa.DateTime(), nullable=True, comment='When this token was revoked (purged after a retention period)'))
+    # Revocation time of existing rows is unknown: start their retention now
+    op.execute("UPDATE refresh_tokens SET revoked_at = now() WHERE is_revoked")
+    op.create_index('ix_refresh_tokens_revoked_at', 'refresh_tokens', ['revoked_at'], unique=False, postgresql_where=sa.text('is_revoked'))
+    op.drop_index(op.f('ix_refresh_tokens_is_revoked'), table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_id'), table_name='refresh_tokens')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_refresh_tokens_id'), 'refresh_tokens', ['id'], unique=False)
+    op.create_index(op.f('ix_refresh_tokens_is_revoked'), 'refresh_tokens', ['is_revoked'], unique=False)
+    op.drop_index('ix_refresh_tokens_revoked_at', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'revoked_at')
@@ -0,0 +1,38 @@
+"""Optionally partition refresh_tokens by expires_at month (PostgreSQL)
+
+Only acts when REFRESH_TOKENS_PARTITIONED is enabled and the database is
+PostgreSQL; otherwise this revision is a no-op. To switch an existing
+deployment later, use scripts/manage_token_partitions.py.
+
+Revision ID: b47e0c93d5a1
+Revises: 8d2b6f1a9e43
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.core.config import settings
+from app.db import partitions
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47e0c93d5a1'
+down_revision: Union[str, None] = '8d2b6f1a9e43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not settings.REFRESH_TOKENS_PARTITIONED or bind.dialect.name != "postgresql":
+        return
+    if not partitions.is_partitioned(bind):
+        partitions.partition_refresh_tokens(bind, months_ahead=settings.TOKEN_PARTITION_MONTHS_AHEAD)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql" and partitions.is_partitioned(bind):
+        partitions.unpartition_refresh_tokens(bind)
@@ -0,0 +1,28 @@
+"""Users: composite (created_at, id) index for keyset pagination
+
+Serves `GET /admin/users` pages as an index range scan starting at the
+cursor instead of an offset scan over every preceding row.
+
+Revision ID: e2a9c4d71f08
+Revises: b47e0c93d5a1
+Create Date: 2026-10-17 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c4d71f08'
+down_revision: Union[str, None] = 'b47e0c93d5a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_created_at_id', table_name='users')
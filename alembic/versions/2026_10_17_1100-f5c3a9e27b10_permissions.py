@@ -0,0 +1,71 @@
+"""Permissions: permissions table, role grants and precomputed role masks
+
+Adds the permission catalog, the role_permissions mapping and
+roles.permission_mask (the OR of a role's granted bits, embedded in
+access tokens as the `perm` claim). Seeds the catalog and grants every
+permission to the existing 'admin' role.
+
+Revision ID: f5c3a9e27b10
+Revises: e2a9c4d71f08
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5c3a9e27b10'
+down_revision: Union[str, None] = 'e2a9c4d71f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Catalog as of this revision (app/core/permissions.py may grow later)
+PERMISSIONS = [
+    ('users:read', 0, 'List and view users'),
+    ('users:write', 1, 'Deactivate users and change their roles'),
+    ('users:export', 2, 'Export all users'),
+    ('users:import', 3, 'Bulk import users'),
+    ('roles:manage', 4, 'View roles and change their permissions'),
+    ('tokens:introspect', 5, 'Introspect access tokens'),
+    ('system:read', 6, 'Read runtime stats and traces'),
+]
+
+
+def upgrade() -> None:
+    permissions = op.create_table('permissions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False, comment="Unique permission name (e.g., 'users:read')"),
+    sa.Column('bit', sa.SmallInteger(), nullable=False, comment='Bit position in the role permission mask'),
+    sa.Column('description', sa.String(length=255), nullable=True, comment='What the permission allows'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name'),
+    sa.UniqueConstraint('bit')
+    )
+    op.create_table('role_permissions',
+    sa.Column('role_id', sa.Integer(), nullable=False),
+    sa.Column('permission_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['permission_id'], ['permissions.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['role_id'], ['roles.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('role_id', 'permission_id')
+    )
+    op.add_column('roles', sa.Column('permission_mask', sa.BigInteger(), server_default='0', nullable=False, comment='Bitmask of granted permissions'))
+
+    op.bulk_insert(permissions, [
+        {'name': name, 'bit': bit, 'description': description}
+        for name, bit, description in PERMISSIONS
+    ])
+    all_mask = sum(1 << bit for _, bit, _ in PERMISSIONS)
+    op.execute(
+        "INSERT INTO role_permissions (role_id, permission_id) "
+        "SELECT roles.id, permissions.id FROM roles CROSS JOIN permissions WHERE roles.name = 'admin'"
+    )
+    op.execute(f"UPDATE roles SET permission_mask = {all_mask} WHERE name = 'admin'")
+
+
+def downgrade() -> None:
+    op.drop_column('roles', 'permission_mask')
+    op.drop_table('role_permissions')
+    op.drop_table('permissions')
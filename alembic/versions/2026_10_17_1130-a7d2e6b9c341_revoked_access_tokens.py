@@ -0,0 +1,38 @@
+"""Access token denylist: revoked_access_tokens table
+
+Stores the jti of access tokens revoked before their expiry (logout).
+Workers mirror it in memory; rows are purged once the token expires.
+
+Revision ID: a7d2e6b9c341
+Revises: f5c3a9e27b10
+Create Date: 2026-10-17 11:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2e6b9c341'
+down_revision: Union[str, None] = 'f5c3a9e27b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('revoked_access_tokens',
+    sa.Column('jti', sa.String(length=64), nullable=False, comment="The revoked token's jti claim"),
+    sa.Column('expires_at', sa.DateTime(), nullable=False, comment="The revoked token's exp (row is purgeable afterwards)"),
+    sa.Column('revoked_at', sa.DateTime(), nullable=False, comment='When the token was revoked'),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index(op.f('ix_revoked_access_tokens_expires_at'), 'revoked_access_tokens', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_revoked_access_tokens_revoked_at'), 'revoked_access_tokens', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_revoked_access_tokens_revoked_at'), table_name='revoked_access_tokens')
+    op.drop_index(op.f('ix_revoked_access_tokens_expires_at'), table_name='revoked_access_tokens')
+    op.drop_table('revoked_access_tokens')
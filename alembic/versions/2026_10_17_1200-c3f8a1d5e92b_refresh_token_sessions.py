@@ -0,0 +1,52 @@
+"""Sessions: device metadata on refresh_tokens and a live-session index
+
+Adds session_id / session_started_at (carried across rotations),
+user_agent and device, plus a partial index on (user_id) over live
+(non-revoked) rows that INCLUDEs the listed columns on PostgreSQL, so
+listing a user's sessions is an index-only scan.
+
+Existing live tokens become one session each (session_id = jti).
+
+Revision ID: c3f8a1d5e92b
+Revises: a7d2e6b9c341
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d5e92b'
+down_revision: Union[str, None] = 'a7d2e6b9c341'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SESSION_COLUMNS = ['session_id', 'session_started_at', 'device', 'user_agent', 'created_at', 'expires_at']
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('session_id', sa.String(length=64), nullable=True, comment='Login session id (stable across rotations, `sid` claim)'))
+    op.add_column('refresh_tokens', sa.Column('session_started_at', sa.DateTime(), nullable=True, comment='When the session logged in'))
+    op.add_column('refresh_tokens', sa.Column('user_agent', sa.String(length=255), nullable=True, comment='User-Agent of the login request (truncated)'))
+    op.add_column('refresh_tokens', sa.Column('device', sa.String(length=64), nullable=True, comment="Device label derived from the User-Agent (e.g. 'Firefox on Linux')"))
+
+    # Revoked rows are never listed and get purged, so only live ones are backfilled
+    op.execute("UPDATE refresh_tokens SET session_id = jti, session_started_at = created_at WHERE NOT is_revoked")
+
+    op.create_index(
+        'ix_refresh_tokens_user_sessions', 'refresh_tokens', ['user_id'], unique=False,
+        postgresql_include=SESSION_COLUMNS,
+        postgresql_where=sa.text('NOT is_revoked'),
+        sqlite_where=sa.text('NOT is_revoked'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_tokens_user_sessions', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'device')
+    op.drop_column('refresh_tokens', 'user_agent')
+    op.drop_column('refresh_tokens', 'session_started_at')
+    op.drop_column('refresh_tokens', 'session_id')
@@ -0,0 +1,54 @@
+"""Per-user token version
+
+Adds users.token_version, embedded in access and refresh tokens as the
+`ver` claim. Bumping it (password change, global logout, deactivation)
+invalidates every token of the user with one single-row UPDATE.
+
+refresh_tokens.token_version records the version a token was issued
+under, so the session listing can skip tokens a bump invalidated; the
+session index is recreated to INCLUDE it.
+
+Revision ID: d4e9b2c7a130
+Revises: c3f8a1d5e92b
+Create Date: 2026-10-17 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e9b2c7a130'
+down_revision: Union[str, None] = 'c3f8a1d5e92b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OLD_SESSION_COLUMNS = ['session_id', 'session_started_at', 'device', 'user_agent', 'created_at', 'expires_at']
+SESSION_COLUMNS = OLD_SESSION_COLUMNS + ['token_version']
+
+
+def _create_session_index(include) -> None:
+    op.create_index(
+        'ix_refresh_tokens_user_sessions', 'refresh_tokens', ['user_id'], unique=False,
+        postgresql_include=include,
+        postgresql_where=sa.text('NOT is_revoked'),
+        sqlite_where=sa.text('NOT is_revoked'),
+    )
+
+
+def upgrade() -> None:
+    # Constant defaults: no table rewrite on PostgreSQL 11+
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default=sa.text('0'), nullable=False, comment='Tokens carrying an older version (`ver` claim) are rejected'))
+    op.add_column('refresh_tokens', sa.Column('token_version', sa.Integer(), server_default=sa.text('0'), nullable=False, comment="Owner's token version when issued (`ver` claim)"))
+
+    op.drop_index('ix_refresh_tokens_user_sessions', table_name='refresh_tokens')
+    _create_session_index(SESSION_COLUMNS)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_refresh_tokens_user_sessions', table_name='refresh_tokens')
+    _create_session_index(OLD_SESSION_COLUMNS)
+    op.drop_column('refresh_tokens', 'token_version')
+    op.drop_column('users', 'token_version')
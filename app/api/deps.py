@@ -3,13 +3,19 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal
+from app.db.session import SessionLocal, get_async_db
 from app.core.config import settings
+from app.core.constants import TOKEN_TYPE_ACCESS
+from app.core.denylist import access_denylist
 from app.core.security import decode_token
-from app.repositories.user_repo import UserRepository
+from app.core.principal import Principal, principal_cache
+from app.core.role_catalog import role_catalog
+from app.core.token_versions import token_versions
+from app.core.tracing import traced
+from app.repositories.user_repo import AsyncUserRepository
 from app.schemas.token import TokenPayload
-from app.db.models.user import User
 
 # This tells FastAPI that the token is sent in the Authorization header as "Bearer <token>"
 reusable_oauth2 = OAuth2PasswordBearer(
@@ -18,8 +24,9 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 def get_db() -> Generator:
     """
-    Dependency that creates a new database session for a request
+    Dependency that creates a new (sync) database session for a request
     and closes it after the request is finished.
+    Routes use the async `get_async_db`; this stays for sync callers.
     """
     try:
         db = SessionLocal()
@@ -27,48 +34,57 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db),
+@traced("deps.get_current_user")
+async def get_current_user(
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(reusable_oauth2)
-) -> User:
+) -> Principal:
     """
     Validate the token and return the current user.
+    
+    Revoked tokens are rejected from the in-memory denylist, outdated
+    ones by the token version cache. The user is served from the
+    principal cache when possible; the database is only hit on a miss
+    (or after an invalidation).
     """
     try:
         payload = decode_token(token)
         token_data = TokenPayload(**payload)
     except (JWTError, ValueError):
+        token_data = None
+    # Refresh tokens carry no sid and never enter the denylist
+    if token_data is None or token_data.type != TOKEN_TYPE_ACCESS:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-        
-    user_repo = UserRepository(db)
     
+    # Logged-out tokens and ended sessions (Bloom filter probes when not revoked)
+    if access_denylist.is_token_revoked(token_data.jti, token_data.sid):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+        
     # Convert string ID from token to UUID object
     from uuid import UUID
     user_id = UUID(token_data.sub)
-    user = user_repo.get_by_id(user_id)
     
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+    user = principal_cache.get(user_id)
+    if user is None:
+        user_repo = AsyncUserRepository(db)
+        db_user = await user_repo.get_auth_row(user_id)
+        
+        if not db_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        
+        role = await role_catalog.get_by_id(db, db_user.role_id)
+        user = Principal.from_user(db_user, role)
+        principal_cache.set(user_id, user)
+        token_versions.set(user_id, db_user.token_version)
+    
+    # Password change, global logout or deactivation since it was issued
+    if not await token_versions.is_current(db, user_id, token_data.ver):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
         
     return user
-
-def get_current_active_superuser(
-    current_user: User = Depends(get_current_user),
-) -> User:
-    """
-    Check if the current user has admin privileges.
-    """
-    # Assuming the role loaded via relationship is accessible as .role.name
-    # Since we eager load or access it, this depends on the model definition.
-    # In User model: role = relationship("Role", ...)
-    if current_user.role.name != "admin":
-        raise HTTPException(
-            status_code=403, detail="The user doesn't have enough privileges"
-        )
-    return current_user
\ No newline at end of file
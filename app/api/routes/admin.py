@@ -1,23 +1,214 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
 
-from app.api.deps import get_db, get_current_active_superuser
-from app.schemas.user import UserResponse
+from app.api.deps import get_async_db
+from app.core.constants import MAX_OFFSET, MAX_PAGE_SIZE, ROLE_USER
+from app.core.config import settings
+from app.core.hashing import hashing_executor
+from app.core.keys import key_ring
+from app.core.login_throttle import login_throttle
+from app.core.permissions import (
+    ROLES_MANAGE,
+    SYSTEM_READ,
+    USERS_EXPORT,
+    USERS_IMPORT,
+    USERS_READ,
+    USERS_WRITE,
+)
+from app.core.principal import principal_cache
+from app.core.role_catalog import role_catalog
+from app.core.token_versions import token_versions
+from app.core.tracing import ring_buffer
+from app.middlewares.auth_guard import require_permissions
+from app.middlewares.rate_limit import rate_limiter
+from app.schemas.role import RolePermissionsResponse, RolePermissionsUpdate
+from app.schemas.session import SessionResponse
+from app.schemas.token import TokenPayload
+from app.schemas.user import UserImportReport, UserPage, UserResponse, UserRoleUpdate
+from app.services.role_service import RoleService
+from app.services.session_service import SessionService
 from app.services.user_service import UserService
-from app.db.models.user import User
+from app.services.user_import_service import UserImportService
+from app.services.token_purge_service import token_purge_service
+from app.services.denylist_service import denylist_sync_service
+from app.utils.bulk_import import PARSERS
+from app.utils.export import EXPORT_MEDIA_TYPES
 
 router = APIRouter()
 
-@router.get("/users", response_model=List[UserResponse])
-def get_all_users(
-    skip: int = 0, 
-    limit: int = 100, 
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_superuser) # <--- Security added here
+@router.get("/users", response_model=UserPage)
+async def get_all_users(
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, le=MAX_OFFSET),
+    role: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(USERS_READ))
 ):
     """
     Get all users (Admin only).
+    
+    Page with `cursor` (pass back `next_cursor`); `skip` is for small offsets only.
     """
     user_service = UserService(db)
-    return user_service.get_all_users(skip=skip, limit=limit)
+    return await user_service.get_all_users(
+        limit=limit, cursor=cursor, skip=skip, role=role, is_active=is_active
+    )
+
+
+@router.get("/users/export")
+async def export_users(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(USERS_EXPORT))
+):
+    """
+    Stream every user as NDJSON or CSV (Admin only).
+    """
+    user_service = UserService(db)
+    return StreamingResponse(
+        user_service.export_users(format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="users.{format}"'},
+    )
+
+
+@router.post("/users/import", response_model=UserImportReport)
+async def import_users(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    default_role: str = ROLE_USER,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(USERS_IMPORT))
+):
+    """
+    Bulk-create users from an NDJSON or CSV request body (Admin only).
+    
+    Rows that fail validation or collide with existing users are listed
+    in the report; the rest are created.
+    """
+    try:
+        text = (await request.body()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Body must be UTF-8 encoded")
+    import_service = UserImportService(db)
+    return await import_service.import_users(PARSERS[format](text), default_role=default_role)
+
+
+@router.post("/users/{user_id}/deactivate", response_model=UserResponse)
+async def deactivate_user(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(USERS_WRITE))
+):
+    """
+    Deactivate a user and invalidate all of their tokens (Admin only).
+    """
+    user_service = UserService(db)
+    return await user_service.deactivate_user(user_id)
+
+
+@router.get("/users/{user_id}/sessions", response_model=List[SessionResponse])
+async def get_user_sessions(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(USERS_READ))
+):
+    """
+    List a user's active sessions (Admin only).
+    """
+    session_service = SessionService(db)
+    return await session_service.list_sessions(user_id)
+
+
+@router.delete("/users/{user_id}/sessions", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_user_sessions(
+    user_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(USERS_WRITE))
+):
+    """
+    Log a user out everywhere without deactivating them (Admin only).
+    """
+    session_service = SessionService(db)
+    await session_service.revoke_all_sessions(user_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.put("/users/{user_id}/role", response_model=UserResponse)
+async def change_user_role(
+    user_id: UUID,
+    role_in: UserRoleUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(USERS_WRITE))
+):
+    """
+    Assign a role to a user (Admin only).
+    """
+    user_service = UserService(db)
+    return await user_service.change_user_role(user_id, role_in.role)
+
+
+@router.get("/stats")
+async def get_runtime_stats(
+    token: TokenPayload = Depends(require_permissions(SYSTEM_READ))
+):
+    """
+    In-process runtime counters (Admin only).
+    """
+    return {
+        "hashing": hashing_executor.stats(),
+        "principal_cache": principal_cache.stats(),
+        "role_catalog": role_catalog.stats(),
+        "token_purge": token_purge_service.stats(),
+        "access_denylist": denylist_sync_service.stats(),
+        "token_versions": token_versions.stats(),
+        "rate_limit": rate_limiter.stats(),
+        "login_throttle": login_throttle.stats(),
+        "signing_keys": {"algorithm": settings.ALGORITHM, **(key_ring.stats() if key_ring else {})},
+    }
+
+
+@router.get("/traces")
+async def get_recent_traces(
+    limit: int = Query(50, ge=1, le=1000),
+    token: TokenPayload = Depends(require_permissions(SYSTEM_READ))
+):
+    """
+    Most recent sampled request traces, newest first (Admin only).
+    Requires TRACING_ENABLED with the "memory" exporter.
+    """
+    return ring_buffer.recent(limit)
+
+
+@router.get("/roles", response_model=List[RolePermissionsResponse])
+async def get_roles(
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(ROLES_MANAGE))
+):
+    """
+    List roles with their permissions (Admin only).
+    """
+    role_service = RoleService(db)
+    return await role_service.get_roles()
+
+
+@router.put("/roles/{role_name}/permissions", response_model=RolePermissionsResponse)
+async def set_role_permissions(
+    role_name: str,
+    permissions_in: RolePermissionsUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(ROLES_MANAGE))
+):
+    """
+    Replace the permissions a role grants (Admin only).
+    
+    Users of the role get the new permissions with their next access token.
+    Removing a permission also revokes the role's existing tokens.
+    """
+    role_service = RoleService(db)
+    return await role_service.set_role_permissions(role_name, permissions_in.permissions)
@@ -1,29 +1,87 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from typing import Optional
+from uuid import UUID
 
-from app.api.deps import get_db
-from app.schemas.auth import LoginRequest
-from app.schemas.token import Token
+from fastapi import APIRouter, Depends, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db
+from app.core.permissions import TOKENS_INTROSPECT
+from app.middlewares.auth_guard import require_permissions
+from app.middlewares.rate_limit import rate_limiter
+from app.schemas.auth import LoginRequest, LogoutRequest, RefreshTokenRequest
+from app.schemas.token import Token, TokenIntrospectionRequest, TokenIntrospectionResponse, TokenPayload
 from app.services.auth_service import AuthService
-from app.schemas.auth import LoginRequest, RefreshTokenRequest
+from app.services.session_service import SessionService
 
 router = APIRouter()
 
 @router.post("/login", response_model=Token)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(
+    login_data: LoginRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
     auth_service = AuthService(db)
-    return auth_service.login(
+    return await auth_service.login(
         username=login_data.username,
-        password=login_data.password
+        password=login_data.password,
+        # Same client identity as the rate limiter (honours RATE_LIMIT_TRUST_FORWARDED)
+        client_ip=rate_limiter.client_ip(request.scope),
+        user_agent=request.headers.get("user-agent")
     )
 
 @router.post("/refresh", response_model=Token)
-def refresh_token(request: RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(request: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Get a new access token using a refresh token.
     """
     auth_service = AuthService(db)
-    return auth_service.refresh_access_token(request.refresh_token)
\ No newline at end of file
+    return await auth_service.refresh_access_token(request.refresh_token)
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    request: Optional[LogoutRequest] = None,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions())
+):
+    """
+    End the bearer access token's session (and revoke the refresh
+    token, if sent).
+
+    The session's access tokens stop working on every instance within
+    ACCESS_DENYLIST_SYNC_SECONDS (at once on this one).
+    """
+    auth_service = AuthService(db)
+    await auth_service.logout(token, request.refresh_token if request else None)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.post("/logout-all", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_all(
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions())
+):
+    """
+    Log out everywhere: every access and refresh token of the user,
+    this one included, stops working.
+    """
+    session_service = SessionService(db)
+    await session_service.revoke_all_sessions(UUID(token.sub))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@router.post("/introspect", response_model=TokenIntrospectionResponse)
+async def introspect_tokens(
+    request: TokenIntrospectionRequest,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions(TOKENS_INTROSPECT))
+):
+    """
+    Validate a batch of access tokens in one call (requires tokens:introspect).
+
+    For API gateways: results come back in request order, and an active
+    result may be cached until its `claims.exp`.
+    """
+    auth_service = AuthService(db)
+    return TokenIntrospectionResponse(results=await auth_service.introspect(request.tokens))
@@ -1,36 +1,78 @@
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_async_db, get_current_user
+from app.middlewares.auth_guard import require_permissions
+from app.schemas.session import SessionResponse, SessionRevokeResult
+from app.schemas.token import TokenPayload
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.services.session_service import SessionService
 from app.services.user_service import UserService
-from app.db.models.user import User
+from app.core.principal import Principal
 
 router = APIRouter()
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create new user without the need to be logged in.
     """
     user_service = UserService(db)
-    return user_service.register_user(user_in)
+    return await user_service.register_user(user_in)
 
 @router.get("/me", response_model=UserResponse)
-def read_user_me(current_user: User = Depends(get_current_user)):
+async def read_user_me(current_user: Principal = Depends(get_current_user)):
     """
     Get current user profile.
     """
     return current_user
 
 @router.patch("/me", response_model=UserResponse)
-def update_user_me(
+async def update_user_me(
     user_in: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Update current user profile.
     """
     user_service = UserService(db)
-    return user_service.update_user(current_user, user_in)
\ No newline at end of file
+    return await user_service.update_user(current_user.id, user_in)
+
+@router.get("/me/sessions", response_model=List[SessionResponse])
+async def list_my_sessions(
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions())
+):
+    """
+    List the current user's active sessions; `current` marks this one.
+    """
+    session_service = SessionService(db)
+    return await session_service.list_sessions(UUID(token.sub), token.sid)
+
+@router.post("/me/sessions/revoke-others", response_model=SessionRevokeResult)
+async def revoke_my_other_sessions(
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions())
+):
+    """
+    Sign out everywhere else: end every session but this one.
+    """
+    session_service = SessionService(db)
+    revoked = await session_service.revoke_other_sessions(UUID(token.sub), token.sid)
+    return SessionRevokeResult(revoked=revoked)
+
+@router.delete("/me/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_my_session(
+    session_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    token: TokenPayload = Depends(require_permissions())
+):
+    """
+    End one of the current user's sessions.
+    """
+    session_service = SessionService(db)
+    await session_service.revoke_session(UUID(token.sub), session_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
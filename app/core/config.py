@@ -5,7 +5,7 @@ This module handles loading environment variables and providing
 a centralized settings object for the entire application.
 """
 
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -19,15 +19,88 @@ class Settings(BaseSettings):
     
     # Database Configuration
     DATABASE_URL: str
+    # Optional explicit URL for the async engine; derived from DATABASE_URL if unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # psycopg 3: prepare a statement server-side once a connection has run it this
+    # many times (0 = on first use); -1 disables, e.g. behind PgBouncer transaction pooling
+    DB_PREPARE_THRESHOLD: int = 1
     
     # Security & JWT Configuration
     SECRET_KEY: str
-    ALGORITHM: str = "HS256"
+    ALGORITHM: str = "HS256"  # HS256 (SECRET_KEY) or RS256/384/512, ES256/384/512 (key ring)
+    JWT_KEYS_DIR: Optional[str] = None  # Directory of <kid>.pem keys for asymmetric algorithms
+    JWT_ACTIVE_KID: Optional[str] = None  # Key signing new tokens; defaults to the only private key
+    JWT_ACCEPT_LEGACY_HS256: bool = False  # Also accept kid-less HS256 tokens while migrating
+    JWKS_CACHE_SECONDS: int = 300  # Cache-Control max-age of /.well-known/jwks.json
     
     # Token Expiration Settings
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Password Hashing Pool
+    HASH_WORKERS: int = 0  # 0 = one worker process per CPU core
+    HASH_QUEUE_SIZE: int = 64  # Jobs allowed to wait before callers get a 503
+    HASH_RETRY_AFTER_SECONDS: int = 1
+    
+    # Principal Cache (get_current_user)
+    PRINCIPAL_CACHE_SIZE: int = 10000  # 0 disables the cache
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    INTROSPECTION_CACHE_SIZE: int = 50000  # Verified access token claims; 0 disables
+    ROLE_CATALOG_TTL_SECONDS: int = 300  # In-memory roles snapshot; bounds cross-worker staleness
+    
+    # Access Token Denylist (logout; app/core/denylist.py)
+    ACCESS_DENYLIST_CAPACITY: int = 100000  # Bloom filter size; grows if exceeded
+    ACCESS_DENYLIST_ERROR_RATE: float = 0.001
+    ACCESS_DENYLIST_SYNC_SECONDS: int = 5  # Pull other workers' revocations; 0 disables
+    
+    # Token Versions (global logout; app/core/token_versions.py)
+    TOKEN_VERSION_CACHE_SIZE: int = 100000  # 0 disables (one query per check)
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = 5  # Bounds how long other workers accept a bumped-out token
+    
+    # Refresh Token Purge (expired and long-revoked rows)
+    TOKEN_PURGE_ENABLED: bool = False  # Run the purger inside the app process
+    TOKEN_PURGE_INTERVAL_SECONDS: int = 300
+    TOKEN_PURGE_BATCH_SIZE: int = 1000
+    TOKEN_PURGE_BATCH_SLEEP_SECONDS: float = 0.05
+    TOKEN_PURGE_EXPIRED_GRACE_HOURS: int = 0
+    TOKEN_PURGE_REVOKED_RETENTION_HOURS: int = 24
+    
+    # Refresh Token Partitioning (PostgreSQL only, see app/db/partitions.py)
+    REFRESH_TOKENS_PARTITIONED: bool = False  # Monthly RANGE partitions on expires_at
+    TOKEN_PARTITION_MONTHS_AHEAD: int = 3  # Future partitions kept ready
+    TOKEN_PARTITION_RETENTION_DAYS: int = 7  # Keep a fully expired month this long
+    TOKEN_PARTITION_MAINTENANCE_SECONDS: int = 3600  # Runs whether or not the purger is enabled
+    
+    # Rate Limiting (app/middlewares/rate_limit.py)
+    RATE_LIMIT_ENABLED: bool = True
+    # Comma-separated "METHOD /path=LIMIT/SECONDS[:ip|user|route[:token_bucket|sliding_window]]"
+    RATE_LIMIT_RULES: str = (
+        "POST /api/v1/auth/login=30/60:ip,"
+        "POST /api/v1/users/signup=10/60:ip,"
+        "POST /api/v1/auth/refresh=60/60:ip"
+    )
+    RATE_LIMIT_SHARDS: int = 64
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # Key by X-Forwarded-For (only behind a trusted proxy)
+    RATE_LIMIT_TRUSTED_PROXIES: int = 1  # Proxies in front of the app that append to X-Forwarded-For
+    
+    # Login Throttle (failed-login lockouts, checked before bcrypt)
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_USER_FREE_ATTEMPTS: int = 5  # Failures per username before lockouts
+    LOGIN_THROTTLE_IP_FREE_ATTEMPTS: int = 20  # Failures per client IP before lockouts
+    LOGIN_THROTTLE_BASE_SECONDS: float = 1.0  # First lockout; doubles per further failure
+    LOGIN_THROTTLE_MAX_SECONDS: float = 900.0
+    LOGIN_THROTTLE_RESET_SECONDS: float = 3600.0  # Forget failures after this quiet period
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000
+    
+    # Observability
+    METRICS_ENABLED: bool = True  # Prometheus exposition at GET /metrics
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATE: float = 1.0  # Fraction of requests traced when enabled
+    TRACING_EXPORTERS: str = "memory"  # Comma-separated: memory, log, otlp_file
+    TRACING_OTLP_FILE: str = "traces.otlp.jsonl"
+    TRACING_BUFFER_SIZE: int = 1000  # Traces kept for GET /admin/traces
+    TRACING_SERVER_TIMING: bool = False  # Add Server-Timing to traced responses
+    
     # Application Settings
     PROJECT_NAME: str = "SentinelAuth"
     VERSION: str = "1.0.0"
@@ -10,3 +10,16 @@ TOKEN_TYPE_BEARER = "bearer"
 # Role Names
 ROLE_ADMIN = "admin"
 ROLE_USER = "user"
+
+# Pagination
+MAX_PAGE_SIZE = 500
+MAX_OFFSET = 1000  # Deeper pages must use cursor (keyset) pagination
+
+# Token introspection
+MAX_INTROSPECTION_BATCH = 1000  # Tokens per POST /auth/introspect
+
+# Bulk export
+EXPORT_BATCH_SIZE = 1000  # Rows fetched per server-side cursor round trip
+
+# Bulk import
+IMPORT_BATCH_SIZE = 1000  # Rows validated, deduplicated and inserted together
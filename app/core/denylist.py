@@ -0,0 +1,176 @@
+"""
+Access Token Denylist.
+
+In-memory mirror of the revoked_access_tokens table, consulted on every
+authenticated request. Almost every token checked is not revoked, so
+the check starts with a Bloom filter: the jti's string hash and
+usually a single bit probe answer "definitely not revoked" without
+touching the exact set.
+Only filter hits (revoked tokens plus ~ERROR_RATE false positives) fall
+through to the exact jti -> exp map.
+
+Ending a login session denies its session id (the `sid` claim) the
+same way, which covers every access token issued from it at once.
+
+Bloom filters cannot delete. `prune` pops expired entries off an expiry
+min-heap, so it only touches what actually expired, and leaves their
+bits in the filter (the exact map still answers correctly). The filter
+is rebuilt from the surviving entries only once such stale entries make
+up STALE_REBUILD_SHARE of it, or when it outgrows its capacity.
+
+Everything here runs on the event loop without awaiting, so no lock is
+needed; a rebuild swaps the filter in one assignment.
+"""
+
+import heapq
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+_MASK64 = (1 << 64) - 1
+
+# Rebuild the filter once this share of its members has expired
+STALE_REBUILD_SHARE = 0.5
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Sized for `capacity` items at `error_rate` false positives; the k
+    probe positions come from one string hash (double hashing). str
+    hashes are salted per process, which is fine for a filter that
+    never leaves memory.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, key: str) -> None:
+        bits, size = self._bits, self.size
+        h = hash(key) & _MASK64
+        step = (h >> 32) | 1
+        for _ in range(self.hashes):
+            position = h % size
+            bits[position >> 3] |= 1 << (position & 7)
+            h += step
+
+    def __contains__(self, key: str) -> bool:
+        # Most absent keys stop at the first clear bit
+        bits, size = self._bits, self.size
+        h = hash(key) & _MASK64
+        step = (h >> 32) | 1
+        for _ in range(self.hashes):
+            position = h % size
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+            h += step
+        return True
+
+
+class AccessTokenDenylist:
+    """
+    Revoked access token ids, Bloom filter in front of an exact map.
+
+    Attributes:
+        capacity: Initial filter capacity (grows on prune if exceeded)
+        error_rate: Target false positive rate of the filter
+        checks / filter_hits / revoked_hits: Counters for sizing the filter
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._entries: Dict[str, float] = {}
+        self._expiries: List[Tuple[float, str]] = []  # min-heap of (expires_at, jti)
+        self._filter = BloomFilter(capacity, error_rate)
+        self._stale = 0  # Pruned entries whose bits are still in the filter
+        self.checks = 0
+        self.filter_hits = 0
+        self.revoked_hits = 0
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Deny a token id until `expires_at` (epoch seconds)."""
+        if jti not in self._entries:
+            self._entries[jti] = expires_at
+            heapq.heappush(self._expiries, (expires_at, jti))
+            if len(self._entries) + self._stale > self._filter.capacity:
+                self._rebuild()
+            else:
+                self._filter.add(jti)
+
+    def add_many(self, entries: Iterable[Tuple[str, float]]) -> int:
+        """Add (jti, expires_at) pairs; returns how many were new."""
+        before = len(self._entries)
+        for jti, expires_at in entries:
+            self.add(jti, expires_at)
+        return len(self._entries) - before
+
+    def is_revoked(self, jti: str) -> bool:
+        """True if the token id was revoked and has not expired yet."""
+        self.checks += 1
+        if jti not in self._filter:
+            return False
+        self.filter_hits += 1
+        expires_at = self._entries.get(jti)
+        if expires_at is None or expires_at <= time.time():
+            return False
+        self.revoked_hits += 1
+        return True
+
+    def is_token_revoked(self, jti: Optional[str], sid: Optional[str]) -> bool:
+        """True if the access token itself or its whole session was revoked."""
+        return bool(jti and self.is_revoked(jti)) or bool(sid and self.is_revoked(sid))
+
+    def prune(self) -> int:
+        """Forget expired entries; returns entries dropped."""
+        now = time.time()
+        expiries, dropped = self._expiries, 0
+        while expiries and expiries[0][0] <= now:
+            _, jti = heapq.heappop(expiries)
+            del self._entries[jti]
+            dropped += 1
+        self._stale += dropped
+        if self._stale and self._stale >= STALE_REBUILD_SHARE * (len(self._entries) + self._stale):
+            self._rebuild()
+        return dropped
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._expiries.clear()
+        self._filter = BloomFilter(self.capacity, self.error_rate)
+        self._stale = 0
+
+    def _rebuild(self) -> None:
+        bloom = BloomFilter(max(self.capacity, 2 * len(self._entries)), self.error_rate)
+        for jti in self._entries:
+            bloom.add(jti)
+        self._filter = bloom
+        self._stale = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "filter_capacity": self._filter.capacity,
+            "filter_bytes": len(self._filter._bits),
+            "filter_stale": self._stale,
+            "checks": self.checks,
+            "filter_hits": self.filter_hits,
+            "revoked_hits": self.revoked_hits,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global denylist (kept in sync by app/services/denylist_service.py)
+access_denylist = AccessTokenDenylist(
+    capacity=settings.ACCESS_DENYLIST_CAPACITY,
+    error_rate=settings.ACCESS_DENYLIST_ERROR_RATE,
+)
@@ -0,0 +1,216 @@
+"""
+Password Hashing Executor.
+
+bcrypt is deliberately slow and holds the GIL for its whole duration, so
+running it on the event loop or Starlette's threadpool stalls unrelated
+requests (e.g. /users/me) during login bursts. This module runs bcrypt in a
+dedicated process pool behind an awaitable API.
+
+Admission is bounded: at most `workers + max_queue` jobs may be in flight.
+Beyond that, callers get HashingUnavailableError immediately, which the
+API layer turns into a 503 with a Retry-After header.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.metrics import HASH_BATCH_SECONDS, HASH_SECONDS, PASSWORD_HASH_WAIT_SECONDS, VERIFY_SECONDS
+from app.core.security import get_password_hash, verify_password
+from app.core.tracing import traced
+from app.utils.exceptions import HashingUnavailableError
+from app.utils.logger import logger
+
+
+def _hash_many(passwords: List[str]) -> List[str]:
+    """Hash a chunk of passwords in one worker round trip (bulk imports)."""
+    return [get_password_hash(password) for password in passwords]
+
+
+# Histogram child per hashing function run in the pool
+_HASH_METRICS = {
+    get_password_hash: HASH_SECONDS,
+    verify_password: VERIFY_SECONDS,
+    _hash_many: HASH_BATCH_SECONDS,
+}
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    """
+    Run `fn` inside a worker process and report how long it took there.
+
+    Returns:
+        Tuple of (result, seconds spent hashing, excluding queue wait)
+    """
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class HashingExecutor:
+    """
+    Bounded process pool for bcrypt hashing and verification.
+
+    Attributes:
+        workers: Number of worker processes (defaults to CPU count)
+        max_queue: Jobs allowed to wait once all workers are busy
+        retry_after: Seconds suggested to rejected callers
+    """
+
+    def __init__(self, workers: int = 0, max_queue: int = 64, retry_after: int = 1):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+        # Metrics
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of admitted jobs waiting for a free worker."""
+        return max(0, self._in_flight - self.workers)
+
+    def start(self) -> ProcessPoolExecutor:
+        """Create the process pool (workers are spawned on first use)."""
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the parent runs an event loop and threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        """
+        Drop a broken pool without blocking the event loop.
+
+        Only detaches `pool` if it is still current, so a replacement
+        started by a concurrent caller is kept; the next run() starts one.
+        """
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a CPU-bound function in the pool and await its result.
+
+        Raises:
+            HashingUnavailableError: If the pool and its queue are full
+        """
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HashingUnavailableError(self.retry_after)
+            self._in_flight += 1
+
+        pool = self._pool or self.start()
+        start = time.perf_counter()
+        hash_seconds = 0.0
+        try:
+            loop = asyncio.get_running_loop()
+            result, hash_seconds = await loop.run_in_executor(pool, _timed_call, fn, *args)
+            return result
+        except BrokenProcessPool:
+            logger.error("Hashing pool broke (worker died); recreating it")
+            self._discard(pool)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if hash_seconds:
+                histogram = _HASH_METRICS.get(fn)
+                if histogram is not None:
+                    histogram.observe(hash_seconds)
+                PASSWORD_HASH_WAIT_SECONDS.observe(max(0.0, elapsed - hash_seconds))
+            with self._lock:
+                self._in_flight -= 1
+                self.completed += 1
+                self.hash_seconds_total += hash_seconds
+                self.hash_seconds_max = max(self.hash_seconds_max, hash_seconds)
+                self.wait_seconds_total += max(0.0, elapsed - hash_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool metrics (queue depth, hash latency, rejections)."""
+        with self._lock:
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": self.queue_depth,
+                "completed": completed,
+                "rejected": self.rejected,
+                "hash_seconds_avg": self.hash_seconds_total / completed if completed else 0.0,
+                "hash_seconds_max": self.hash_seconds_max,
+                "wait_seconds_avg": self.wait_seconds_total / completed if completed else 0.0,
+            }
+
+
+# Global executor instance, started/stopped by the app lifespan
+hashing_executor = HashingExecutor(
+    workers=settings.HASH_WORKERS,
+    max_queue=settings.HASH_QUEUE_SIZE,
+    retry_after=settings.HASH_RETRY_AFTER_SECONDS,
+)
+
+
+@traced("security.hash_password")
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password with bcrypt in the hashing pool."""
+    return await hashing_executor.run(get_password_hash, password)
+
+
+@traced("security.verify_password")
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a bcrypt hash in the hashing pool."""
+    return await hashing_executor.run(verify_password, plain_password, hashed_password)
+
+
+@traced("security.hash_passwords")
+async def get_password_hashes_async(passwords: Sequence[str], chunk_size: int = 32) -> List[str]:
+    """
+    Hash many passwords in the hashing pool, preserving order.
+
+    Passwords go to the workers in chunks (one IPC round trip per chunk),
+    with at most `workers` chunks in flight so interactive logins keep
+    their share of the queue. A rejected chunk backs off and is retried
+    instead of failing the whole batch.
+    """
+    chunks = [list(passwords[i:i + chunk_size]) for i in range(0, len(passwords), chunk_size)]
+    semaphore = asyncio.Semaphore(hashing_executor.workers)
+
+    async def hash_chunk(chunk: List[str]) -> List[str]:
+        async with semaphore:
+            while True:
+                try:
+                    return await hashing_executor.run(_hash_many, chunk)
+                except HashingUnavailableError as e:
+                    await asyncio.sleep(e.retry_after)
+
+    hashed: List[str] = []
+    for result in await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks)):
+        hashed.extend(result)
+    return hashed
@@ -0,0 +1,154 @@
+"""
+JWT Signing Keys.
+
+With an asymmetric ALGORITHM (RS256/384/512, ES256/384/512), tokens are
+signed with a private key from a `kid`-indexed key ring and verified with
+its public half. Resource servers fetch the public keys from
+/.well-known/jwks.json and verify tokens locally.
+
+The ring is loaded once from JWT_KEYS_DIR: one PEM file per key, named
+`<kid>.pem`. A private key can sign and verify; a public key only
+verifies (a retired key whose tokens have not expired yet, or the next
+key published ahead of a rotation). PEMs are parsed into key objects at
+load time, never per token. The JWKS document and its ETag are built
+once as well.
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+RSA_ALGORITHMS = ("RS256", "RS384", "RS512")
+EC_ALGORITHMS = {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}
+ASYMMETRIC_ALGORITHMS = RSA_ALGORITHMS + tuple(EC_ALGORITHMS.values())
+
+
+class SigningKey:
+    """
+    One key of the ring.
+
+    Attributes:
+        kid: Key ID, sent in the token header
+        algorithm: JWS algorithm, implied by the key type (and curve)
+        private: Parsed private key, None for verify-only keys
+        public: Parsed public key
+        jwk: Public JWK (RFC 7517) as published in the JWKS
+    """
+
+    __slots__ = ("kid", "algorithm", "private", "public", "jwk")
+
+    def __init__(self, kid: str, algorithm: str, private: Optional[Key], public: Key):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.private = private
+        self.public = public
+        self.jwk = {**public.to_dict(), "kid": kid, "use": "sig"}
+
+    @classmethod
+    def from_pem(cls, kid: str, pem: bytes, rsa_algorithm: str = "RS256") -> "SigningKey":
+        """
+        Parse a PEM private or public key.
+
+        Raises:
+            ValueError: If the PEM is not an RSA or supported EC key
+        """
+        try:
+            parsed = serialization.load_pem_private_key(pem, password=None)
+        except (TypeError, ValueError):
+            parsed = serialization.load_pem_public_key(pem)
+
+        if isinstance(parsed, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+            algorithm = rsa_algorithm
+        elif isinstance(parsed, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)):
+            algorithm = EC_ALGORITHMS.get(parsed.curve.name)
+            if algorithm is None:
+                raise ValueError(f"Key {kid!r}: unsupported curve {parsed.curve.name}")
+        else:
+            raise ValueError(f"Key {kid!r}: only RSA and EC keys are supported")
+
+        key = jwk.construct(pem, algorithm)
+        if key.is_public():
+            return cls(kid, algorithm, None, key)
+        return cls(kid, algorithm, key, key.public_key())
+
+
+class KeyRing:
+    """
+    Signing keys by kid, plus the active one used for new tokens.
+
+    Attributes:
+        active: Key that signs new tokens
+        jwks: Serialized JWKS document (all public keys)
+        etag: Strong ETag of `jwks`
+    """
+
+    def __init__(self, keys: List[SigningKey], active_kid: Optional[str] = None):
+        self._keys: Dict[str, SigningKey] = {key.kid: key for key in keys}
+        signers = [key for key in keys if key.private is not None]
+        if active_kid is None:
+            if len(signers) != 1:
+                raise ValueError("Set JWT_ACTIVE_KID: the key ring needs exactly one signing key")
+            active_kid = signers[0].kid
+        active = self._keys.get(active_kid)
+        if active is None or active.private is None:
+            raise ValueError(f"JWT_ACTIVE_KID {active_kid!r} is not a private key in the key ring")
+        self.active = active
+
+        # Active key first: clients that only try the first key still work
+        ordered = [active] + [key for key in keys if key is not active]
+        self.jwks = json.dumps({"keys": [key.jwk for key in ordered]}, separators=(",", ":")).encode()
+        self.etag = f'"{hashlib.sha256(self.jwks).hexdigest()[:32]}"'
+
+    @classmethod
+    def from_directory(cls, path: str, active_kid: Optional[str] = None, rsa_algorithm: str = "RS256") -> "KeyRing":
+        """Load every `<kid>.pem` file in `path`."""
+        keys = []
+        for name in sorted(os.listdir(path)):
+            if not name.endswith(".pem"):
+                continue
+            with open(os.path.join(path, name), "rb") as f:
+                keys.append(SigningKey.from_pem(name[:-4], f.read(), rsa_algorithm))
+        if not keys:
+            raise ValueError(f"No .pem keys found in JWT_KEYS_DIR {path!r}")
+        return cls(keys, active_kid)
+
+    def get(self, kid: str) -> Optional[SigningKey]:
+        return self._keys.get(kid)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"active_kid": self.active.kid, "kids": list(self._keys)}
+
+
+def load_key_ring() -> Optional[KeyRing]:
+    """
+    Key ring for an asymmetric ALGORITHM; None for HS256 (SECRET_KEY).
+
+    Raises:
+        ValueError: On an unsupported ALGORITHM or unusable key files
+    """
+    if settings.ALGORITHM.startswith("HS"):
+        return None
+    if settings.ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+        raise ValueError(f"Unsupported ALGORITHM {settings.ALGORITHM!r}")
+    if not settings.JWT_KEYS_DIR:
+        raise ValueError(f"ALGORITHM {settings.ALGORITHM} requires JWT_KEYS_DIR")
+    rsa_algorithm = settings.ALGORITHM if settings.ALGORITHM in RSA_ALGORITHMS else "RS256"
+    return KeyRing.from_directory(settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID, rsa_algorithm)
+
+
+# Global key ring (None when tokens are HMAC-signed with SECRET_KEY)
+key_ring = load_key_ring()
+
+# Empty JWKS served in HS256 mode
+EMPTY_JWKS = b'{"keys":[]}'
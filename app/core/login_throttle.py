@@ -0,0 +1,155 @@
+"""
+Login Throttle.
+
+Tracks failed logins per username and per client IP. After a number of
+free attempts a key is locked out for an exponentially growing window
+(base * 2^n, capped). Locked-out attempts are rejected before the user
+lookup and before bcrypt, so credential stuffing stops costing a hash
+per guess.
+
+State is one small list per key in a bounded LRU; a key is forgotten
+once it has had no failures for `reset_after` seconds.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.hashing import hashing_executor
+
+# Index into a key's state list
+_FAILURES, _LOCKED_UNTIL, _LAST_FAILURE = 0, 1, 2
+
+
+class LoginThrottle:
+    """
+    Failed-login counters with exponential lockouts.
+
+    Attributes:
+        user_free_attempts: Failures per username before lockouts start
+        ip_free_attempts: Failures per client IP before lockouts start
+        base_lockout: First lockout length in seconds
+        max_lockout: Upper bound on a lockout in seconds
+        reset_after: Quiet period after which a key's failures are forgotten
+        maxsize: Maximum number of keys tracked (least recently failed evicted)
+    """
+
+    def __init__(
+        self,
+        user_free_attempts: int = 5,
+        ip_free_attempts: int = 20,
+        base_lockout: float = 1.0,
+        max_lockout: float = 900.0,
+        reset_after: float = 3600.0,
+        maxsize: int = 100000,
+        enabled: bool = True,
+    ):
+        self.user_free_attempts = user_free_attempts
+        self.ip_free_attempts = ip_free_attempts
+        self.base_lockout = base_lockout
+        self.max_lockout = max_lockout
+        self.reset_after = reset_after
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self._data: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.rejected = 0
+        self.failures = 0
+        self.lockouts = 0
+
+    @staticmethod
+    def _keys(username: str, client_ip: Optional[str]) -> List[str]:
+        keys = [f"u:{username.lower()}"]
+        if client_ip:
+            keys.append(f"ip:{client_ip}")
+        return keys
+
+    def check(self, username: str, client_ip: Optional[str] = None) -> float:
+        """
+        Seconds until this login may be attempted; 0.0 if allowed now.
+        """
+        if not self.enabled:
+            return 0.0
+        now = time.monotonic()
+        retry_after = 0.0
+        with self._lock:
+            for key in self._keys(username, client_ip):
+                state = self._data.get(key)
+                if state is None:
+                    continue
+                if now - state[_LAST_FAILURE] >= self.reset_after:
+                    del self._data[key]
+                elif state[_LOCKED_UNTIL] > now:
+                    retry_after = max(retry_after, state[_LOCKED_UNTIL] - now)
+            if retry_after:
+                self.rejected += 1
+        return retry_after
+
+    def record_failure(self, username: str, client_ip: Optional[str] = None) -> None:
+        """Count a failed login; lock the key out once past its free attempts."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self.failures += 1
+            for key in self._keys(username, client_ip):
+                state = self._data.get(key)
+                if state is None or now - state[_LAST_FAILURE] >= self.reset_after:
+                    state = self._data[key] = [0, 0.0, now]
+                self._data.move_to_end(key)
+                state[_FAILURES] += 1
+                state[_LAST_FAILURE] = now
+                free = self.user_free_attempts if key[0] == "u" else self.ip_free_attempts
+                over = state[_FAILURES] - free
+                if over > 0:
+                    state[_LOCKED_UNTIL] = now + min(self.max_lockout, self.base_lockout * 2 ** (over - 1))
+                    self.lockouts += 1
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def record_success(self, username: str) -> None:
+        """
+        Forget a username's failures after a successful login.
+
+        The client IP's counter is left to expire on its own: resetting it
+        would let one valid account clear the lockout for a whole IP.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._data.pop(f"u:{username.lower()}", None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, including the bcrypt CPU time the rejections avoided."""
+        hash_seconds_avg = hashing_executor.stats()["hash_seconds_avg"]
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "enabled": self.enabled,
+                "tracked_keys": len(self._data),
+                "locked_keys": sum(1 for state in self._data.values() if state[_LOCKED_UNTIL] > now),
+                "failures": self.failures,
+                "lockouts": self.lockouts,
+                "rejected": self.rejected,
+                "bcrypt_seconds_saved": self.rejected * hash_seconds_avg,
+            }
+
+
+# Global throttle shared by all login requests in this process
+login_throttle = LoginThrottle(
+    user_free_attempts=settings.LOGIN_THROTTLE_USER_FREE_ATTEMPTS,
+    ip_free_attempts=settings.LOGIN_THROTTLE_IP_FREE_ATTEMPTS,
+    base_lockout=settings.LOGIN_THROTTLE_BASE_SECONDS,
+    max_lockout=settings.LOGIN_THROTTLE_MAX_SECONDS,
+    reset_after=settings.LOGIN_THROTTLE_RESET_SECONDS,
+    maxsize=settings.LOGIN_THROTTLE_MAX_KEYS,
+    enabled=settings.LOGIN_THROTTLE_ENABLED,
+)
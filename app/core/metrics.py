@@ -0,0 +1,173 @@
+"""
+Prometheus Metrics.
+
+Metric definitions and cheap observation helpers for every layer:
+HTTP (app/middlewares/metrics.py), bcrypt (app/core/hashing.py), JWT
+(app/core/security.py), the SQLAlchemy pools (app/db/session.py) and
+token issuance/rotation.
+
+Hot paths observe through label children bound once at import (or
+cached on first use), never through `.labels(**dict)` per call. Pool
+saturation is read at scrape time by a collector, costing requests
+nothing.
+"""
+
+import os
+import time
+from typing import Dict, Iterable, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Sub-millisecond to a few seconds: covers JWT work, pool waits and bcrypt
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# HTTP
+HTTP_REQUEST_SECONDS = Histogram(
+    "sentinel_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Password hashing (time spent in the worker, and waiting for one)
+PASSWORD_HASH_SECONDS = Histogram(
+    "sentinel_password_hash_duration_seconds",
+    "bcrypt time inside the hashing pool",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+PASSWORD_HASH_WAIT_SECONDS = Histogram(
+    "sentinel_password_hash_wait_seconds",
+    "Time a bcrypt job waited for a free hashing worker",
+    buckets=LATENCY_BUCKETS,
+)
+HASH_SECONDS = PASSWORD_HASH_SECONDS.labels("hash")
+HASH_BATCH_SECONDS = PASSWORD_HASH_SECONDS.labels("hash_batch")
+VERIFY_SECONDS = PASSWORD_HASH_SECONDS.labels("verify")
+
+# JWT
+JWT_SECONDS = Histogram(
+    "sentinel_jwt_duration_seconds",
+    "JWT encode/decode time",
+    ["operation"],
+    buckets=LATENCY_BUCKETS,
+)
+JWT_ENCODE_SECONDS = JWT_SECONDS.labels("encode")
+JWT_DECODE_SECONDS = JWT_SECONDS.labels("decode")
+
+# Database pool
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "sentinel_db_pool_checkout_wait_seconds",
+    "Time spent waiting to check a connection out of the pool",
+    ["pool"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# Tokens
+TOKENS_ISSUED = Counter(
+    "sentinel_tokens_issued_total",
+    "Tokens issued",
+    ["type"],
+)
+ACCESS_TOKENS_ISSUED = TOKENS_ISSUED.labels("access")
+REFRESH_TOKENS_ISSUED = TOKENS_ISSUED.labels("refresh")
+
+TOKEN_ROTATIONS = Counter(
+    "sentinel_token_rotations_total",
+    "Refresh token rotation attempts by outcome",
+    ["outcome"],
+)
+ROTATION_ROTATED = TOKEN_ROTATIONS.labels("rotated")
+ROTATION_INVALID = TOKEN_ROTATIONS.labels("invalid")
+ROTATION_REVOKED = TOKEN_ROTATIONS.labels("revoked")
+ROTATION_LOST_RACE = TOKEN_ROTATIONS.labels("lost_race")
+
+
+_http_children: Dict[Tuple[str, str, int], object] = {}
+
+
+def observe_http(method: str, route: str, status: int, seconds: float) -> None:
+    """Record one request; label children are created once per combination."""
+    key = (method, route, status)
+    child = _http_children.get(key)
+    if child is None:
+        child = _http_children[key] = HTTP_REQUEST_SECONDS.labels(method, route, str(status))
+    child.observe(seconds)
+
+
+class _TimedCheckout:
+    """
+    Mixin timing Pool._do_get, i.e. the wait for a pooled connection.
+    Subclasses bind `_checkout_seconds` to their pool's label child.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self._checkout_seconds.observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    _checkout_seconds = DB_POOL_CHECKOUT_SECONDS.labels("sync")
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    _checkout_seconds = DB_POOL_CHECKOUT_SECONDS.labels("async")
+
+
+class PoolCollector(Collector):
+    """Reports pool occupancy when scraped."""
+
+    def __init__(self):
+        self._pools: Dict[str, Pool] = {}
+
+    def add(self, name: str, pool: Pool) -> None:
+        self._pools[name] = pool
+
+    def collect(self) -> Iterable[GaugeMetricFamily]:
+        checked_out = GaugeMetricFamily(
+            "sentinel_db_pool_checked_out", "Connections currently checked out", labels=["pool"]
+        )
+        capacity = GaugeMetricFamily(
+            "sentinel_db_pool_capacity", "pool_size + max_overflow", labels=["pool"]
+        )
+        saturation = GaugeMetricFamily(
+            "sentinel_db_pool_saturation", "checked_out / capacity", labels=["pool"]
+        )
+        for name, pool in self._pools.items():
+            if not isinstance(pool, QueuePool):
+                continue
+            in_use = pool.checkedout()
+            limit = pool.size() + max(pool._max_overflow, 0)
+            checked_out.add_metric([name], in_use)
+            capacity.add_metric([name], limit)
+            saturation.add_metric([name], in_use / limit if limit else 0.0)
+        return [checked_out, capacity, saturation]
+
+
+pool_collector = PoolCollector()
+REGISTRY.register(pool_collector)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Exposition payload and content type for GET /metrics.
+
+    With PROMETHEUS_MULTIPROC_DIR set (several server worker processes),
+    samples are aggregated across processes.
+    """
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
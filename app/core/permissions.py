@@ -0,0 +1,86 @@
+"""
+Permissions.
+
+The permission catalog and its compiled bit layout. Every permission
+owns a fixed bit; a role's permission set is the OR of its bits,
+precomputed in `roles.permission_mask` and embedded in access tokens as
+the `perm` claim, so authorizing a request is one integer AND on the
+token's claims (see app/middlewares/auth_guard.py).
+
+Bits are baked into issued tokens: never renumber or reuse one. Retire a
+permission by removing its grants, not its bit.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from app.core.constants import ROLE_ADMIN, ROLE_USER
+
+USERS_READ = "users:read"
+USERS_WRITE = "users:write"
+USERS_EXPORT = "users:export"
+USERS_IMPORT = "users:import"
+ROLES_MANAGE = "roles:manage"
+TOKENS_INTROSPECT = "tokens:introspect"
+SYSTEM_READ = "system:read"
+
+# name -> (bit, description)
+PERMISSIONS: Dict[str, Tuple[int, str]] = {
+    USERS_READ: (0, "List and view users"),
+    USERS_WRITE: (1, "Deactivate users and change their roles"),
+    USERS_EXPORT: (2, "Export all users"),
+    USERS_IMPORT: (3, "Bulk import users"),
+    ROLES_MANAGE: (4, "View roles and change their permissions"),
+    TOKENS_INTROSPECT: (5, "Introspect access tokens"),
+    SYSTEM_READ: (6, "Read runtime stats and traces"),
+}
+
+# Grants given to the built-in roles when they are first created
+DEFAULT_ROLE_PERMISSIONS: Dict[str, Tuple[str, ...]] = {
+    ROLE_ADMIN: tuple(PERMISSIONS),
+    ROLE_USER: (),
+}
+
+
+class PermissionRegistry:
+    """
+    Immutable name <-> bit mapping.
+
+    Attributes:
+        all_mask: Mask with every known permission set
+    """
+
+    def __init__(self, permissions: Dict[str, Tuple[int, str]]):
+        bits = [bit for bit, _ in permissions.values()]
+        if len(set(bits)) != len(bits) or not all(0 <= bit < 63 for bit in bits):
+            raise ValueError("Permission bits must be unique and within 0..62")
+        self._bits: Dict[str, int] = {name: bit for name, (bit, _) in permissions.items()}
+        self._names: Tuple[Tuple[int, str], ...] = tuple((1 << bit, name) for name, bit in self._bits.items())
+        self.all_mask = self.mask(self._bits)
+
+    def bit(self, name: str) -> int:
+        """
+        Raises:
+            ValueError: If the permission is unknown
+        """
+        try:
+            return self._bits[name]
+        except KeyError:
+            raise ValueError(f"Unknown permission: {name!r}") from None
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Bitmask for a set of permission names."""
+        mask = 0
+        for name in names:
+            mask |= 1 << self.bit(name)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        """Permission names set in a bitmask (unknown bits are ignored)."""
+        return [name for flag, name in self._names if mask & flag]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._bits
+
+
+# Global registry
+permission_registry = PermissionRegistry(PERMISSIONS)
@@ -0,0 +1,89 @@
+"""
+Authenticated Principal.
+
+An immutable snapshot of the user behind an access token. get_current_user
+returns this instead of an ORM User, so authenticated requests can be
+served from the principal cache without a database round trip.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from sqlalchemy import Row
+
+    from app.db.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class RolePrincipal:
+    """Role fields needed for authorization and UserResponse."""
+    id: int
+    name: str
+    description: str | None
+    created_at: datetime
+    permission_mask: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    Read-only view of an authenticated user.
+
+    Carries exactly what authorization checks and the /users/me
+    response need; anything else requires loading the User.
+    """
+    id: UUID
+    username: str
+    email: str
+    is_active: bool
+    created_at: datetime
+    role: RolePrincipal
+
+    @classmethod
+    def from_user(cls, user: "User | Row", role: RolePrincipal | None = None) -> "Principal":
+        """
+        Build a snapshot from a loaded User or an auth row
+        (AsyncUserRepository.get_auth_row).
+
+        Pass `role` (from the role catalog) when the user was loaded
+        without its role, as rows always are; otherwise `user.role` must
+        be loaded.
+        """
+        if role is None:
+            role = RolePrincipal(
+                id=user.role.id,
+                name=user.role.name,
+                description=user.role.description,
+                created_at=user.role.created_at,
+                permission_mask=user.role.permission_mask,
+            )
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            role=role,
+        )
+
+
+# Principal snapshots keyed by user id.
+# Invalidated on profile updates, deactivation, role changes and global logout.
+principal_cache: TTLCache[Principal] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Verified access token claims keyed by the raw token (batch introspection).
+# Entries outlive no token: the TTL is the access token lifetime and
+# callers still check `exp` on a hit.
+access_claims_cache: TTLCache[Dict[str, Any]] = TTLCache(
+    maxsize=settings.INTROSPECTION_CACHE_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
@@ -0,0 +1,126 @@
+"""
+Role Catalog.
+
+The roles table is a handful of rows that change rarely, yet every user
+load used to join it. The catalog keeps an immutable snapshot of it in
+memory (id -> role and name -> role), so hot user queries can skip the
+join and resolve `role_id` here instead.
+
+A snapshot is never mutated: a reload builds a new one and swaps the
+reference, so readers need no lock. Role changes made through this
+process invalidate it immediately; the TTL bounds how long another
+worker (or a change made directly in the database) can serve stale
+role data.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.principal import RolePrincipal
+from app.repositories.role_repo import AsyncRoleRepository
+
+
+@dataclass(frozen=True, slots=True)
+class RoleSnapshot:
+    """Frozen id <-> name view of the roles table."""
+    by_id: Mapping[int, RolePrincipal]
+    by_name: Mapping[str, RolePrincipal]
+    loaded_at: float
+
+
+_EMPTY = RoleSnapshot(by_id=MappingProxyType({}), by_name=MappingProxyType({}), loaded_at=0.0)
+
+
+class RoleCatalog:
+    """
+    In-memory snapshot of the roles table.
+
+    Attributes:
+        ttl: Snapshot lifetime in seconds (0 reloads on every access)
+        loads: Number of times the table was read
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot = _EMPTY
+        self._stale = True
+        self._lock = asyncio.Lock()
+        self.loads = 0
+
+    async def load(self, db: AsyncSession) -> RoleSnapshot:
+        """Read the roles table and swap in a new snapshot."""
+        roles = [
+            RolePrincipal(
+                id=role.id,
+                name=role.name,
+                description=role.description,
+                created_at=role.created_at,
+                permission_mask=role.permission_mask,
+            )
+            for role in await AsyncRoleRepository(db).get_all()
+        ]
+        self._snapshot = RoleSnapshot(
+            by_id=MappingProxyType({role.id: role for role in roles}),
+            by_name=MappingProxyType({role.name: role for role in roles}),
+            loaded_at=time.monotonic(),
+        )
+        self._stale = False
+        self.loads += 1
+        return self._snapshot
+
+    async def snapshot(self, db: AsyncSession) -> RoleSnapshot:
+        """
+        The current snapshot, reloaded first if invalidated or expired.
+
+        Concurrent callers share one reload.
+        """
+        snapshot = self._snapshot
+        if not self._stale and time.monotonic() - snapshot.loaded_at < self.ttl:
+            return snapshot
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._stale or time.monotonic() - snapshot.loaded_at >= self.ttl:
+                snapshot = await self.load(db)
+            return snapshot
+
+    async def get_by_id(self, db: AsyncSession, role_id: int) -> Optional[RolePrincipal]:
+        """
+        Resolve a role id. A miss (a role created after the snapshot)
+        forces one reload before giving up.
+        """
+        role = (await self.snapshot(db)).by_id.get(role_id)
+        if role is None:
+            self.invalidate()
+            role = (await self.snapshot(db)).by_id.get(role_id)
+        return role
+
+    async def get_by_name(self, db: AsyncSession, name: str) -> Optional[RolePrincipal]:
+        """Resolve a role name (reloading once on a miss, like get_by_id)."""
+        role = (await self.snapshot(db)).by_name.get(name)
+        if role is None:
+            self.invalidate()
+            role = (await self.snapshot(db)).by_name.get(name)
+        return role
+
+    def invalidate(self) -> None:
+        """Force a reload on next access (call after modifying roles)."""
+        self._stale = True
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "roles": len(snapshot.by_id),
+            "loads": self.loads,
+            "age_seconds": round(time.monotonic() - snapshot.loaded_at, 1) if snapshot.loaded_at else None,
+            "ttl_seconds": self.ttl,
+        }
+
+
+# Global catalog (preloaded at startup)
+role_catalog = RoleCatalog(ttl=settings.ROLE_CATALOG_TTL_SECONDS)
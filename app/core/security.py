@@ -4,12 +4,18 @@ Security utilities.
 This module handles password hashing, verification, and JWT operations.
 """
 
+import hashlib
+import hmac
+import time
 from datetime import datetime, timedelta
 from typing import Any, Union, Dict, Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.keys import key_ring
+from app.core.metrics import JWT_DECODE_SECONDS, JWT_ENCODE_SECONDS
+from app.core.tracing import traced
 from app.utils.logger import logger
 
 # Password hashing configuration
@@ -43,12 +49,43 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def hash_token(token: str) -> bytes:
+    """
+    Compute the stored verifier for an opaque token (e.g. a refresh token).
+    
+    Tokens are high-entropy random values, so a single SHA-256 is enough;
+    unlike passwords they don't need a slow KDF like bcrypt.
+    
+    Args:
+        token: The raw token string
+        
+    Returns:
+        bytes: 32-byte SHA-256 digest
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def verify_token_digest(token: str, token_digest: bytes) -> bool:
+    """
+    Check a raw token against its stored digest in constant time.
+    
+    Args:
+        token: The raw token string presented by the client
+        token_digest: The digest stored in the database
+        
+    Returns:
+        bool: True if the token matches, False otherwise
+    """
+    return hmac.compare_digest(hash_token(token), token_digest)
+
+
+@traced("security.create_token")
 def create_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT token (access or refresh).
     
     Args:
-        data: Payload data (claims)
+        data: Payload data (claims); an explicit "exp" takes precedence
         expires_delta: Optional custom expiration time
         
     Returns:
@@ -56,7 +93,10 @@ def create_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None
     """
     to_encode = data.copy()
     
-    if expires_delta:
+    if "exp" in to_encode:
+        # Caller pinned the exact expiry (e.g. to match a stored row)
+        expire = to_encode["exp"]
+    elif expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
         # Default fallback (should usually be provided by caller)
@@ -68,22 +108,31 @@ def create_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None
     if "iat" not in to_encode:
         to_encode["iat"] = datetime.utcnow()
         
+    start = time.perf_counter()
     try:
-        encoded_jwt = jwt.encode(
-            to_encode, 
-            settings.SECRET_KEY, 
-            algorithm=settings.ALGORITHM
-        )
-        return encoded_jwt
+        if key_ring is None:
+            return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+        # Asymmetric: sign with the active key and name it in the header
+        signer = key_ring.active
+        return jwt.encode(to_encode, signer.private, algorithm=signer.algorithm, headers={"kid": signer.kid})
     except Exception as e:
         logger.error(f"Error creating token: {e}")
         raise
+    finally:
+        JWT_ENCODE_SECONDS.observe(time.perf_counter() - start)
 
 
+@traced("security.decode_token")
 def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and verify a JWT token.
     
+    With a key ring, the header's `kid` selects the verification key and
+    only that key's algorithm is accepted. Tokens without a `kid` are
+    accepted (as HS256 with SECRET_KEY) only while
+    JWT_ACCEPT_LEGACY_HS256 is set, to let outstanding tokens expire
+    after switching from HS256.
+    
     Args:
         token: The encoded JWT token string
         
@@ -93,13 +142,19 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         JWTError: If token is invalid or expired
     """
+    start = time.perf_counter()
     try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=[settings.ALGORITHM]
-        )
-        return payload
+        if key_ring is None:
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = key_ring.get(kid) if kid else None
+        if key is not None:
+            return jwt.decode(token, key.public, algorithms=[key.algorithm])
+        if kid is None and settings.JWT_ACCEPT_LEGACY_HS256:
+            return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
+        raise JWTError("Unknown signing key")
     except JWTError as e:
         # Caller should handle the specific error (expired, invalid signature, etc.)
         raise e
+    finally:
+        JWT_DECODE_SECONDS.observe(time.perf_counter() - start)
@@ -0,0 +1,93 @@
+"""
+Token Version Cache.
+
+Every access and refresh token carries the owner's token version as its
+`ver` claim. Bumping users.token_version (password change, global logout,
+deactivation) is one single-row UPDATE that invalidates all of the
+user's tokens: a token is accepted only while its `ver` matches.
+
+Checking that must not cost a query per request, so each worker caches
+user id -> version. A bump made in this process updates the cache at
+once; TOKEN_VERSION_CACHE_TTL_SECONDS bounds how long another worker
+can accept the old version.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.repositories.user_repo import AsyncUserRepository
+
+
+class TokenVersionCache:
+    """
+    Current token version per user id, loaded on demand.
+
+    Attributes:
+        loads: Database lookups made on cache misses
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache: TTLCache[int] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.loads = 0
+
+    async def get(self, db: AsyncSession, user_id: UUID) -> Optional[int]:
+        """
+        A user's current token version.
+
+        Returns:
+            The version, or None if the user does not exist
+        """
+        version = self._cache.get(user_id)
+        if version is None:
+            version = (await self.get_many(db, [user_id])).get(user_id)
+        return version
+
+    async def get_many(self, db: AsyncSession, user_ids: Iterable[UUID]) -> Dict[UUID, int]:
+        """
+        Current token versions for many users; misses are loaded with
+        one IN query. Unknown users are left out.
+        """
+        versions: Dict[UUID, int] = {}
+        missing = []
+        for user_id in user_ids:
+            version = self._cache.get(user_id)
+            if version is None:
+                missing.append(user_id)
+            else:
+                versions[user_id] = version
+        if missing:
+            self.loads += 1
+            for user_id, version in (await AsyncUserRepository(db).get_token_versions(missing)).items():
+                self._cache.set(user_id, version)
+                versions[user_id] = version
+        return versions
+
+    async def is_current(self, db: AsyncSession, user_id: UUID, version: int) -> bool:
+        """True if `version` (a token's `ver`) is the user's current one."""
+        return await self.get(db, user_id) == version
+
+    def set(self, user_id: UUID, version: int) -> None:
+        """Record a version just read or written by this process."""
+        self._cache.set(user_id, version)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._cache),
+            "hits": self._cache.hits,
+            "misses": self._cache.misses,
+            "loads": self.loads,
+        }
+
+
+# Global cache used by token validation and the services that bump versions
+token_versions = TokenVersionCache(
+    maxsize=settings.TOKEN_VERSION_CACHE_SIZE,
+    ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
@@ -5,14 +5,22 @@ This module handles the creation of specific token types (access/refresh)
 and defines their expiration policies.
 """
 
-from datetime import timedelta
-from typing import Dict, Any
+import secrets
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
 
 from app.core.config import settings
 from app.core.security import create_token
 from app.core.constants import TOKEN_TYPE_ACCESS, TOKEN_TYPE_REFRESH
+from app.core.metrics import ACCESS_TOKENS_ISSUED, REFRESH_TOKENS_ISSUED
 
-def create_access_token(user_id: str, role: str) -> str:
+def create_access_token(
+    user_id: str,
+    role: str,
+    permissions: int = 0,
+    session_id: Optional[str] = None,
+    token_version: int = 0,
+) -> str:
     """
     Create a short-lived access token.
     
@@ -20,10 +28,17 @@ def create_access_token(user_id: str, role: str) -> str:
     - sub (subject): user_id
     - type: "access"
     - role: user role
+    - perm: the role's permission bitmask (see app/core/permissions.py)
+    - jti: random id, so the token can be revoked (see app/core/denylist.py)
+    - sid: the login session (refresh token chain) it was issued from, if any
+    - ver: the user's token version (see app/core/token_versions.py)
     
     Args:
         user_id: The UUID string of the user
         role: The role name of the user
+        permissions: The role's permission_mask
+        session_id: The refresh token chain's session_id
+        token_version: The user's current token_version
         
     Returns:
         str: Encoded JWT access token
@@ -33,31 +48,76 @@ def create_access_token(user_id: str, role: str) -> str:
     payload = {
         "sub": str(user_id),
         "type": TOKEN_TYPE_ACCESS,
-        "role": role
+        "role": role,
+        "perm": permissions,
+        "jti": generate_token_id(),
+        "ver": token_version
     }
+    if session_id:
+        payload["sid"] = session_id
     
-    return create_token(payload, expires)
+    token = create_token(payload, expires)
+    ACCESS_TOKENS_ISSUED.inc()
+    return token
 
 
-def create_refresh_token(user_id: str) -> str:
+def generate_token_id() -> str:
+    """
+    Generate a random token identifier (used as the `jti` and `sid` claims).
+    
+    Returns:
+        str: 128-bit URL-safe random string
+    """
+    return secrets.token_urlsafe(16)
+
+
+def access_token_expires_at() -> datetime:
+    """Latest expiry of any access token issued up to now."""
+    return datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+
+def refresh_token_expires_at() -> datetime:
+    """
+    Expiry for a refresh token issued now, truncated to whole seconds.
+    
+    The `exp` claim has second precision; truncating means the value
+    stored in `refresh_tokens.expires_at` equals the claim exactly, so the
+    token itself tells us which partition holds its row.
+    """
+    expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    return expires_at.replace(microsecond=0)
+
+
+def create_refresh_token(
+    user_id: str, jti: str, expires_at: Optional[datetime] = None, token_version: int = 0
+) -> str:
     """
     Create a long-lived refresh token.
     
     Payload includes:
     - sub (subject): user_id
     - type: "refresh"
+    - jti: selector used to find the stored token row in one indexed lookup
+    - exp: equal to the stored expires_at (see refresh_token_expires_at)
+    - ver: the user's token version; rotation refuses an outdated one
     
     Args:
         user_id: The UUID string of the user
+        jti: Unique token identifier (see generate_token_id)
+        expires_at: Exact expiry; defaults to refresh_token_expires_at()
+        token_version: The user's current token_version
         
     Returns:
         str: Encoded JWT refresh token
     """
-    expires = timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    
     payload = {
         "sub": str(user_id),
-        "type": TOKEN_TYPE_REFRESH
+        "type": TOKEN_TYPE_REFRESH,
+        "jti": jti,
+        "exp": expires_at or refresh_token_expires_at(),
+        "ver": token_version
     }
     
-    return create_token(payload, expires)
+    token = create_token(payload)
+    REFRESH_TOKENS_ISSUED.inc()
+    return token
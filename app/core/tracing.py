@@ -0,0 +1,416 @@
+"""
+Request Tracing.
+
+A small in-process tracer: the tracing middleware opens a root span per
+sampled request, and spans are opened automatically around service and
+repository methods (`trace_methods`), security functions (`traced`) and
+SQL statements (`instrument_engine`). The finished trace goes to the
+configured exporters and, optionally, into a `Server-Timing` header.
+
+The active span lives in a ContextVar. When a request isn't sampled
+there is no active span and every instrumentation point reduces to one
+ContextVar lookup.
+"""
+
+import functools
+import inspect
+import json
+import queue
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.utils.logger import logger
+
+
+class Span:
+    """
+    One timed operation within a trace.
+
+    Attributes:
+        name: Operation name, e.g. "AuthService.login" or "db.query"
+        trace_id / span_id / parent_id: Hex identifiers (OTLP-compatible widths)
+        start_ns / end_ns: Wall clock, nanoseconds since the epoch
+        attributes: Extra key/value details (statement, status, error, ...)
+    """
+
+    __slots__ = ("name", "trace", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, trace: "Trace", parent_id: Optional[str], attributes: Optional[Dict[str, Any]]):
+        self.name = name
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.end_ns = 0
+        self.start_ns = time.time_ns()
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        if self.attributes is None:
+            self.attributes = {}
+        self.attributes[key] = value
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes or {},
+        }
+
+
+class Trace:
+    """Finished spans of one request; the root span ends last."""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self):
+        self.trace_id = f"{random.getrandbits(128):032x}"
+        self.spans: List[Span] = []
+
+    def server_timing(self) -> str:
+        """
+        `Server-Timing` header value: total milliseconds per span name
+        (repeated operations such as db.query are summed).
+        """
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        return ", ".join(f"{name};dur={ms:.2f}" for name, ms in totals.items())
+
+
+class SpanExporter(ABC):
+    """
+    Receives every finished, sampled trace.
+
+    `export` runs on the event loop at the end of the request, so
+    implementations must not block; slow sinks hand the trace to a
+    background thread.
+    """
+
+    @abstractmethod
+    def export(self, trace: Trace) -> None:
+        """Take one finished trace."""
+
+    def close(self) -> None:
+        """Flush and release resources (app shutdown)."""
+
+
+class RingBufferExporter(SpanExporter):
+    """Keeps the most recent traces in memory (served by GET /admin/traces)."""
+
+    def __init__(self, maxlen: int = 1000):
+        self._traces: deque = deque(maxlen=maxlen)
+
+    def export(self, trace: Trace) -> None:
+        self._traces.append(trace)
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        traces = list(self._traces)[-limit:]
+        return [
+            {"trace_id": trace.trace_id, "spans": [span.as_dict() for span in trace.spans]}
+            for trace in reversed(traces)
+        ]
+
+
+class JsonLogExporter(SpanExporter):
+    """Writes each trace as one JSON line to the application logger."""
+
+    def export(self, trace: Trace) -> None:
+        logger.info(json.dumps({"trace_id": trace.trace_id, "spans": [s.as_dict() for s in trace.spans]}))
+
+
+class OTLPFileExporter(SpanExporter):
+    """
+    Appends traces as OTLP/JSON `ExportTraceServiceRequest` lines, the
+    format the OpenTelemetry Collector's file receiver (otlpjsonfile) reads.
+
+    `export` only enqueues the trace; a writer thread serializes queued
+    traces and appends them in one write per batch. When the queue is full
+    traces are dropped (and counted) rather than stalling requests.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, service_name: str = settings.PROJECT_NAME, max_queue: int = 10000):
+        self.path = path
+        self._resource = {
+            "attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]
+        }
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    @staticmethod
+    def _span(span: Span) -> Dict[str, Any]:
+        return {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id or "",
+            "name": span.name,
+            "kind": 2 if span.parent_id is None else 1,  # SERVER for the root, else INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}}
+                for key, value in (span.attributes or {}).items()
+            ],
+        }
+
+    def _line(self, trace: Trace) -> str:
+        return json.dumps({
+            "resourceSpans": [{
+                "resource": self._resource,
+                "scopeSpans": [{
+                    "scope": {"name": "sentinel_auth"},
+                    "spans": [self._span(span) for span in trace.spans],
+                }],
+            }]
+        })
+
+    def export(self, trace: Trace) -> None:
+        if self._writer is None:
+            with self._lock:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._run, name="otlp-file-exporter", daemon=True)
+                    self._writer.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Write everything queued so far and stop the writer thread."""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(self._STOP)
+            writer.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < 500:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is self._STOP for item in batch)
+            lines = [self._line(trace) for trace in batch if trace is not self._STOP]
+            if lines:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                except OSError as e:
+                    logger.error(f"Trace exporter OTLPFileExporter failed: {e}")
+            if stop:
+                return
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("sentinel_current_span", default=None)
+
+
+class _ActiveSpan:
+    """Context manager making a span current for its duration."""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.span.set_attribute("error", exc_type.__name__)
+        _current_span.reset(self._token)
+        self.span.end()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+class Tracer:
+    """
+    Sampling decision, span creation and export.
+
+    Attributes:
+        enabled: Master switch
+        sample_rate: Fraction of requests traced (0.0 - 1.0)
+        exporters: Where finished traces go
+        server_timing: Add a Server-Timing header to sampled responses
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        sample_rate: float = 1.0,
+        exporters: Optional[List[SpanExporter]] = None,
+        server_timing: bool = False,
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.exporters = exporters or []
+        self.server_timing = server_timing
+
+    def start_trace(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Optional[_ActiveSpan]:
+        """Root span for a request, or None if tracing is off or not sampled."""
+        if not self.enabled or (self.sample_rate < 1.0 and random.random() >= self.sample_rate):
+            return None
+        return _ActiveSpan(Span(name, Trace(), None, attributes))
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """Child span of the current span; a no-op outside a sampled trace."""
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP
+        return _ActiveSpan(Span(name, parent.trace, parent.span_id, attributes))
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+        """Leaf span ended explicitly with .end() (callback-style instrumentation)."""
+        parent = _current_span.get()
+        if parent is None:
+            return None
+        return Span(name, parent.trace, parent.span_id, attributes)
+
+    def export(self, trace: Trace) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+            except Exception as e:
+                logger.error(f"Trace exporter {type(exporter).__name__} failed: {e}")
+
+    def close(self) -> None:
+        """Flush exporters that buffer (app shutdown)."""
+        for exporter in self.exporters:
+            exporter.close()
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator opening a span around a sync or async function."""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await fn(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        if inspect.isasyncgenfunction(fn):
+            # Generators outlive the call; the span would not cover consumption
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with tracer.span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def trace_methods(cls: type) -> type:
+    """
+    Class decorator: trace every public method as "ClassName.method".
+    Used on services and repositories.
+    """
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not inspect.isfunction(value):
+            continue
+        setattr(cls, attr, traced(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Open a "db.query" span per SQL statement executed on `engine`."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span("db.query")
+        if span is not None and context is not None:
+            span.set_attribute("db.statement", statement[:500])
+            context._sentinel_span = span
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        span = getattr(context, "_sentinel_span", None)
+        if span is not None:
+            context._sentinel_span = None
+            span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        context = exception_context.execution_context
+        span = getattr(context, "_sentinel_span", None)
+        if span is not None:
+            context._sentinel_span = None
+            span.set_attribute("error", type(exception_context.original_exception).__name__)
+            span.end()
+
+
+def _build_exporters() -> List[SpanExporter]:
+    exporters: List[SpanExporter] = []
+    for name in filter(None, (part.strip() for part in settings.TRACING_EXPORTERS.split(","))):
+        if name == "memory":
+            exporters.append(ring_buffer)
+        elif name == "log":
+            exporters.append(JsonLogExporter())
+        elif name == "otlp_file":
+            exporters.append(OTLPFileExporter(settings.TRACING_OTLP_FILE))
+        else:
+            raise ValueError(f"Unknown tracing exporter: {name!r}")
+    return exporters
+
+
+# Recent traces for GET /admin/traces (used when "memory" is an exporter)
+ring_buffer = RingBufferExporter(maxlen=settings.TRACING_BUFFER_SIZE)
+
+# Global tracer
+tracer = Tracer(
+    enabled=settings.TRACING_ENABLED,
+    sample_rate=settings.TRACING_SAMPLE_RATE,
+    exporters=_build_exporters(),
+    server_timing=settings.TRACING_SERVER_TIMING,
+)
@@ -5,13 +5,17 @@ This module exports all database models for easy importing.
 Import all models here so Alembic can detect them for migrations.
 """
 
+from app.db.models.permission import Permission
 from app.db.models.role import Role
 from app.db.models.user import User
 from app.db.models.refresh_token import RefreshToken
+from app.db.models.revoked_access_token import RevokedAccessToken
 
 # Export all models
 __all__ = [
+    "Permission",
     "Role",
     "User",
     "RefreshToken",
+    "RevokedAccessToken",
 ]
@@ -0,0 +1,63 @@
+"""
+Permission database model.
+
+This module defines the Permission model and the role_permissions
+association table (which permissions each role grants).
+"""
+
+from sqlalchemy import Column, ForeignKey, Integer, SmallInteger, String, Table
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+# Role -> permission grants. `roles.permission_mask` is the precomputed
+# OR of the granted bits and must be updated together with this table.
+role_permissions = Table(
+    "role_permissions",
+    Base.metadata,
+    Column("role_id", ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True),
+    Column("permission_id", ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True),
+)
+
+
+class Permission(Base):
+    """
+    A named permission and its bit in the token bitmask.
+
+    Rows mirror the catalog in app/core/permissions.py.
+
+    Attributes:
+        id: Primary key
+        name: Unique permission name (e.g., 'users:read')
+        bit: Bit position in `roles.permission_mask` and the `perm` claim
+        description: What the permission allows
+    """
+
+    __tablename__ = "permissions"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    name: Mapped[str] = mapped_column(
+        String(100),
+        unique=True,
+        nullable=False,
+        comment="Unique permission name (e.g., 'users:read')"
+    )
+
+    bit: Mapped[int] = mapped_column(
+        SmallInteger,
+        unique=True,
+        nullable=False,
+        comment="Bit position in the role permission mask"
+    )
+
+    description: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="What the permission allows"
+    )
+
+    def __repr__(self) -> str:
+        """String representation of Permission."""
+        return f"<Permission(name='{self.name}', bit={self.bit})>"
@@ -8,7 +8,7 @@ Each user can have multiple refresh tokens (multi-device support).
 import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Boolean, ForeignKey, UUID, DateTime
+from sqlalchemy import String, Boolean, ForeignKey, UUID, DateTime, Integer, LargeBinary, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -17,6 +17,12 @@ if TYPE_CHECKING:
     from app.db.models.user import User
 
 
+# Columns the session listing reads (covered by ix_refresh_tokens_user_sessions)
+SESSION_COLUMNS = [
+    "session_id", "session_started_at", "device", "user_agent", "created_at", "expires_at", "token_version",
+]
+
+
 class RefreshToken(Base):
     """
     RefreshToken model for managing JWT refresh tokens.
@@ -25,8 +31,19 @@ class RefreshToken(Base):
     re-authenticating. Each user can have multiple refresh tokens
     to support multiple devices/sessions.
     
+    Lookup uses a selector/verifier scheme:
+    - `jti` (selector) is a random id carried in the JWT and unique-indexed,
+      so finding the row is one point lookup
+    - `token_digest` (verifier) is the SHA-256 of the full token, compared
+      in constant time; the raw token is never stored
+    
+    On PostgreSQL the table can be RANGE-partitioned by `expires_at` month
+    (REFRESH_TOKENS_PARTITIONED, see app/db/partitions.py). The database
+    then uses (id, expires_at) as primary key and (jti, expires_at) as the
+    unique selector index; this mapping is unchanged.
+    
     Security features:
-    - Tokens are hashed before storage (like passwords)
+    - Tokens are hashed before storage
     - Tokens can be revoked
     - Tokens have expiration dates
     - Tokens are deleted when user is deleted (cascade)
@@ -34,19 +51,45 @@ class RefreshToken(Base):
     Attributes:
         id: Primary key
         user_id: Foreign key to users table (UUID)
-        token_hash: Hashed refresh token (never store plain tokens!)
+        jti: Unique token identifier (selector, from the JWT `jti` claim)
+        token_digest: SHA-256 digest of the refresh token (verifier)
         expires_at: When this token expires
         is_revoked: Whether this token has been revoked
-        created_at: When this token was created
+        revoked_at: When this token was revoked (for purge retention)
+        created_at: When this token was created (i.e. the session's last refresh)
+        session_id: Stable id of the login session; carried over on rotation
+        session_started_at: When the session logged in; carried over on rotation
+        user_agent: User-Agent of the login request
+        device: Short device label derived from the User-Agent
+        token_version: The owner's token version at issue; rows older than
+            users.token_version are dead (global logout) and not listed
         user: The user who owns this token (relationship)
     """
     
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Purger scans revoked rows by age; partial so live rows never touch it
+        Index(
+            "ix_refresh_tokens_revoked_at",
+            "revoked_at",
+            postgresql_where=text("is_revoked"),
+            sqlite_where=text("is_revoked"),
+        ),
+        # Session listing/revocation: partial (live rows only) and, on
+        # PostgreSQL, covering, so listing a user's sessions is an
+        # index-only scan however many revoked rows they have
+        Index(
+            "ix_refresh_tokens_user_sessions",
+            "user_id",
+            postgresql_include=SESSION_COLUMNS,
+            postgresql_where=text("NOT is_revoked"),
+            sqlite_where=text("NOT is_revoked"),
+        ),
+    )
     
     # Primary Key
     id: Mapped[int] = mapped_column(
         primary_key=True,
-        index=True,
         comment="Unique token identifier"
     )
     
@@ -60,11 +103,18 @@ class RefreshToken(Base):
     )
     
     # Token Information
-    token_hash: Mapped[str] = mapped_column(
-        String(255),
+    jti: Mapped[str] = mapped_column(
+        String(64),
         nullable=False,
+        unique=True,
         index=True,
-        comment="Hashed refresh token (never store plain tokens!)"
+        comment="Token identifier (selector) from the JWT jti claim"
+    )
+    
+    token_digest: Mapped[bytes] = mapped_column(
+        LargeBinary(32),
+        nullable=False,
+        comment="SHA-256 digest of the refresh token (never store plain tokens!)"
     )
     
     expires_at: Mapped[datetime] = mapped_column(
@@ -78,10 +128,15 @@ class RefreshToken(Base):
         Boolean,
         default=False,
         nullable=False,
-        index=True,
         comment="Whether this token has been revoked (logout)"
     )
     
+    revoked_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="When this token was revoked (purged after a retention period)"
+    )
+    
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow,
@@ -89,6 +144,39 @@ class RefreshToken(Base):
         comment="When this token was created"
     )
     
+    # Session (one login on one device, across rotations)
+    session_id: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Login session id (stable across rotations, `sid` claim)"
+    )
+    
+    session_started_at: Mapped[datetime | None] = mapped_column(
+        DateTime,
+        nullable=True,
+        comment="When the session logged in"
+    )
+    
+    user_agent: Mapped[str | None] = mapped_column(
+        String(255),
+        nullable=True,
+        comment="User-Agent of the login request (truncated)"
+    )
+    
+    device: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        comment="Device label derived from the User-Agent (e.g. 'Firefox on Linux')"
+    )
+    
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default=text("0"),
+        nullable=False,
+        comment="Owner's token version when issued (`ver` claim)"
+    )
+    
     # Relationships
     user: Mapped["User"] = relationship(
         "User",
@@ -99,7 +187,7 @@ class RefreshToken(Base):
     def __repr__(self) -> str:
         """String representation of RefreshToken."""
         return (
-            f"<RefreshToken(id={self.id}, user_id={self.user_id}, "
+            f"<RefreshToken(id={self.id}, jti='{self.jti}', user_id={self.user_id}, "
             f"expires_at={self.expires_at}, is_revoked={self.is_revoked})>"
         )
     
@@ -0,0 +1,57 @@
+"""
+RevokedAccessToken database model.
+
+This module defines the access token denylist. Access tokens are
+stateless JWTs; revoking one before its `exp` means recording its `jti`
+here. Revoking a whole login session records its `sid` instead (the
+ids share one random namespace, see generate_token_id).
+
+Every worker mirrors the table in memory (app/core/denylist.py), so
+requests never query it.
+"""
+
+from datetime import datetime
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RevokedAccessToken(Base):
+    """
+    A revoked, not yet expired access token.
+
+    Rows are only useful until the token's own expiry, so the table stays
+    as small as the number of revocations within one access token
+    lifetime; the token purger deletes the rest.
+
+    Attributes:
+        jti: The token's `jti` claim, or the session's `sid` claim
+        expires_at: The token's `exp`; the row can be deleted afterwards
+        revoked_at: When the token was revoked (sync watermark for workers)
+    """
+
+    __tablename__ = "revoked_access_tokens"
+
+    jti: Mapped[str] = mapped_column(
+        String(64),
+        primary_key=True,
+        comment="The revoked token's jti claim"
+    )
+
+    expires_at: Mapped[datetime] = mapped_column(
+        nullable=False,
+        index=True,
+        comment="The revoked token's exp (row is purgeable afterwards)"
+    )
+
+    revoked_at: Mapped[datetime] = mapped_column(
+        default=datetime.utcnow,
+        nullable=False,
+        index=True,
+        comment="When the token was revoked"
+    )
+
+    def __repr__(self) -> str:
+        """String representation of RevokedAccessToken."""
+        return f"<RevokedAccessToken(jti='{self.jti}', expires_at={self.expires_at})>"
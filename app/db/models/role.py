@@ -7,10 +7,11 @@ Roles define what permissions a user has in the system.
 
 from datetime import datetime
 from typing import List, TYPE_CHECKING
-from sqlalchemy import String
+from sqlalchemy import BigInteger, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
+from app.db.models.permission import Permission, role_permissions
 
 if TYPE_CHECKING:
     from app.db.models.user import User
@@ -27,8 +28,10 @@ class Role(Base):
         id: Primary key
         name: Unique role name (e.g., 'admin', 'user')
         description: Optional description of the role
+        permission_mask: OR of the granted permissions' bits (embedded in access tokens)
         created_at: Timestamp when role was created
         users: List of users with this role (relationship)
+        permissions: Granted permissions (relationship)
     """
     
     __tablename__ = "roles"
@@ -51,6 +54,15 @@ class Role(Base):
         comment="Optional description of the role"
     )
     
+    # Precomputed from role_permissions; see app/core/permissions.py
+    permission_mask: Mapped[int] = mapped_column(
+        BigInteger,
+        default=0,
+        server_default="0",
+        nullable=False,
+        comment="Bitmask of granted permissions"
+    )
+    
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow,
@@ -65,6 +77,12 @@ class Role(Base):
         cascade="all, delete-orphan"  # Delete users if role deleted (careful!)
     )
     
+    permissions: Mapped[List["Permission"]] = relationship(
+        Permission,
+        secondary=role_permissions,
+        lazy="select"  # Authorization uses permission_mask; load only to edit grants
+    )
+    
     def __repr__(self) -> str:
         """String representation of Role."""
         return f"<Role(id={self.id}, name='{self.name}')>"
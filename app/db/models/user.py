@@ -8,7 +8,7 @@ in the system. Each user has a role and can have multiple refresh tokens.
 import uuid
 from datetime import datetime
 from typing import List, TYPE_CHECKING
-from sqlalchemy import String, Boolean, ForeignKey, UUID
+from sqlalchemy import String, Boolean, ForeignKey, UUID, Index, Integer, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -28,6 +28,8 @@ class User(Base):
     - Password hash (never store plain passwords!)
     - A role (admin, user, etc.)
     - Active status flag
+    - A token version, embedded in every token it is issued (`ver`);
+      bumping it invalidates all of the user's tokens at once
     - Timestamps for creation and updates
     - Multiple refresh tokens (for multi-device support)
     
@@ -38,6 +40,8 @@ class User(Base):
         password_hash: Bcrypt hashed password
         role_id: Foreign key to roles table
         is_active: Whether the user account is active
+        token_version: Current token version (bumped on password change,
+            global logout and deactivation)
         created_at: When the user was created
         updated_at: When the user was last updated
         role: The user's role (relationship)
@@ -45,6 +49,10 @@ class User(Base):
     """
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination order for admin listings
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     # Primary Key (UUID)
     id: Mapped[uuid.UUID] = mapped_column(
@@ -93,6 +101,14 @@ class User(Base):
         comment="Whether the user account is active"
     )
     
+    token_version: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default=text("0"),
+        nullable=False,
+        comment="Tokens carrying an older version (`ver` claim) are rejected"
+    )
+    
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         default=datetime.utcnow,
@@ -0,0 +1,237 @@
+"""
+Refresh token table partitioning (PostgreSQL only, optional).
+
+With REFRESH_TOKENS_PARTITIONED enabled, `refresh_tokens` is a declarative
+RANGE-partitioned table with one partition per calendar month of
+`expires_at`. Retention then becomes "detach and drop whole partitions
+whose month has fully expired" instead of millions of row deletes, which
+avoids the vacuum/bloat cost of purging a very large table.
+
+Lookups stay cheap because refresh tokens carry their expiry (`exp`), so
+repository queries add an `expires_at` window and PostgreSQL prunes to
+the one or two partitions that can contain the row.
+
+Every function takes a sync Connection; async callers use
+`await conn.run_sync(fn, ...)`.
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.db.models.refresh_token import SESSION_COLUMNS
+from app.utils.logger import logger
+
+TABLE = "refresh_tokens"
+_LEGACY_TABLE = "refresh_tokens_unpartitioned"
+_SEQUENCE = "refresh_tokens_id_seq"
+_INDEXES = (
+    "refresh_tokens_pkey",
+    "ix_refresh_tokens_jti",
+    "ix_refresh_tokens_user_id",
+    "ix_refresh_tokens_expires_at",
+    "ix_refresh_tokens_revoked_at",
+    "ix_refresh_tokens_user_sessions",
+)
+# pg_advisory_xact_lock key serializing maintenance across workers
+_MAINTENANCE_LOCK_ID = 0x5E47_0007
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant of the month containing `moment`."""
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(start: datetime) -> datetime:
+    """First instant of the month after `start` (a month start)."""
+    return (start + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(start: datetime) -> str:
+    """Partition table name for the month starting at `start`."""
+    return f"{TABLE}_p{start:%Y_%m}"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    """True if refresh_tokens is a partitioned table."""
+    if conn.dialect.name != "postgresql":
+        return False
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": TABLE},
+    ).scalar()
+    return relkind == "p"
+
+
+def list_partitions(conn: Connection) -> List[Tuple[str, datetime]]:
+    """
+    Existing monthly partitions as (name, month start), oldest first.
+    """
+    names = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass(:table)"
+        ),
+        {"table": TABLE},
+    ).scalars()
+    partitions = []
+    prefix = f"{TABLE}_p"
+    for name in names:
+        if name.startswith(prefix):
+            partitions.append((name, datetime.strptime(name[len(prefix):], "%Y_%m")))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+def ensure_partitions(conn: Connection, until: datetime, since: datetime | None = None) -> int:
+    """
+    Create any missing monthly partitions covering [since, until].
+
+    Args:
+        conn: Connection (PostgreSQL)
+        until: Latest expires_at that must be insertable
+        since: Earliest month to cover (defaults to the current month)
+
+    Returns:
+        Number of partitions created
+    """
+    created = 0
+    start = month_start(since or datetime.utcnow())
+    while start <= until:
+        end = next_month(start)
+        name = partition_name(start)
+        exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists is None:
+            # IF NOT EXISTS: another worker may have created it since the check
+            conn.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+            ))
+            logger.info(f"Created partition {name}")
+            created += 1
+        start = end
+    return created
+
+
+def drop_expired_partitions(conn: Connection, older_than: datetime) -> int:
+    """
+    Detach and drop partitions whose whole month ends before `older_than`.
+
+    Every row in such a partition has expired, so this is a metadata-only
+    operation instead of a bulk DELETE.
+
+    Returns:
+        Number of partitions dropped
+    """
+    dropped = 0
+    for name, start in list_partitions(conn):
+        if next_month(start) > older_than:
+            break
+        conn.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+        logger.info(f"Dropped expired partition {name}")
+        dropped += 1
+    return dropped
+
+
+def partition_refresh_tokens(conn: Connection, months_ahead: int) -> None:
+    """
+    Convert the plain refresh_tokens table into a partitioned one.
+
+    Copies existing rows, keeping ids and the id sequence. The partition
+    key must be part of every unique constraint, so the primary key
+    becomes (id, expires_at) and the jti index (jti, expires_at).
+    """
+    conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {_LEGACY_TABLE}"))
+    for index in _INDEXES:
+        legacy = index.replace(TABLE, _LEGACY_TABLE)
+        conn.execute(text(f"ALTER INDEX IF EXISTS {index} RENAME TO {legacy}"))
+    conn.execute(text(f"ALTER SEQUENCE {_SEQUENCE} OWNED BY NONE"))
+
+    # LIKE copies whatever columns the table has at this revision
+    conn.execute(text(f"""
+        CREATE TABLE {TABLE} (
+            LIKE {_LEGACY_TABLE} INCLUDING DEFAULTS INCLUDING COMMENTS,
+            CONSTRAINT refresh_tokens_pkey PRIMARY KEY (id, expires_at),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (expires_at)
+    """))
+    conn.execute(text(f"CREATE UNIQUE INDEX ix_refresh_tokens_jti ON {TABLE} (jti, expires_at)"))
+    _create_secondary_indexes(conn)
+
+    oldest = conn.execute(text(f"SELECT min(expires_at) FROM {_LEGACY_TABLE}")).scalar()
+    now = datetime.utcnow()
+    ensure_partitions(conn, until=month_start(now) + timedelta(days=31 * months_ahead), since=min(oldest or now, now))
+
+    conn.execute(text(f"INSERT INTO {TABLE} SELECT * FROM {_LEGACY_TABLE}"))
+    conn.execute(text(f"DROP TABLE {_LEGACY_TABLE}"))
+    conn.execute(text(f"ALTER SEQUENCE {_SEQUENCE} OWNED BY {TABLE}.id"))
+
+
+def unpartition_refresh_tokens(conn: Connection) -> None:
+    """
+    Reverse partition_refresh_tokens(): back to a single plain table.
+    """
+    conn.execute(text(f"ALTER TABLE {TABLE} RENAME TO {_LEGACY_TABLE}"))
+    for index in _INDEXES:
+        legacy = index.replace(TABLE, _LEGACY_TABLE)
+        conn.execute(text(f"ALTER INDEX IF EXISTS {index} RENAME TO {legacy}"))
+    conn.execute(text(f"ALTER SEQUENCE {_SEQUENCE} OWNED BY NONE"))
+
+    conn.execute(text(f"""
+        CREATE TABLE {TABLE} (
+            LIKE {_LEGACY_TABLE} INCLUDING DEFAULTS INCLUDING COMMENTS,
+            CONSTRAINT refresh_tokens_pkey PRIMARY KEY (id),
+            FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+        )
+    """))
+    conn.execute(text(f"INSERT INTO {TABLE} SELECT * FROM {_LEGACY_TABLE}"))
+    conn.execute(text(f"DROP TABLE {_LEGACY_TABLE}"))
+    conn.execute(text(f"ALTER SEQUENCE {_SEQUENCE} OWNED BY {TABLE}.id"))
+
+    conn.execute(text(f"CREATE UNIQUE INDEX ix_refresh_tokens_jti ON {TABLE} (jti)"))
+    _create_secondary_indexes(conn)
+
+
+def _create_secondary_indexes(conn: Connection) -> None:
+    """Indexes that are the same on the plain and the partitioned table."""
+    conn.execute(text(f"CREATE INDEX ix_refresh_tokens_user_id ON {TABLE} (user_id)"))
+    conn.execute(text(f"CREATE INDEX ix_refresh_tokens_expires_at ON {TABLE} (expires_at)"))
+    conn.execute(text(
+        f"CREATE INDEX ix_refresh_tokens_revoked_at ON {TABLE} (revoked_at) WHERE is_revoked"
+    ))
+    # Added with the session columns; absent when running older migrations
+    columns = set(conn.execute(
+        text("SELECT column_name FROM information_schema.columns WHERE table_name = :table"),
+        {"table": TABLE},
+    ).scalars())
+    if columns.issuperset(SESSION_COLUMNS):
+        conn.execute(text(
+            f"CREATE INDEX ix_refresh_tokens_user_sessions ON {TABLE} (user_id) "
+            f"INCLUDE ({', '.join(SESSION_COLUMNS)}) WHERE NOT is_revoked"
+        ))
+
+
+def maintain_partitions(conn: Connection, months_ahead: int, retention: timedelta) -> Tuple[int, int]:
+    """
+    Routine maintenance: pre-create future partitions, drop expired ones.
+
+    Every app worker runs this, so it first takes a transaction-scoped
+    advisory lock; concurrent callers wait and then find nothing to do.
+    The lock is released when the caller commits.
+
+    Args:
+        months_ahead: Months of partitions to keep ready beyond the
+            longest refresh token lifetime
+        retention: How long after a month fully expires to keep it
+
+    Returns:
+        (partitions created, partitions dropped)
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _MAINTENANCE_LOCK_ID})
+    now = datetime.utcnow()
+    created = ensure_partitions(conn, until=month_start(now) + timedelta(days=31 * months_ahead))
+    dropped = drop_expired_partitions(conn, older_than=now - retention)
+    return created, dropped
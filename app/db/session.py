@@ -3,20 +3,51 @@ Database session management.
 
 This module handles SQLAlchemy engine creation, session factory,
 and provides a dependency for FastAPI routes to get database sessions.
+
+Two stacks live side by side:
+- Sync (`engine` / `SessionLocal`): used by scripts/ and tests.
+- Async (`async_engine` / `AsyncSessionLocal`): used by the request path,
+  so routes never block a threadpool slot while waiting on the database.
 """
 
-from typing import Generator
+from typing import Any, AsyncGenerator, Dict, Generator
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 from app.core.config import settings
+from app.core.metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool, pool_collector
+from app.core.tracing import instrument_engine
+
+
+# Bare "postgresql" URLs default to psycopg2, which is not a dependency
+_SYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+}
+
+
+def get_sync_database_url(database_url: str) -> str:
+    """
+    Point a bare PostgreSQL URL at psycopg 3 (the installed driver).
+
+    Args:
+        database_url: The configured database URL
+
+    Returns:
+        str: URL with an explicit, installed sync driver
+    """
+    url = make_url(database_url)
+    drivername = _SYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
 
 
 # Create SQLAlchemy engine
 # echo=True will log all SQL statements (useful for debugging)
 engine = create_engine(
-    settings.DATABASE_URL,
+    get_sync_database_url(settings.DATABASE_URL),
     echo=settings.DEBUG,  # Log SQL in debug mode
+    poolclass=TimedQueuePool,  # QueuePool that records checkout wait
     pool_pre_ping=True,   # Verify connections before using them
     pool_size=5,          # Number of connections to maintain
     max_overflow=10       # Max connections beyond pool_size
@@ -33,6 +64,80 @@ SessionLocal = sessionmaker(
 )
 
 
+# Sync drivers and the async driver that replaces them for the async engine
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "postgresql+psycopg": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Derive an async driver URL from a sync database URL.
+
+    psycopg 3 serves both sync and async connections, so PostgreSQL URLs
+    are pointed at `postgresql+psycopg`. SQLite uses `aiosqlite`.
+
+    Args:
+        database_url: The configured (sync) database URL
+
+    Returns:
+        str: URL using an asyncio-compatible driver
+    """
+    url = make_url(database_url)
+    drivername = _ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def get_connect_args(database_url: str) -> Dict[str, Any]:
+    """
+    Driver connect arguments for an engine URL.
+
+    psycopg 3 prepares statements server-side after DB_PREPARE_THRESHOLD
+    executions on a connection, which pays off for the prebuilt hot-path
+    statements in the repositories (identical SQL on every call). Other
+    drivers get no extra arguments.
+    """
+    if make_url(database_url).drivername != "postgresql+psycopg":
+        return {}
+    threshold = settings.DB_PREPARE_THRESHOLD
+    return {"prepare_threshold": threshold if threshold >= 0 else None}
+
+
+# Create async SQLAlchemy engine (same pool policy as the sync engine)
+_async_database_url = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    _async_database_url,
+    connect_args=get_connect_args(_async_database_url),
+    echo=settings.DEBUG,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_pre_ping=True,
+    pool_size=5,
+    max_overflow=10
+)
+
+# "db.query" spans for every statement of a traced request
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+# Pool occupancy/saturation is read by the /metrics collector at scrape time
+pool_collector.add("sync", engine.pool)
+pool_collector.add("async", async_engine.sync_engine.pool)
+
+# Create async session factory
+# expire_on_commit=False: attributes stay loaded after commit, so response
+# serialization never triggers an implicit (blocking) lazy load
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     FastAPI dependency that provides a database session.
@@ -54,3 +159,20 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    FastAPI dependency that provides an async database session.
+    
+    Usage in FastAPI routes:
+        @app.get("/users")
+        async def get_users(db: AsyncSession = Depends(get_async_db)):
+            # Use await db.execute(...) here
+            pass
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
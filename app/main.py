@@ -5,13 +5,26 @@ This is the main application file that creates and configures
 the FastAPI application instance.
 """
 
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 
 from app.core.config import settings
-from app.db.session import engine
+from app.core.hashing import hashing_executor
+from app.core.keys import EMPTY_JWKS, key_ring
+from app.core.metrics import render_metrics
+from app.core.role_catalog import role_catalog
+from app.core.tracing import tracer
+from app.db.session import AsyncSessionLocal, engine, async_engine
 from app.db.base import Base
+from app.middlewares.metrics import MetricsMiddleware
+from app.middlewares.rate_limit import RateLimitMiddleware, rate_limiter
+from app.middlewares.tracing import TracingMiddleware
+from app.services.denylist_service import denylist_sync_service
+from app.services.token_purge_service import token_purge_service
+from app.utils.exceptions import HashingUnavailableError
 
 
 @asynccontextmanager
@@ -25,6 +38,12 @@ async def lifespan(app: FastAPI):
     Startup:
         - Log application start
         - Verify database connection
+        - Start the password hashing pool
+        - Preload the role catalog
+        - Load the access token denylist and start syncing it
+        - Ensure upcoming refresh_tokens partitions exist and keep them
+          maintained (if partitioned)
+        - Start the refresh token purger (if enabled)
     
     Shutdown:
         - Clean up resources
@@ -43,11 +62,55 @@ async def lifespan(app: FastAPI):
         print(f"Database connection failed: {e}")
         raise
     
+    hashing_executor.start()
+    print(f"Hashing pool: {hashing_executor.workers} workers, queue {hashing_executor.max_queue}")
+    
+    # Not fatal: the catalog loads itself on first use
+    try:
+        async with AsyncSessionLocal() as db:
+            snapshot = await role_catalog.load(db)
+        print(f"Role catalog: {len(snapshot.by_id)} roles")
+    except Exception as e:
+        print(f"Role catalog preload failed: {e}")
+    
+    try:
+        loaded = await denylist_sync_service.sync_once()
+        print(f"Access token denylist: {loaded} revoked tokens loaded")
+    except Exception as e:
+        print(f"Access token denylist load failed: {e}")
+    denylist_task = None
+    if settings.ACCESS_DENYLIST_SYNC_SECONDS > 0:
+        denylist_task = asyncio.create_task(denylist_sync_service.run_forever())
+    
+    partition_task = None
+    if settings.REFRESH_TOKENS_PARTITIONED:
+        try:
+            created, dropped = await token_purge_service.maintain_partitions()
+            print(f"Token partitions: {created} created, {dropped} dropped")
+        except Exception as e:
+            print(f"Token partition maintenance failed: {e}")
+        partition_task = asyncio.create_task(
+            token_purge_service.run_partition_maintenance_forever()
+        )
+    
+    purge_task = None
+    if settings.TOKEN_PURGE_ENABLED:
+        purge_task = asyncio.create_task(token_purge_service.run_forever())
+        print(f"Token purger running every {settings.TOKEN_PURGE_INTERVAL_SECONDS}s")
+    
     yield
     
     # Shutdown
     print(f"Shutting down {settings.PROJECT_NAME}")
+    for task in (purge_task, partition_task, denylist_task):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    hashing_executor.shutdown()
+    tracer.close()
     engine.dispose()
+    await async_engine.dispose()
     print("Database connections closed")
 
 
@@ -72,6 +135,35 @@ app.add_middleware(
 )
 
 
+# Tracing is always installed: unsampled requests cost one check
+app.add_middleware(TracingMiddleware, tracer=tracer)
+
+# Middleware added later wraps earlier ones, so requests pass through
+# Metrics -> RateLimit -> Tracing -> CORS. Rate limiting sits outside
+# tracing, so throttled requests are rejected before any tracing or routing work
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+# Metrics wraps everything, so throttled (429) requests are counted too
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(HashingUnavailableError)
+async def hashing_unavailable_handler(request: Request, exc: HashingUnavailableError):
+    """
+    Shed load when the bcrypt pool is saturated.
+    
+    A fast 503 with Retry-After is better than an unbounded wait that
+    drags every other endpoint's latency up with it.
+    """
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """
@@ -104,6 +196,35 @@ async def health_check():
         "version": settings.VERSION
     }
 
+@app.get("/.well-known/jwks.json", tags=["Keys"])
+async def jwks(request: Request):
+    """
+    Public signing keys (RFC 7517 JWK Set) for local token verification.
+    
+    The document only changes on a key rotation (i.e. a restart), so it
+    is prebuilt with a strong ETag; conditional requests get a 304.
+    Empty while tokens are HS256-signed.
+    """
+    payload, etag = (key_ring.jwks, key_ring.etag) if key_ring else (EMPTY_JWKS, '"empty"')
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.JWKS_CACHE_SECONDS}"}
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """
+        Prometheus scrape endpoint.
+        
+        Not authenticated: expose it only on an internal network.
+        """
+        payload, content_type = render_metrics()
+        return Response(content=payload, media_type=content_type)
+
+
 # Include API routers
 from app.api.router import api_router
 app.include_router(api_router, prefix="/api/v1")
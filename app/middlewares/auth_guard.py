@@ -0,0 +1,73 @@
+"""
+Authorization Guards.
+
+FastAPI dependencies that authorize a request from its access token
+alone: the token's `perm` claim (the role's permission bitmask when the
+token was issued) is ANDed with the mask the route requires. No user or
+role is loaded; logged-out tokens are rejected from the in-memory
+denylist and tokens of deactivated or globally logged-out users by the
+token version cache (a query only on a cache miss).
+
+Grant changes therefore reach a user with their next access token
+(at most ACCESS_TOKEN_EXPIRE_MINUTES later).
+"""
+
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, status
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_async_db, reusable_oauth2
+from app.core.constants import TOKEN_TYPE_ACCESS
+from app.core.denylist import access_denylist
+from app.core.permissions import permission_registry
+from app.core.security import decode_token
+from app.core.token_versions import token_versions
+from app.schemas.token import TokenPayload
+
+
+def require_permissions(*names: str) -> Callable[..., Awaitable[TokenPayload]]:
+    """
+    Dependency factory: the caller's token must grant every permission in `names`.
+
+    Names are compiled into a mask once, when the route is declared, so
+    an unknown permission fails at import time rather than per request.
+    With no names, any valid access token passes.
+
+    Usage:
+        @router.get("/users")
+        async def list_users(token: TokenPayload = Depends(require_permissions(USERS_READ))): ...
+
+    Returns:
+        A dependency resolving to the verified token claims
+    """
+    required = permission_registry.mask(names)
+
+    async def guard(
+        token: str = Depends(reusable_oauth2),
+        db: AsyncSession = Depends(get_async_db),
+    ) -> TokenPayload:
+        try:
+            payload = TokenPayload(**decode_token(token))
+            user_id = UUID(payload.sub)
+        except (JWTError, TypeError, ValueError):
+            payload = None
+        if payload is None or payload.type != TOKEN_TYPE_ACCESS:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        if access_denylist.is_token_revoked(payload.jti, payload.sid):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+        if not await token_versions.is_current(db, user_id, payload.ver):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
+        if payload.perm & required != required:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="The user doesn't have enough privileges",
+            )
+        return payload
+
+    return guard
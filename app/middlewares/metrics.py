@@ -0,0 +1,44 @@
+"""
+Request Metrics Middleware.
+
+Pure ASGI middleware recording request latency per route template
+(e.g. `/api/v1/admin/users/{user_id}/role`, not the concrete path, so
+label cardinality stays bounded). Requests that match no route are
+grouped under "unmatched".
+"""
+
+import time
+
+from app.core.metrics import observe_http
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500  # Reported if the app fails before sending a response
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            observe_http(
+                scope["method"],
+                route.path if route is not None else UNMATCHED_ROUTE,
+                status,
+                time.perf_counter() - start,
+            )
@@ -0,0 +1,338 @@
+"""
+Rate Limiting Middleware.
+
+A pure ASGI middleware (no BaseHTTPMiddleware, no Request objects) that
+throttles selected routes before they reach FastAPI, so floods against
+/auth/login or /users/signup are rejected before they cost a bcrypt hash.
+
+Rules map an exact "METHOD /path" to a limit, a key (client IP, the
+`username` in the JSON body, or the route as a whole) and an algorithm:
+
+- token_bucket: `limit` requests of burst, refilled evenly over `window`
+- sliding_window: approximate sliding window (current + weighted previous
+  fixed window count), no bursts across window edges
+
+Requests to routes without a rule cost one dict lookup. Counters live in a
+RateLimitBackend; the default MemoryBackend keeps them in sharded dicts
+with one small lock per shard.
+"""
+
+import json
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+KEY_IP = "ip"
+KEY_USER = "user"
+KEY_ROUTE = "route"
+TOKEN_BUCKET = "token_bucket"
+SLIDING_WINDOW = "sliding_window"
+
+# Largest request body buffered to find a username (login/signup payloads are tiny)
+MAX_KEY_BODY_BYTES = 16 * 1024
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitRule:
+    """
+    Limit for one route.
+
+    Attributes:
+        method: HTTP method, upper case
+        path: Exact request path
+        limit: Requests allowed per window
+        window: Window length in seconds
+        key: What requests are counted by (ip, user or route)
+        algorithm: token_bucket or sliding_window
+    """
+    method: str
+    path: str
+    limit: int
+    window: float
+    key: str = KEY_IP
+    algorithm: str = TOKEN_BUCKET
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+def parse_rules(spec: str) -> List[RateLimitRule]:
+    """
+    Parse RATE_LIMIT_RULES.
+
+    Comma-separated entries of the form
+    `METHOD /path=LIMIT/SECONDS[:key[:algorithm]]`, e.g.
+    `POST /api/v1/auth/login=10/60:ip:sliding_window`.
+
+    Raises:
+        ValueError: On a malformed entry
+    """
+    rules = []
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            route, policy = entry.split("=", 1)
+            method, path = route.split()
+            rate, *options = policy.split(":")
+            limit, window = rate.split("/")
+            rule = RateLimitRule(method.upper(), path, int(limit), float(window), *options)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid rate limit rule: {entry!r}") from e
+        if rule.key not in (KEY_IP, KEY_USER, KEY_ROUTE) or rule.algorithm not in (TOKEN_BUCKET, SLIDING_WINDOW):
+            raise ValueError(f"Invalid rate limit rule: {entry!r}")
+        if rule.limit < 1 or rule.window <= 0:
+            raise ValueError(f"Invalid rate limit rule: {entry!r}")
+        rules.append(rule)
+    return rules
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for rate limit counters.
+
+    Implementations decide where state lives (process memory, Redis, ...);
+    the algorithms are defined by RateLimitRule.algorithm.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, rule: RateLimitRule, now: float) -> float:
+        """
+        Count one request for `key` under `rule`.
+
+        Returns:
+            0.0 if the request is allowed, otherwise seconds until it would be
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+def _token_bucket(state: List[float], rule: RateLimitRule, now: float) -> float:
+    # state = [tokens, updated_at]
+    rate = rule.limit / rule.window
+    tokens = min(rule.limit, state[0] + (now - state[1]) * rate)
+    state[1] = now
+    if tokens >= 1.0:
+        state[0] = tokens - 1.0
+        return 0.0
+    state[0] = tokens
+    return (1.0 - tokens) / rate
+
+
+def _sliding_window(state: List[float], rule: RateLimitRule, now: float) -> float:
+    # state = [window_start, count, previous_count]
+    window = rule.window
+    elapsed = now - state[0]
+    if elapsed >= window:
+        state[2] = state[1] if elapsed < 2 * window else 0.0
+        state[1] = 0.0
+        state[0] = now - elapsed % window
+        elapsed = now - state[0]
+    weight = 1.0 - elapsed / window
+    if state[2] * weight + state[1] < rule.limit:
+        state[1] += 1.0
+        return 0.0
+    if state[1] >= rule.limit:
+        return window - elapsed
+    # Wait until the previous window's share decays enough
+    return max(window * (1.0 - (rule.limit - state[1]) / state[2]) - elapsed, 0.001)
+
+
+_ALGORITHMS = {TOKEN_BUCKET: _token_bucket, SLIDING_WINDOW: _sliding_window}
+
+
+class MemoryBackend(RateLimitBackend):
+    """
+    In-process counters, sharded by key hash.
+
+    Each shard is a dict guarded by its own lock, so concurrent callers
+    rarely contend. When a shard exceeds `max_keys_per_shard`, idle keys
+    are swept, then the oldest are dropped (a dropped key just starts a
+    fresh bucket).
+    """
+
+    def __init__(self, shards: int = 64, max_keys_per_shard: int = 10000):
+        self._mask = (1 << max(0, shards - 1).bit_length()) - 1
+        self._shards: List[Dict[str, List[float]]] = [{} for _ in range(self._mask + 1)]
+        self._locks = [threading.Lock() for _ in range(self._mask + 1)]
+        self.max_keys_per_shard = max_keys_per_shard
+
+    async def hit(self, key: str, rule: RateLimitRule, now: float) -> float:
+        index = hash(key) & self._mask
+        shard = self._shards[index]
+        with self._locks[index]:
+            state = shard.get(key)
+            if state is None:
+                if len(shard) >= self.max_keys_per_shard:
+                    self._evict(shard, now, rule.window)
+                if rule.algorithm == TOKEN_BUCKET:
+                    state = shard[key] = [float(rule.limit), now]
+                else:
+                    state = shard[key] = [now, 0.0, 0.0]
+            return _ALGORITHMS[rule.algorithm](state, rule, now)
+
+    def _evict(self, shard: Dict[str, List[float]], now: float, window: float) -> None:
+        # state[0] is a timestamp for sliding windows; token buckets keep it in state[1]
+        stale = [
+            key for key, state in shard.items()
+            if now - (state[1] if len(state) == 2 else state[0]) >= 2 * window
+        ]
+        for key in stale:
+            del shard[key]
+        while len(shard) >= self.max_keys_per_shard:
+            del shard[next(iter(shard))]
+
+    def clear(self) -> None:
+        for index, shard in enumerate(self._shards):
+            with self._locks[index]:
+                shard.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"shards": len(self._shards), "keys": sum(len(shard) for shard in self._shards)}
+
+
+class RateLimiter:
+    """
+    Rule table plus backend, shared by the middleware and /admin/stats.
+    """
+
+    def __init__(
+        self,
+        rules: List[RateLimitRule],
+        backend: Optional[RateLimitBackend] = None,
+        trust_forwarded: bool = False,
+        trusted_proxies: int = 1,
+    ):
+        self.rules: Dict[tuple, RateLimitRule] = {(rule.method, rule.path): rule for rule in rules}
+        self.backend = backend or MemoryBackend()
+        self.trust_forwarded = trust_forwarded
+        self.trusted_proxies = max(1, trusted_proxies)
+        self.allowed = 0
+        self.limited = 0
+
+    def client_ip(self, scope: Dict[str, Any]) -> str:
+        """
+        The client address used for per-IP keys.
+
+        With `trust_forwarded`, X-Forwarded-For is read from the right:
+        each proxy appends the address it received the request from, so
+        the entry `trusted_proxies` hops from the right was written by
+        our outermost proxy. Entries to its left come from the client
+        and are ignored.
+        """
+        if self.trust_forwarded:
+            hops = [
+                hop.strip()
+                for name, value in scope["headers"]
+                if name == b"x-forwarded-for"
+                for hop in value.split(b",")
+            ]
+            hops = [hop for hop in hops if hop]
+            if hops:
+                return hops[-min(self.trusted_proxies, len(hops))].decode("latin-1")
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rules": [rule.name for rule in self.rules.values()],
+            "allowed": self.allowed,
+            "limited": self.limited,
+            **self.backend.stats(),
+        }
+
+
+async def _buffer_body(receive):
+    """
+    Read the whole request body and return (body, replaying receive).
+
+    Returns body None if it exceeds MAX_KEY_BODY_BYTES; the chunks read so
+    far are still replayed to the application.
+    """
+    messages = []
+    size = 0
+    more = True
+    while more:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            break
+        size += len(message.get("body", b""))
+        more = message.get("more_body", False)
+        if size > MAX_KEY_BODY_BYTES:
+            break
+
+    body = b"".join(m.get("body", b"") for m in messages) if not more and size <= MAX_KEY_BODY_BYTES else None
+    pending = iter(messages)
+
+    async def replay():
+        return next(pending, None) or await receive()
+
+    return body, replay
+
+
+def _username_from_body(body: Optional[bytes]) -> Optional[str]:
+    if not body:
+        return None
+    try:
+        username = json.loads(body).get("username")
+    except (ValueError, AttributeError):
+        return None
+    return username.lower() if isinstance(username, str) else None
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware applying a RateLimiter's rules.
+    Rejected requests get 429 with a Retry-After header.
+    """
+
+    def __init__(self, app, limiter: "RateLimiter"):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        rule = self.limiter.rules.get((scope["method"], scope["path"]))
+        if rule is None:
+            return await self.app(scope, receive, send)
+
+        limiter = self.limiter
+        if rule.key == KEY_IP:
+            ident = limiter.client_ip(scope)
+        elif rule.key == KEY_USER:
+            body, receive = await _buffer_body(receive)
+            ident = _username_from_body(body) or limiter.client_ip(scope)
+        else:
+            ident = ""
+
+        retry_after = await limiter.backend.hit(f"{rule.name}|{ident}", rule, time.monotonic())
+        if not retry_after:
+            limiter.allowed += 1
+            return await self.app(scope, receive, send)
+
+        limiter.limited += 1
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", str(math.ceil(retry_after)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b'{"detail":"Too many requests"}'})
+
+
+# Global limiter, installed by app/main.py when RATE_LIMIT_ENABLED
+rate_limiter = RateLimiter(
+    parse_rules(settings.RATE_LIMIT_RULES),
+    MemoryBackend(shards=settings.RATE_LIMIT_SHARDS),
+    trust_forwarded=settings.RATE_LIMIT_TRUST_FORWARDED,
+    trusted_proxies=settings.RATE_LIMIT_TRUSTED_PROXIES,
+)
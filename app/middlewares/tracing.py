@@ -0,0 +1,50 @@
+"""
+Request Tracing Middleware.
+
+Pure ASGI middleware opening the root span of each sampled request (see
+app/core/tracing.py). The root span is named after the matched route
+template, and with TRACING_SERVER_TIMING the response carries a
+`Server-Timing` header summarising the spans finished so far.
+"""
+
+import time
+
+from app.core.tracing import Tracer
+
+
+class TracingMiddleware:
+    def __init__(self, app, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        root = self.tracer.start_trace(f"{scope['method']} {scope['path']}")
+        if root is None:
+            return await self.app(scope, receive, send)
+
+        span = root.span
+        server_timing = self.tracer.server_timing
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.status_code", message["status"])
+                if server_timing:
+                    total_ms = (time.time_ns() - span.start_ns) / 1e6
+                    value = span.trace.server_timing()
+                    value = f"{value}, total;dur={total_ms:.2f}" if value else f"total;dur={total_ms:.2f}"
+                    message = {
+                        **message,
+                        "headers": [*message.get("headers", []), (b"server-timing", value.encode("latin-1"))],
+                    }
+            await send(message)
+
+        try:
+            with root:
+                await self.app(scope, receive, send_wrapper)
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{scope['method']} {route.path}"
+        finally:
+            self.tracer.export(span.trace)
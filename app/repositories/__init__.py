@@ -2,12 +2,15 @@
 Repositories package.
 """
 
-from app.repositories.user_repo import UserRepository
-from app.repositories.role_repo import RoleRepository
-from app.repositories.token_repo import TokenRepository
+from app.repositories.user_repo import UserRepository, AsyncUserRepository
+from app.repositories.role_repo import RoleRepository, AsyncRoleRepository
+from app.repositories.token_repo import TokenRepository, AsyncTokenRepository
 
 __all__ = [
     "UserRepository",
     "RoleRepository",
     "TokenRepository",
+    "AsyncUserRepository",
+    "AsyncRoleRepository",
+    "AsyncTokenRepository",
 ]
@@ -2,8 +2,13 @@
 Role Repository.
 """
 
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, insert, select, update
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.permissions import PERMISSIONS
+from app.core.tracing import trace_methods
+from app.db.models.permission import Permission, role_permissions
 from app.db.models.role import Role
 
 class RoleRepository:
@@ -17,3 +22,66 @@ class RoleRepository:
     def get_by_id(self, role_id: int) -> Optional[Role]:
         """Get a role by ID."""
         return self.db.query(Role).filter(Role.id == role_id).first()
+
+    def sync_permission_catalog(self) -> Dict[str, Permission]:
+        """Insert catalog permissions missing from the table; return all rows by name."""
+        existing = {p.name: p for p in self.db.query(Permission).all()}
+        for name, (bit, description) in PERMISSIONS.items():
+            if name not in existing:
+                existing[name] = Permission(name=name, bit=bit, description=description)
+                self.db.add(existing[name])
+        self.db.commit()
+        return existing
+
+    def set_permissions(self, role: Role, permissions: List[Permission]) -> Role:
+        """Replace a role's grants (distinct permissions) and recompute its permission_mask."""
+        role.permissions = permissions
+        role.permission_mask = sum(1 << p.bit for p in permissions)
+        self.db.commit()
+        return role
+
+
+@trace_methods
+class AsyncRoleRepository:
+    """
+    Async counterpart of RoleRepository, used by the request path.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_name(self, name: str) -> Optional[Role]:
+        """Get a role by its unique name."""
+        result = await self.db.scalars(select(Role).where(Role.name == name))
+        return result.first()
+
+    async def get_by_id(self, role_id: int) -> Optional[Role]:
+        """Get a role by ID."""
+        return await self.db.get(Role, role_id)
+
+    async def get_all(self) -> List[Role]:
+        """Get all roles."""
+        result = await self.db.scalars(select(Role))
+        return list(result.all())
+
+    async def get_permissions_by_names(self, names: Iterable[str]) -> List[Permission]:
+        """Get the permission rows for a set of names (unknown names are skipped)."""
+        result = await self.db.scalars(select(Permission).where(Permission.name.in_(list(names))))
+        return list(result.all())
+
+    async def set_permissions(self, role: Role, permissions: List[Permission]) -> Role:
+        """
+        Replace a role's grants (distinct permissions) and its precomputed
+        permission_mask in one transaction.
+        """
+        mask = sum(1 << p.bit for p in permissions)
+        await self.db.execute(delete(role_permissions).where(role_permissions.c.role_id == role.id))
+        if permissions:
+            await self.db.execute(
+                insert(role_permissions),
+                [{"role_id": role.id, "permission_id": p.id} for p in permissions],
+            )
+        await self.db.execute(update(Role).where(Role.id == role.id).values(permission_mask=mask))
+        await self.db.commit()
+        await self.db.refresh(role)
+        return role
@@ -1,23 +1,81 @@
 """
 Token Repository.
+
+Refresh tokens are stored as (jti, SHA-256 digest) pairs: callers look a
+token up by its `jti` selector and verify the digest themselves.
+Revoked access tokens are stored by `jti` until they expire.
 """
 
-from datetime import datetime
-from typing import Optional, List
+from datetime import datetime, timedelta
+from typing import Optional, List, Sequence, Tuple
 from uuid import UUID
+from sqlalchemy import Row, bindparam, delete, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tracing import trace_methods
+from app.db.models.refresh_token import SESSION_COLUMNS, RefreshToken
+from app.db.models.revoked_access_token import RevokedAccessToken
+from app.db.models.user import User
+
+# Copied from a refresh token to its successor on rotation
+_SESSION_CARRY_OVER = (
+    RefreshToken.session_id,
+    RefreshToken.session_started_at,
+    RefreshToken.user_agent,
+    RefreshToken.device,
+    RefreshToken.token_version,
+)
+
+# Tolerance around a token's `exp` claim when matching `expires_at`
+_EXPIRY_WINDOW = timedelta(seconds=1)
+
+
+def _expiry_window(expires_at: datetime):
+    """
+    Predicate on the partition key derived from the token's `exp` claim.
+
+    Redundant for correctness (jti is unique) but lets a partitioned
+    table prune the lookup to the one or two partitions around `exp`.
+    """
+    return RefreshToken.expires_at.between(expires_at - _EXPIRY_WINDOW, expires_at + _EXPIRY_WINDOW)
+
 
-from app.db.models.refresh_token import RefreshToken
+# get_for_rotation, built once (rows, same SQL every call)
+_tokens = RefreshToken.__table__
+_users = User.__table__
+_ROTATION_BY_JTI = (
+    select(
+        _tokens.c.id,
+        _tokens.c.user_id,
+        _tokens.c.token_digest,
+        _tokens.c.expires_at,
+        _tokens.c.is_revoked,
+        _tokens.c.session_id,
+        _users.c.is_active,
+        _users.c.role_id,
+        _users.c.token_version,
+    )
+    .select_from(_tokens.join(_users, _users.c.id == _tokens.c.user_id))
+    .where(_tokens.c.jti == bindparam("jti"))
+)
+_ROTATION_BY_JTI_IN_WINDOW = _ROTATION_BY_JTI.where(
+    _tokens.c.expires_at.between(bindparam("expires_from"), bindparam("expires_to"))
+)
 
 class TokenRepository:
     def __init__(self, db: Session):
         self.db = db
 
-    def create(self, user_id: UUID, token_hash: str, expires_at: datetime) -> RefreshToken:
+    def create(
+        self, user_id: UUID, jti: str, token_digest: bytes, expires_at: datetime
+    ) -> RefreshToken:
         """Create and store a new refresh token."""
         db_token = RefreshToken(
             user_id=user_id,
-            token_hash=token_hash,
+            jti=jti,
+            token_digest=token_digest,
             expires_at=expires_at,
             is_revoked=False
         )
@@ -26,22 +84,333 @@ class TokenRepository:
         self.db.refresh(db_token)
         return db_token
 
-    def get_by_hash(self, token_hash: str) -> Optional[RefreshToken]:
-        """Get a refresh token by its hash."""
-        return self.db.query(RefreshToken).filter(
-            RefreshToken.token_hash == token_hash
-        ).first()
+    def get_by_jti(self, jti: str, expires_at: Optional[datetime] = None) -> Optional[RefreshToken]:
+        """Get a refresh token by its jti (unique index point lookup)."""
+        query = self.db.query(RefreshToken).filter(RefreshToken.jti == jti)
+        if expires_at is not None:
+            query = query.filter(_expiry_window(expires_at))
+        return query.first()
     
     def revoke(self, token_obj: RefreshToken) -> None:
         """Revoke a specific token."""
         token_obj.is_revoked = True
+        token_obj.revoked_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(token_obj)
+
+
+@trace_methods
+class AsyncTokenRepository:
+    """
+    Async counterpart of TokenRepository, used by the request path.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(
+        self,
+        user_id: UUID,
+        jti: str,
+        token_digest: bytes,
+        expires_at: datetime,
+        session_id: Optional[str] = None,
+        token_version: int = 0,
+        user_agent: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> RefreshToken:
+        """Create and store a new refresh token (the first of a login session)."""
+        db_token = RefreshToken(
+            user_id=user_id,
+            jti=jti,
+            token_digest=token_digest,
+            expires_at=expires_at,
+            is_revoked=False,
+            session_id=session_id,
+            session_started_at=datetime.utcnow() if session_id else None,
+            token_version=token_version,
+            user_agent=user_agent,
+            device=device,
+        )
+        self.db.add(db_token)
+        await self.db.commit()
+        await self.db.refresh(db_token)
+        return db_token
+
+    async def get_by_jti(self, jti: str, expires_at: Optional[datetime] = None) -> Optional[RefreshToken]:
+        """Get a refresh token by its jti (unique index point lookup)."""
+        stmt = select(RefreshToken).where(RefreshToken.jti == jti)
+        if expires_at is not None:
+            stmt = stmt.where(_expiry_window(expires_at))
+        result = await self.db.scalars(stmt)
+        return result.first()
+
+    async def get_for_rotation(self, jti: str, expires_at: Optional[datetime] = None) -> Optional[Row]:
+        """
+        Fetch what a rotation needs in one query: token and owner.
         
-    def revoke_all_for_user(self, user_id: UUID) -> None:
-        """Revoke ALL tokens for a user (Global Logout)."""
-        self.db.query(RefreshToken).filter(
-            RefreshToken.user_id == user_id,
-            RefreshToken.is_revoked == False
-        ).update({"is_revoked": True})
-        self.db.commit()
+        Returns a plain row (no ORM entities or eager loads) with:
+        id, user_id, token_digest, expires_at, is_revoked, session_id,
+        is_active, role_id (resolved through the role catalog) and the
+        owner's current token_version.
+        Opens the transaction that `rotate` commits.
+        Pass the token's `exp` as `expires_at` to enable partition pruning.
+        Uses prebuilt statements (see user_repo's auth hot-path statements).
+        """
+        if expires_at is None:
+            return (await self.db.execute(_ROTATION_BY_JTI, {"jti": jti})).first()
+        return (await self.db.execute(
+            _ROTATION_BY_JTI_IN_WINDOW,
+            {"jti": jti, "expires_from": expires_at - _EXPIRY_WINDOW, "expires_to": expires_at + _EXPIRY_WINDOW},
+        )).first()
+
+    async def rotate(
+        self,
+        token_id: int,
+        user_id: UUID,
+        jti: str,
+        token_digest: bytes,
+        expires_at: datetime,
+        token_expires_at: Optional[datetime] = None,
+    ) -> bool:
+        """
+        Revoke a token and insert its successor in one transaction.
+        
+        The revoke is conditional (`WHERE NOT is_revoked ... RETURNING`),
+        so when the same token is rotated concurrently exactly one caller
+        sees a row come back; the others get False. Only the row lock on
+        the old token is taken, never a table lock.
+        
+        On PostgreSQL both steps are a single statement (a data-modifying
+        CTE feeding the INSERT); other dialects use two statements.
+        The successor inherits the session columns of the revoked token.
+        
+        `token_expires_at` is the old row's stored expiry (from
+        get_for_rotation); it pins the UPDATE to a single partition.
+        
+        Returns:
+            True if this caller won the rotation, False otherwise
+        """
+        now = datetime.utcnow()
+        revoke_stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.id == token_id, RefreshToken.is_revoked == False)
+            .values(is_revoked=True, revoked_at=now)
+            .returning(RefreshToken.user_id, *_SESSION_CARRY_OVER)
+        )
+        if token_expires_at is not None:
+            revoke_stmt = revoke_stmt.where(RefreshToken.expires_at == token_expires_at)
+
+        if self.db.bind.dialect.name == "postgresql":
+            revoked = revoke_stmt.cte("revoked")
+            stmt = insert(RefreshToken).from_select(
+                ["user_id", "jti", "token_digest", "expires_at", "is_revoked", "created_at"]
+                + [column.key for column in _SESSION_CARRY_OVER],
+                select(
+                    revoked.c.user_id,
+                    literal(jti, RefreshToken.jti.type),
+                    literal(token_digest, RefreshToken.token_digest.type),
+                    literal(expires_at, RefreshToken.expires_at.type),
+                    literal(False, RefreshToken.is_revoked.type),
+                    literal(now, RefreshToken.created_at.type),
+                    *(revoked.c[column.key] for column in _SESSION_CARRY_OVER),
+                ),
+            ).returning(RefreshToken.id)
+            won = (await self.db.execute(stmt)).first() is not None
+        else:
+            old = (await self.db.execute(revoke_stmt)).first()
+            won = old is not None
+            if won:
+                await self.db.execute(
+                    insert(RefreshToken).values(
+                        user_id=user_id,
+                        jti=jti,
+                        token_digest=token_digest,
+                        expires_at=expires_at,
+                        is_revoked=False,
+                        created_at=now,
+                        **{column.key: getattr(old, column.key) for column in _SESSION_CARRY_OVER},
+                    )
+                )
+
+        if won:
+            await self.db.commit()
+        else:
+            await self.db.rollback()
+        return won
+
+    async def revoke(self, token_obj: RefreshToken) -> None:
+        """Revoke a specific token."""
+        token_obj.is_revoked = True
+        token_obj.revoked_at = datetime.utcnow()
+        await self.db.commit()
+        await self.db.refresh(token_obj)
+
+    async def delete_expired_batch(self, cutoff: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` tokens that expired before `cutoff`.
+        
+        Walks the expires_at index oldest-first and skips rows locked by
+        in-flight rotations, so a batch never waits on the hot path.
+        Commits, keeping each batch its own short transaction.
+        
+        Returns:
+            Number of rows deleted
+        """
+        batch = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < cutoff)
+            .order_by(RefreshToken.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def delete_revoked_batch(self, cutoff: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` tokens revoked before `cutoff`.
+        
+        Uses the partial revoked_at index. Commits per batch.
+        
+        Returns:
+            Number of rows deleted
+        """
+        batch = (
+            select(RefreshToken.id)
+            .where(RefreshToken.is_revoked == True, RefreshToken.revoked_at < cutoff)
+            .order_by(RefreshToken.revoked_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def get_oldest_expired(self, cutoff: datetime) -> Optional[datetime]:
+        """Expiry of the oldest token still waiting to be purged (index min scan)."""
+        return await self.db.scalar(
+            select(func.min(RefreshToken.expires_at)).where(RefreshToken.expires_at < cutoff)
+        )
+
+    async def list_sessions(self, user_id: UUID, now: datetime, token_version: int) -> Sequence[Row]:
+        """
+        A user's live sessions (one unrevoked, unexpired token of the
+        current `token_version` each), most recently refreshed first.
+        
+        Reads only columns covered by ix_refresh_tokens_user_sessions, so
+        on PostgreSQL this is an index-only scan of the user's live rows.
+        
+        Returns:
+            Rows of SESSION_COLUMNS
+        """
+        result = await self.db.execute(
+            select(*(getattr(RefreshToken, column) for column in SESSION_COLUMNS))
+            .where(
+                RefreshToken.user_id == user_id,
+                ~RefreshToken.is_revoked,
+                RefreshToken.expires_at > now,
+                RefreshToken.token_version == token_version,
+            )
+            .order_by(RefreshToken.created_at.desc())
+        )
+        return result.all()
+
+    async def revoke_sessions(
+        self,
+        user_id: UUID,
+        token_version: int,
+        session_id: Optional[str] = None,
+        except_session_id: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Revoke a user's live tokens of the current `token_version` in one
+        UPDATE: all of them, only `session_id`, or all but
+        `except_session_id`. Commits.
+        
+        Returns:
+            Session ids of the revoked tokens
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.user_id == user_id,
+                ~RefreshToken.is_revoked,
+                RefreshToken.token_version == token_version,
+            )
+            .values(is_revoked=True, revoked_at=datetime.utcnow())
+            .returning(RefreshToken.session_id)
+            .execution_options(synchronize_session=False)
+        )
+        if session_id is not None:
+            stmt = stmt.where(RefreshToken.session_id == session_id)
+        if except_session_id is not None:
+            stmt = stmt.where(or_(RefreshToken.session_id.is_(None), RefreshToken.session_id != except_session_id))
+        revoked = list((await self.db.execute(stmt)).scalars().all())
+        await self.db.commit()
+        return revoked
+
+    async def deny_access_token(self, jti: str, expires_at: datetime) -> None:
+        """Record a revoked access token until its expiry (idempotent) and commit."""
+        dialect = self.db.bind.dialect.name
+        values = {"jti": jti, "expires_at": expires_at, "revoked_at": datetime.utcnow()}
+        if dialect == "postgresql":
+            stmt = postgresql.insert(RevokedAccessToken).values(values).on_conflict_do_nothing()
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(RevokedAccessToken).values(values).on_conflict_do_nothing()
+        else:
+            stmt = insert(RevokedAccessToken).values(values)
+        await self.db.execute(stmt)
+        await self.db.commit()
+
+    async def get_denied_access_tokens(
+        self, after: Tuple[datetime, str], now: datetime, limit: int
+    ) -> Sequence[Row]:
+        """
+        Unexpired revoked access tokens, in (revoked_at, jti) order,
+        starting right after `after` (keyset; walks ix_..._revoked_at).
+        
+        Returns:
+            Up to `limit` (jti, expires_at, revoked_at) rows
+        """
+        result = await self.db.execute(
+            select(RevokedAccessToken.jti, RevokedAccessToken.expires_at, RevokedAccessToken.revoked_at)
+            .where(
+                tuple_(RevokedAccessToken.revoked_at, RevokedAccessToken.jti) > tuple_(*after),
+                RevokedAccessToken.expires_at > now,
+            )
+            .order_by(RevokedAccessToken.revoked_at, RevokedAccessToken.jti)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def delete_expired_denials_batch(self, cutoff: datetime, limit: int) -> int:
+        """
+        Delete up to `limit` revoked access tokens that expired before
+        `cutoff`. Commits per batch.
+        
+        Returns:
+            Number of rows deleted
+        """
+        batch = (
+            select(RevokedAccessToken.jti)
+            .where(RevokedAccessToken.expires_at < cutoff)
+            .order_by(RevokedAccessToken.expires_at)
+            .limit(limit)
+        )
+        result = await self.db.execute(
+            delete(RevokedAccessToken)
+            .where(RevokedAccessToken.jti.in_(batch.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
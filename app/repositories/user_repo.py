@@ -2,11 +2,17 @@
 User Repository.
 """
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, bindparam, insert, or_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 
+from app.core.tracing import trace_methods
+from app.db.models.role import Role
 from app.db.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
@@ -71,3 +77,261 @@ class UserRepository:
         self.db.commit()
         self.db.refresh(user)
         return user
+
+
+# Auth hot-path statements (login, get_current_user, introspection, token
+# version checks), built once at import. They read table columns, so
+# results are plain rows: no entity construction, identity map or eager
+# load handling. Being the same objects on every call, they also skip
+# statement construction and cache-key generation, and always render the
+# same SQL, which lets psycopg keep them prepared server-side
+# (DB_PREPARE_THRESHOLD).
+_users = User.__table__
+_AUTH_USER_COLUMNS = (
+    _users.c.id,
+    _users.c.username,
+    _users.c.email,
+    _users.c.is_active,
+    _users.c.created_at,
+    _users.c.role_id,
+    _users.c.token_version,
+)
+_AUTH_USER_BY_ID = select(*_AUTH_USER_COLUMNS).where(_users.c.id == bindparam("user_id"))
+_AUTH_USERS_BY_IDS = select(*_AUTH_USER_COLUMNS).where(_users.c.id.in_(bindparam("user_ids", expanding=True)))
+_LOGIN_USER_BY_USERNAME = (
+    select(*_AUTH_USER_COLUMNS, _users.c.password_hash).where(_users.c.username == bindparam("username"))
+)
+_TOKEN_VERSIONS_BY_IDS = (
+    select(_users.c.id, _users.c.token_version).where(_users.c.id.in_(bindparam("user_ids", expanding=True)))
+)
+
+
+@trace_methods
+class AsyncUserRepository:
+    """
+    Async counterpart of UserRepository, used by the request path.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """Get user by username."""
+        result = await self.db.scalars(select(User).where(User.username == username))
+        return result.first()
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        result = await self.db.scalars(select(User).where(User.email == email))
+        return result.first()
+
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        """Get user by UUID."""
+        result = await self.db.scalars(select(User).where(User.id == user_id))
+        return result.first()
+
+    async def get_auth_row(self, user_id: UUID) -> Optional[Row]:
+        """
+        What authenticating a request needs about a user, as a plain row:
+        id, username, email, is_active, created_at, role_id (resolve via
+        the role catalog) and token_version. Accepted by Principal.from_user.
+        """
+        return (await self.db.execute(_AUTH_USER_BY_ID, {"user_id": user_id})).first()
+
+    async def get_auth_rows(self, user_ids: Iterable[UUID]) -> Sequence[Row]:
+        """get_auth_row for many ids in one IN query."""
+        return (await self.db.execute(_AUTH_USERS_BY_IDS, {"user_ids": list(user_ids)})).all()
+
+    async def get_login_row(self, username: str) -> Optional[Row]:
+        """get_auth_row columns plus password_hash, by username (login)."""
+        return (await self.db.execute(_LOGIN_USER_BY_USERNAME, {"username": username})).first()
+
+    async def get_token_versions(self, user_ids: Iterable[UUID]) -> Dict[UUID, int]:
+        """Current token_version of many users in one IN query (no entities)."""
+        result = await self.db.execute(_TOKEN_VERSIONS_BY_IDS, {"user_ids": list(user_ids)})
+        return {row.id: row.token_version for row in result}
+
+    async def bump_token_version(self, user_id: UUID) -> Optional[int]:
+        """
+        Invalidate every token of a user: one single-row
+        UPDATE ... RETURNING, then commit.
+        
+        Returns:
+            The new version, or None if the user does not exist
+        """
+        version = await self.db.scalar(
+            update(User)
+            .where(User.id == user_id)
+            .values(token_version=User.token_version + 1)
+            .returning(User.token_version)
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return version
+
+    async def bump_role_token_versions(self, role_id: int) -> int:
+        """
+        Invalidate every token of every user holding a role, in one UPDATE.
+        Not committed: it joins the caller's transaction.
+
+        Returns:
+            Number of users affected
+        """
+        result = await self.db.execute(
+            update(User)
+            .where(User.role_id == role_id)
+            .values(token_version=User.token_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def create(self, user_in: UserCreate, password_hash: str, role_id: int) -> Row:
+        """
+        Create a new user and commit.
+        NOTE: Repository expects already hashed password.
+        
+        One INSERT ... RETURNING; no ORM object and no refresh round trip.
+        
+        Returns:
+            Row with the stored id, is_active and created_at
+        
+        Raises:
+            IntegrityError: If the username or email is taken (rolled back)
+        """
+        stmt = (
+            insert(User)
+            .values(
+                username=user_in.username,
+                email=user_in.email,
+                password_hash=password_hash,
+                role_id=role_id,
+                is_active=True,
+            )
+            .returning(User.id, User.is_active, User.created_at)
+        )
+        try:
+            row = (await self.db.execute(stmt)).one()
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+        return row
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[User]:
+        """Get all users with pagination."""
+        result = await self.db.scalars(select(User).offset(skip).limit(limit))
+        return list(result.all())
+
+    async def get_page(
+        self,
+        limit: int,
+        after: Optional[Tuple[datetime, UUID]] = None,
+        offset: int = 0,
+        role_id: Optional[int] = None,
+        is_active: Optional[bool] = None,
+    ) -> list[User]:
+        """
+        Get users ordered by (created_at, id), optionally filtered.
+        
+        With `after` (keyset mode) the scan starts right after that sort key
+        on ix_users_created_at_id, so cost doesn't grow with page depth.
+        `offset` is only meant for small offsets.
+        """
+        stmt = select(User).order_by(User.created_at, User.id)
+        if after is not None:
+            stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(*after))
+        if role_id is not None:
+            stmt = stmt.where(User.role_id == role_id)
+        if is_active is not None:
+            stmt = stmt.where(User.is_active == is_active)
+        result = await self.db.scalars(stmt.offset(offset).limit(limit))
+        return list(result.all())
+
+    async def find_existing(
+        self, usernames: Iterable[str], emails: Iterable[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """
+        Which of the given usernames and emails are already taken.
+        One set-based query for a whole import batch.
+        
+        Returns:
+            (taken usernames, taken emails)
+        """
+        usernames, emails = list(usernames), list(emails)
+        if not usernames and not emails:
+            return set(), set()
+        result = await self.db.execute(
+            select(User.username, User.email).where(
+                or_(User.username.in_(usernames), User.email.in_(emails))
+            )
+        )
+        taken_usernames, taken_emails = set(), set()
+        for username, email in result:
+            taken_usernames.add(username)
+            taken_emails.add(email)
+        return taken_usernames, taken_emails
+
+    async def bulk_insert(self, rows: List[Dict[str, Any]]) -> Set[str]:
+        """
+        Insert users with one multi-row INSERT and commit.
+        
+        Rows conflicting with a user created since they were checked (a
+        concurrent signup) are skipped by ON CONFLICT DO NOTHING rather
+        than failing the batch.
+        
+        Returns:
+            Usernames of the rows actually inserted
+        """
+        if not rows:
+            return set()
+        dialect = self.db.bind.dialect.name
+        if dialect == "postgresql":
+            stmt = postgresql.insert(User).on_conflict_do_nothing()
+        elif dialect == "sqlite":
+            stmt = sqlite.insert(User).on_conflict_do_nothing()
+        else:
+            stmt = insert(User)
+        result = await self.db.execute(stmt.values(rows).returning(User.username))
+        inserted = set(result.scalars().all())
+        await self.db.commit()
+        return inserted
+
+    async def stream_export_rows(self, batch_size: int = 1000) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream every user as plain (id, username, email, role, is_active,
+        created_at) rows, `batch_size` rows at a time.
+        
+        Uses a server-side cursor (yield_per implies stream_results), so
+        memory stays flat however many users there are.
+        """
+        stmt = (
+            select(User.id, User.username, User.email, Role.name, User.is_active, User.created_at)
+            .join(Role, User.role_id == Role.id)
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.db.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+    async def update(self, user: User, user_in: UserUpdate) -> User:
+        """
+        Update user fields.
+        Password hashing is the service layer's job (see UserRepository.update).
+        """
+        update_data = user_in.model_dump(exclude_unset=True)
+
+        for field, value in update_data.items():
+            setattr(user, field, value)
+
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
+
+    async def save(self, user: User) -> User:
+        """Persist changes already applied to a user object."""
+        self.db.add(user)
+        await self.db.commit()
+        await self.db.refresh(user)
+        return user
@@ -2,6 +2,8 @@
 Auth Schemas.
 """
 
+from typing import Optional
+
 from pydantic import BaseModel, EmailStr, Field
 
 class LoginRequest(BaseModel):
@@ -16,4 +18,11 @@ class LoginRequest(BaseModel):
     password: str
 
 class RefreshTokenRequest(BaseModel):
-    refresh_token: str
\ No newline at end of file
+    refresh_token: str
+
+class LogoutRequest(BaseModel):
+    """
+    Optional logout body: the session's refresh token, revoked along
+    with the access token.
+    """
+    refresh_token: Optional[str] = None
@@ -3,6 +3,7 @@ Role Schemas.
 """
 
 from datetime import datetime
+from typing import List
 from pydantic import BaseModel, ConfigDict
 
 class RoleBase(BaseModel):
@@ -17,3 +18,16 @@ class RoleResponse(RoleBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+class RolePermissionsUpdate(BaseModel):
+    """
+    Schema for replacing a role's permissions (Admin).
+    """
+    permissions: List[str]
+
+class RolePermissionsResponse(RoleResponse):
+    """
+    Schema for a role with its granted permissions.
+    """
+    permission_mask: int
+    permissions: List[str]
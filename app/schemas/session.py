@@ -0,0 +1,27 @@
+"""
+Session Schemas.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+class SessionResponse(BaseModel):
+    """
+    Schema for one login session (a live refresh token chain).
+    `last_used_at` is when it was last refreshed (or started).
+    """
+    session_id: str
+    device: Optional[str] = None
+    user_agent: Optional[str] = None
+    started_at: datetime
+    last_used_at: datetime
+    expires_at: datetime
+    current: bool = False
+
+class SessionRevokeResult(BaseModel):
+    """
+    Schema for the result of revoking several sessions.
+    """
+    revoked: int
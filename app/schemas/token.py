@@ -2,8 +2,11 @@
 Token Schemas.
 """
 
-from typing import Optional
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+from app.core.constants import MAX_INTROSPECTION_BATCH
 
 class Token(BaseModel):
     """
@@ -21,4 +24,41 @@ class TokenPayload(BaseModel):
     sub: Optional[str] = None
     type: Optional[str] = None
     role: Optional[str] = None
-    exp: Optional[int] = None
\ No newline at end of file
+    perm: int = 0
+    jti: Optional[str] = None
+    sid: Optional[str] = None
+    ver: int = 0
+    exp: Optional[int] = None
+
+class TokenIntrospectionRequest(BaseModel):
+    """
+    Schema for a batch introspection request (API gateways).
+    """
+    tokens: List[str] = Field(..., min_length=1, max_length=MAX_INTROSPECTION_BATCH)
+
+class IntrospectedUser(BaseModel):
+    """
+    Owner of an active token. Output only: plain `str` fields, so large
+    batches don't pay for re-validating stored emails.
+    """
+    id: UUID
+    username: str
+    email: str
+    is_active: bool
+    role: str
+
+class TokenIntrospection(BaseModel):
+    """
+    Introspection result for one access token.
+    Inactive tokens (invalid, expired, wrong type, unknown or inactive
+    user) carry no claims or user.
+    """
+    active: bool
+    claims: Optional[Dict[str, Any]] = None
+    user: Optional[IntrospectedUser] = None
+
+class TokenIntrospectionResponse(BaseModel):
+    """
+    Results in the same order as the request's tokens.
+    """
+    results: List[TokenIntrospection]
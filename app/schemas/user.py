@@ -4,8 +4,8 @@ User Schemas.
 
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel, EmailStr, ConfigDict, Field
-from typing import Optional
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, model_validator
+from typing import List, Optional
 
 from app.schemas.role import RoleResponse
 
@@ -29,6 +29,45 @@ class UserUpdate(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
 
+class UserRoleUpdate(BaseModel):
+    """
+    Schema for assigning a role to a user (Admin).
+    """
+    role: str = Field(..., min_length=1, max_length=50)
+
+class UserImportRecord(UserBase):
+    """
+    Schema for one row of a bulk user import (Admin).
+    Exactly one of `password` (hashed during import) or `password_hash`
+    (an existing bcrypt hash, stored as-is) must be given.
+    """
+    password: Optional[str] = Field(None, min_length=8)
+    password_hash: Optional[str] = Field(None, pattern=r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$")
+    role: Optional[str] = Field(None, min_length=1, max_length=50)
+
+    @model_validator(mode="after")
+    def check_password(self) -> "UserImportRecord":
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("Provide exactly one of password or password_hash")
+        return self
+
+class UserImportRowError(BaseModel):
+    """
+    A rejected import row. `line` is the 1-based line in the upload.
+    """
+    line: int
+    username: Optional[str] = None
+    error: str
+
+class UserImportReport(BaseModel):
+    """
+    Schema for the result of a bulk user import.
+    """
+    received: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[UserImportRowError] = []
+
 class UserResponse(UserBase):
     """
     Schema for User response.
@@ -40,3 +79,12 @@ class UserResponse(UserBase):
     role: RoleResponse
 
     model_config = ConfigDict(from_attributes=True)
+
+class UserPage(BaseModel):
+    """
+    Schema for a page of users (Admin listing).
+    Pass `next_cursor` back as `cursor` to get the next page;
+    it is null on the last page.
+    """
+    items: List[UserResponse]
+    next_cursor: Optional[str] = None
@@ -1,50 +1,94 @@
-from sqlalchemy.orm import Session
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.repositories.user_repo import UserRepository
-from app.core.security import verify_password
-from app.core.tokens import create_access_token, create_refresh_token
-from app.schemas.token import Token
-from datetime import datetime, timedelta
+from app.repositories.user_repo import AsyncUserRepository
+from app.core.constants import TOKEN_TYPE_ACCESS, TOKEN_TYPE_REFRESH
+from app.core.denylist import access_denylist
+from app.core.hashing import verify_password_async
+from app.core.login_throttle import login_throttle
+from app.core.metrics import (
+    ROTATION_INVALID,
+    ROTATION_LOST_RACE,
+    ROTATION_REVOKED,
+    ROTATION_ROTATED,
+)
+from app.core.tokens import (
+    create_access_token,
+    create_refresh_token,
+    generate_token_id,
+    refresh_token_expires_at,
+)
+from app.core.principal import Principal, access_claims_cache, principal_cache
+from app.core.role_catalog import role_catalog
+from app.core.token_versions import token_versions
+from app.schemas.token import IntrospectedUser, Token, TokenIntrospection, TokenPayload
+from app.services.denylist_service import denylist_sync_service
+from app.services.session_service import SessionService
+from datetime import datetime
 from jose import JWTError
-from app.repositories.token_repo import TokenRepository
-from app.core.security import decode_token, get_password_hash # (Keep existing imports too)
-from app.core.config import settings
+from app.repositories.token_repo import AsyncTokenRepository
+from app.core.security import decode_token, hash_token, verify_token_digest
+from app.core.tracing import trace_methods
+from app.utils.user_agent import describe_user_agent, truncate_user_agent
 
+@trace_methods
 class AuthService:
-    def __init__(self, db: Session):
-        self.user_repo = UserRepository(db)
-        self.token_repo = TokenRepository(db)
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.user_repo = AsyncUserRepository(db)
+        self.token_repo = AsyncTokenRepository(db)
 
-    def login(self, username: str, password: str) -> Token:
+    async def login(
+        self,
+        username: str,
+        password: str,
+        client_ip: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> Token:
         """
-        Authenticate a user and return tokens.
+        Authenticate a user and return tokens for a new session.
         """
-        # 1. Find the user
-        user = self.user_repo.get_by_username(username)
+        # 0. Refuse locked-out usernames/IPs before spending a query or a hash
+        retry_after = login_throttle.check(username, client_ip)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+        # 1. Find the user: a plain row (the role comes from the catalog, not a join)
+        user = await self.user_repo.get_login_row(username)
         
         # 2. Verify user and password
-        if not user or not verify_password(password, user.password_hash):
+        # bcrypt runs in the hashing pool, off the event loop
+        if not user or not await verify_password_async(password, user.password_hash):
+            login_throttle.record_failure(username, client_ip)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        login_throttle.record_success(username)
+
         # 3. Generate Access Token
-        access_token = create_access_token(user_id=str(user.id), role=user.role.name)
-        
-        # 4. Generate Refresh Token & Save to DB
-        refresh_str = create_refresh_token(user_id=str(user.id))
-        # We store the HASH of the token, not the raw token, for security
-        # (Assuming the spec asks for that, or we store it raw. Let's verify repo later.)
-        # For now, let's just create the record. Ideally, we hash it.
-        # But wait, looking at TokenRepo, it takes 'token_hash'. 
-        # So we should hash the refresh token string before saving.
-        refresh_hash = get_password_hash(refresh_str) 
+        session_id = generate_token_id()
+        role = await role_catalog.get_by_id(self.db, user.role_id)
+        access_token = create_access_token(
+            user_id=str(user.id),
+            role=role.name,
+            permissions=role.permission_mask,
+            session_id=session_id,
+            token_version=user.token_version
+        )
         
-        expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        self.token_repo.create(user_id=user.id, token_hash=refresh_hash, expires_at=expires_at)
+        # 4. Generate Refresh Token & Save to DB (starts the session)
+        refresh_str = await self._issue_refresh_token(user.id, session_id, user.token_version, user_agent)
 
         return Token(
             access_token=access_token,
@@ -52,7 +96,7 @@ class AuthService:
             token_type="bearer"
         )
 
-    def refresh_access_token(self, refresh_token_in: str) -> Token:
+    async def refresh_access_token(self, refresh_token_in: str) -> Token:
         """
         Rotate tokens: Validate old refresh token, revoke it, issue new pair.
         """
@@ -61,53 +105,208 @@ class AuthService:
             payload = decode_token(refresh_token_in)
             if payload.get("type") != "refresh":
                 raise HTTPException(status_code=401, detail="Invalid token type")
-            user_id = payload.get("sub")
-        except JWTError:
+            user_id = UUID(payload.get("sub"))
+            jti = payload["jti"]
+            token_expires_at = datetime.utcfromtimestamp(payload["exp"])
+            token_version = int(payload.get("ver", 0))
+        except (JWTError, KeyError, TypeError, ValueError):
+            ROTATION_INVALID.inc()
             raise HTTPException(status_code=401, detail="Invalid refresh token")
 
-        # 2. Verify against DB (We need to find the token matching the HASH)
-        # This is tricky without looking up by ID.
-        # Strategy: We can't lookup by hash easily because verifying bcrypt is slow/one-way.
-        # usually we store a "jti" (unique ID) in the token or just store the raw token if secure.
-        # Given your Repo has [get_by_hash](cci:1://file:///d:/Rajat/Projects/SentinelAuth/SentinelAuth/app/repositories/token_repo.py:28:4-32:17), it implies direct lookup.
-        # IF we hashed it with bcrypt, we can't do [get_by_hash](cci:1://file:///d:/Rajat/Projects/SentinelAuth/SentinelAuth/app/repositories/token_repo.py:28:4-32:17).
-        # LET'S FIX: For this MVP, let's verify the user exists first.
-        
-        # ACTUALLY: The standard way with bcrypt is: you cannot lookup by hash.
-        # You'd need a raw unique ID in the token to find the DB row, THEN verify the hash.
-        # Since our [create_refresh_token](cci:1://file:///d:/Rajat/Projects/SentinelAuth/SentinelAuth/app/core/tokens.py:41:0-62:41) doesn't add a unique ID (jti) yet in tokens.py...
-        
-        # ALTERNATIVE For MVP: We will store the token RAW in the DB for now to make this work 
-        # with the current Repo implementation ([get_by_hash](cci:1://file:///d:/Rajat/Projects/SentinelAuth/SentinelAuth/app/repositories/token_repo.py:28:4-32:17) implies exact match).
-        
-        # Validating user exists
-        user = self.user_repo.get_by_id(user_id)
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-
-        # 3. Find the token in DB (Assuming we stored it raw per repo capability)
-        # If we used bcrypt in login, this next line fails.
-        # So in Login, we must pass the RAW token to [create](cci:1://file:///d:/Rajat/Projects/SentinelAuth/SentinelAuth/app/repositories/token_repo.py:15:4-26:23) if we want [get_by_hash](cci:1://file:///d:/Rajat/Projects/SentinelAuth/SentinelAuth/app/repositories/token_repo.py:28:4-32:17) to work.
-        existing_token = self.token_repo.get_by_hash(refresh_token_in)
+        # 2. Find the stored token (plus owner state) by its selector in
+        #    one query, then check the verifier in constant time.
+        #    The expiry narrows the lookup to one partition when partitioned.
+        existing_token = await self.token_repo.get_for_rotation(jti, token_expires_at)
         
-        if not existing_token:
-            # Token Reuse Detection could go here (if family ID was used)
+        if (
+            not existing_token
+            or existing_token.user_id != user_id
+            or not verify_token_digest(refresh_token_in, existing_token.token_digest)
+        ):
+            ROTATION_INVALID.inc()
             raise HTTPException(status_code=401, detail="Refresh token not found or revoked")
 
         if existing_token.is_revoked:
-             raise HTTPException(status_code=401, detail="Token revoked")
+            # Token Reuse Detection could go here (if family ID was used)
+            ROTATION_REVOKED.inc()
+            raise HTTPException(status_code=401, detail="Token revoked")
 
-        # 4. Rotate: Revoke old, Create new
-        self.token_repo.revoke(existing_token)
-        
-        new_access_token = create_access_token(user_id=str(user.id), role=user.role.name)
-        new_refresh_str = create_refresh_token(user_id=str(user.id))
+        if existing_token.token_version != token_version:
+            # Password change or global logout since this token was issued
+            ROTATION_REVOKED.inc()
+            raise HTTPException(status_code=401, detail="Token revoked")
+
+        if not existing_token.is_active:
+            ROTATION_INVALID.inc()
+            raise HTTPException(status_code=401, detail="Inactive user")
+
+        # 3. Rotate: revoke old + insert new in one transaction.
+        #    If a concurrent refresh of the same token won, we lose cleanly.
+        new_jti = generate_token_id()
+        new_expires_at = refresh_token_expires_at()
+        new_refresh_str = create_refresh_token(
+            user_id=str(user_id), jti=new_jti, expires_at=new_expires_at, token_version=token_version
+        )
+        rotated = await self.token_repo.rotate(
+            token_id=existing_token.id,
+            user_id=user_id,
+            jti=new_jti,
+            token_digest=hash_token(new_refresh_str),
+            expires_at=new_expires_at,
+            token_expires_at=existing_token.expires_at
+        )
+        if not rotated:
+            ROTATION_LOST_RACE.inc()
+            raise HTTPException(status_code=401, detail="Token revoked")
+        ROTATION_ROTATED.inc()
         
-        expires_at = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-        self.token_repo.create(user_id=user.id, token_hash=new_refresh_str, expires_at=expires_at)
+        role = await role_catalog.get_by_id(self.db, existing_token.role_id)
+        new_access_token = create_access_token(
+            user_id=str(user_id),
+            role=role.name,
+            permissions=role.permission_mask,
+            session_id=existing_token.session_id,
+            token_version=token_version
+        )
         
         return Token(
             access_token=new_access_token,
             refresh_token=new_refresh_str,
             token_type="bearer"
-        )
\ No newline at end of file
+        )
+
+    async def logout(self, token: TokenPayload, refresh_token: Optional[str] = None) -> None:
+        """
+        End a session: the access token's session is ended (see
+        SessionService), or for tokens without a `sid` the access token
+        alone is denied until it expires. The refresh token, if given, is
+        revoked too.
+
+        A refresh token that is invalid or belongs to someone else is
+        rejected before anything is revoked.
+        """
+        stored = None
+        if refresh_token:
+            try:
+                payload = decode_token(refresh_token)
+                if payload.get("type") != TOKEN_TYPE_REFRESH or payload.get("sub") != token.sub:
+                    raise ValueError("not this user's refresh token")
+                stored = await self.token_repo.get_by_jti(
+                    payload["jti"], datetime.utcfromtimestamp(payload["exp"])
+                )
+            except (JWTError, KeyError, TypeError, ValueError):
+                stored = None
+            if not stored or not verify_token_digest(refresh_token, stored.token_digest):
+                raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+        if token.sid:
+            await SessionService(self.db).end_session(UUID(token.sub), token.sid)
+        # Tokens issued before jti existed cannot be denied; they just expire
+        elif token.jti and token.exp:
+            await denylist_sync_service.deny(self.db, token.jti, datetime.utcfromtimestamp(token.exp))
+        if stored and not stored.is_revoked:
+            await self.token_repo.revoke(stored)
+
+    async def introspect(self, tokens: List[str]) -> List[TokenIntrospection]:
+        """
+        Validate a batch of access tokens (API gateway introspection).
+
+        Each distinct token is verified once, and its claims are cached
+        until it expires; revoked and outdated (`ver`) tokens are
+        inactive. Owners are read from the principal cache; the rest are
+        loaded with a single IN query.
+
+        Returns:
+            One result per input token, in order
+        """
+        # 1. Verify signatures (or reuse cached claims)
+        now = time.time()
+        verified: Dict[str, Optional[Tuple[dict, UUID]]] = {}
+        for token in tokens:
+            if token in verified:
+                continue
+            claims = access_claims_cache.get(token)
+            if claims is None:
+                try:
+                    claims = decode_token(token)
+                except JWTError:
+                    verified[token] = None
+                    continue
+                if claims.get("type") == TOKEN_TYPE_ACCESS:
+                    access_claims_cache.set(token, claims)
+            try:
+                user_id = UUID(claims["sub"])
+                valid = claims.get("type") == TOKEN_TYPE_ACCESS and claims["exp"] > now
+            except (KeyError, TypeError, ValueError):
+                valid = False
+            # Revocation is re-checked on every call, cached claims or not
+            if valid and access_denylist.is_token_revoked(claims.get("jti"), claims.get("sid")):
+                valid = False
+            verified[token] = (claims, user_id) if valid else None
+
+        # 2. Resolve owners: principal cache first, one query for the rest
+        principals: Dict[UUID, Principal] = {}
+        missing = []
+        for user_id in {entry[1] for entry in verified.values() if entry}:
+            principal = principal_cache.get(user_id)
+            if principal is None:
+                missing.append(user_id)
+            else:
+                principals[user_id] = principal
+        if missing:
+            for user in await self.user_repo.get_auth_rows(missing):
+                role = await role_catalog.get_by_id(self.db, user.role_id)
+                principal = principals[user.id] = Principal.from_user(user, role)
+                principal_cache.set(user.id, principal)
+                token_versions.set(user.id, user.token_version)
+        versions = await token_versions.get_many(self.db, principals)
+
+        # 3. Build results (one IntrospectedUser per user, shared across its tokens)
+        users: Dict[UUID, IntrospectedUser] = {}
+        inactive = TokenIntrospection(active=False)
+        results = []
+        for token in tokens:
+            entry = verified[token]
+            principal = principals.get(entry[1]) if entry else None
+            if (
+                principal is None
+                or not principal.is_active
+                or versions.get(principal.id) != entry[0].get("ver", 0)
+            ):
+                results.append(inactive)
+                continue
+            user = users.get(principal.id)
+            if user is None:
+                user = users[principal.id] = IntrospectedUser(
+                    id=principal.id,
+                    username=principal.username,
+                    email=principal.email,
+                    is_active=principal.is_active,
+                    role=principal.role.name,
+                )
+            results.append(TokenIntrospection(active=True, claims=entry[0], user=user))
+        return results
+
+    async def _issue_refresh_token(
+        self, user_id: UUID, session_id: str, token_version: int, user_agent: Optional[str] = None
+    ) -> str:
+        """
+        Create a refresh token and store its (jti, SHA-256 digest) pair,
+        with the session's device metadata.
+        """
+        jti = generate_token_id()
+        expires_at = refresh_token_expires_at()
+        refresh_str = create_refresh_token(
+            user_id=str(user_id), jti=jti, expires_at=expires_at, token_version=token_version
+        )
+        await self.token_repo.create(
+            user_id=user_id,
+            jti=jti,
+            token_digest=hash_token(refresh_str),
+            expires_at=expires_at,
+            session_id=session_id,
+            token_version=token_version,
+            user_agent=truncate_user_agent(user_agent),
+            device=describe_user_agent(user_agent)
+        )
+        return refresh_str
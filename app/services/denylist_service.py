@@ -0,0 +1,120 @@
+"""
+Access Token Denylist Service.
+
+Revoking an access token (logout) writes its jti - or, when a whole
+session ends, its sid - to revoked_access_tokens and adds it to this
+worker's in-memory denylist at once. Other workers learn about it by
+polling the table: each pass reads only the rows revoked since the last
+one (keyset on revoked_at, jti), in batches, so a restart rebuilds the
+denylist incrementally and a steady-state pass is one indexed query
+that usually returns nothing.
+
+Runs from the app lifespan: one pass at startup, then every
+ACCESS_DENYLIST_SYNC_SECONDS.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.denylist import AccessTokenDenylist, access_denylist
+from app.db.session import AsyncSessionLocal
+from app.repositories.token_repo import AsyncTokenRepository
+from app.utils.logger import logger
+
+# Each pass re-reads this much before the watermark: revoked_at comes from
+# the revoking worker's clock, so a row can commit "in the past" of one
+# already seen (clock skew between workers must stay below this).
+SYNC_OVERLAP = timedelta(seconds=10)
+
+_START: Tuple[datetime, str] = (datetime(1970, 1, 1), "")
+
+
+def _epoch(value: datetime) -> float:
+    """Naive UTC datetime -> epoch seconds."""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class DenylistSyncService:
+    """
+    Mirrors revoked_access_tokens into an in-memory denylist.
+
+    Attributes:
+        synced: Denials loaded from the table so far (new to this worker)
+        last_sync: When the last pass finished
+    """
+
+    def __init__(
+        self,
+        denylist: AccessTokenDenylist = access_denylist,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        batch_size: int = 1000,
+    ):
+        self.denylist = denylist
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self._watermark = _START
+        self.synced = 0
+        self.last_sync: Optional[datetime] = None
+
+    async def sync_once(self) -> int:
+        """
+        Load denials revoked since the previous pass and prune expired ones.
+
+        Returns:
+            Number of denials new to this worker
+        """
+        now = datetime.utcnow()
+        after = self._watermark
+        if after != _START:
+            after = (after[0] - SYNC_OVERLAP, "")
+
+        added = 0
+        while True:
+            async with self.session_factory() as db:
+                rows = await AsyncTokenRepository(db).get_denied_access_tokens(after, now, self.batch_size)
+            added += self.denylist.add_many((row.jti, _epoch(row.expires_at)) for row in rows)
+            if rows:
+                after = (rows[-1].revoked_at, rows[-1].jti)
+                self._watermark = max(self._watermark, after)
+            if len(rows) < self.batch_size:
+                break
+
+        self.denylist.prune()
+        self.synced += added
+        self.last_sync = datetime.utcnow()
+        return added
+
+    async def deny(self, db: AsyncSession, jti: str, expires_at: datetime) -> None:
+        """
+        Revoke an access token (jti) or every token of a session (sid):
+        persist the denial, then apply it here at once.
+        """
+        await AsyncTokenRepository(db).deny_access_token(jti, expires_at)
+        self.denylist.add(jti, _epoch(expires_at))
+
+    async def run_forever(self, interval: float = settings.ACCESS_DENYLIST_SYNC_SECONDS) -> None:
+        """Sync every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the loop alive; the next pass retries from the same watermark
+                logger.error(f"Denylist sync failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.denylist.stats(),
+            "synced": self.synced,
+            "last_sync": self.last_sync.isoformat() if self.last_sync else None,
+        }
+
+
+# Global sync service used by the app lifespan, logout and /admin/stats
+denylist_sync_service = DenylistSyncService()
@@ -0,0 +1,83 @@
+"""
+Role Service.
+
+Role listing and permission grants. A grant change updates the
+role_permissions rows and the role's precomputed permission_mask
+together and invalidates the role catalog; users pick it up with
+their next access token.
+
+Access tokens carry the permission mask, so removing a permission also
+bumps the token version of every user of the role in the same
+transaction: their tokens stop authorizing at once (other workers
+within TOKEN_VERSION_CACHE_TTL_SECONDS) and they must log in again.
+Pure grants leave existing tokens valid.
+"""
+
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.permissions import permission_registry
+from app.core.principal import principal_cache
+from app.core.role_catalog import role_catalog
+from app.core.token_versions import token_versions
+from app.core.tracing import trace_methods
+from app.db.models.role import Role
+from app.repositories.role_repo import AsyncRoleRepository
+from app.repositories.user_repo import AsyncUserRepository
+from app.schemas.role import RolePermissionsResponse
+
+
+def _with_permissions(role: Role) -> RolePermissionsResponse:
+    return RolePermissionsResponse(
+        id=role.id,
+        name=role.name,
+        description=role.description,
+        created_at=role.created_at,
+        permission_mask=role.permission_mask,
+        permissions=permission_registry.names(role.permission_mask),
+    )
+
+
+@trace_methods
+class RoleService:
+    def __init__(self, db: AsyncSession):
+        self.role_repo = AsyncRoleRepository(db)
+        self.user_repo = AsyncUserRepository(db)
+
+    async def get_roles(self) -> List[RolePermissionsResponse]:
+        """
+        All roles with their permissions (decoded from the mask, no join).
+        """
+        return [_with_permissions(role) for role in await self.role_repo.get_all()]
+
+    async def set_role_permissions(self, role_name: str, names: List[str]) -> RolePermissionsResponse:
+        """
+        Replace the permissions granted by a role.
+        """
+        role = await self.role_repo.get_by_name(role_name)
+        if not role:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Role not found")
+
+        names = set(names)
+        permissions = await self.role_repo.get_permissions_by_names(names)
+        unknown = names - {p.name for p in permissions}
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown permissions: {', '.join(sorted(unknown))}",
+            )
+
+        mask = sum(1 << p.bit for p in permissions)
+        revoked = role.permission_mask & ~mask
+        if revoked:
+            # Committed together with the new grants by set_permissions
+            await self.user_repo.bump_role_token_versions(role.id)
+
+        role = await self.role_repo.set_permissions(role, permissions)
+        role_catalog.invalidate()
+        if revoked:
+            token_versions.clear()
+            principal_cache.clear()
+        return _with_permissions(role)
@@ -0,0 +1,122 @@
+"""
+Session Service.
+
+A login session is a refresh token chain: login starts one with a fresh
+session_id, and each rotation carries the id (and the device metadata
+captured at login) to the successor, so a session is always exactly one
+live refresh_tokens row. Access tokens carry the id as their `sid`
+claim.
+
+Ending a session revokes its live row and denies its sid, so the access
+tokens already issued from it stop working too (on every worker within
+ACCESS_DENYLIST_SYNC_SECONDS) rather than at their expiry. Ending all of
+them is a token version bump instead (see app/core/token_versions.py):
+one single-row UPDATE however many sessions the user has.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.token_versions import token_versions
+from app.core.tokens import access_token_expires_at
+from app.core.tracing import trace_methods
+from app.repositories.token_repo import AsyncTokenRepository
+from app.repositories.user_repo import AsyncUserRepository
+from app.schemas.session import SessionResponse
+from app.services.denylist_service import denylist_sync_service
+
+
+@trace_methods
+class SessionService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.token_repo = AsyncTokenRepository(db)
+        self.user_repo = AsyncUserRepository(db)
+
+    async def list_sessions(
+        self, user_id: UUID, current_session_id: Optional[str] = None
+    ) -> List[SessionResponse]:
+        """
+        A user's live sessions, most recently used first.
+
+        Tokens issued before sessions existed have no session_id and are
+        not listed (they are still ended by revoke_other_sessions).
+        """
+        version = await token_versions.get(self.db, user_id)
+        if version is None:
+            return []
+        rows = await self.token_repo.list_sessions(user_id, datetime.utcnow(), version)
+        return [
+            SessionResponse(
+                session_id=row.session_id,
+                device=row.device,
+                user_agent=row.user_agent,
+                started_at=row.session_started_at or row.created_at,
+                last_used_at=row.created_at,
+                expires_at=row.expires_at,
+                current=row.session_id == current_session_id,
+            )
+            for row in rows
+            if row.session_id
+        ]
+
+    async def end_session(self, user_id: UUID, session_id: str) -> bool:
+        """
+        End one of a user's sessions.
+
+        Returns:
+            False if the user has no live session with that id
+        """
+        return await self._end_sessions(user_id, session_id=session_id) > 0
+
+    async def revoke_session(self, user_id: UUID, session_id: str) -> None:
+        """
+        End one of a user's sessions, 404 if it is not live.
+        """
+        if not await self.end_session(user_id, session_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+
+    async def revoke_other_sessions(self, user_id: UUID, current_session_id: Optional[str]) -> int:
+        """
+        End every session of a user except the current one.
+
+        A token without a `sid` cannot name its own session, so all of
+        them end.
+
+        Returns:
+            Number of sessions ended
+        """
+        return await self._end_sessions(user_id, except_session_id=current_session_id)
+
+    async def revoke_all_sessions(self, user_id: UUID) -> None:
+        """
+        Global logout: bump the user's token version, invalidating every
+        access and refresh token issued so far. Their rows are left to
+        expire; the listing and rotation ignore outdated versions.
+        """
+        version = await self.user_repo.bump_token_version(user_id)
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        token_versions.set(user_id, version)
+
+    async def _end_sessions(
+        self,
+        user_id: UUID,
+        session_id: Optional[str] = None,
+        except_session_id: Optional[str] = None,
+    ) -> int:
+        version = await token_versions.get(self.db, user_id)
+        if version is None:
+            return 0
+        revoked = await self.token_repo.revoke_sessions(
+            user_id, version, session_id=session_id, except_session_id=except_session_id
+        )
+        # Any access token of these sessions expires by then
+        expires_at = access_token_expires_at()
+        for sid in {sid for sid in revoked if sid}:
+            await denylist_sync_service.deny(self.db, sid, expires_at)
+        return len(revoked)
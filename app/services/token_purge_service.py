@@ -0,0 +1,208 @@
+"""
+Refresh Token Purge Service.
+
+Every login and rotation inserts a refresh_tokens row and nothing else
+removes them, so the table and its indexes grow without bound. This
+service deletes expired and long-revoked tokens in small batches, each in
+its own short transaction with a pause in between, so the hot table is
+never locked for long.
+
+When refresh_tokens is partitioned (REFRESH_TOKENS_PARTITIONED), expired
+rows are not deleted one by one: each pass pre-creates future partitions
+and drops whole months that have fully expired (see app/db/partitions.py).
+Long-revoked rows are still deleted in batches.
+
+Expired rows of the access token denylist (revoked_access_tokens) are
+deleted in the same pass.
+
+Runs either as a background task from the app lifespan
+(TOKEN_PURGE_ENABLED) or on demand via scripts/purge_tokens.py. Partition
+maintenance also has its own loop (run_partition_maintenance_forever) so
+inserts never run out of partitions while the purger is off.
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.db import partitions
+from app.db.session import AsyncSessionLocal
+from app.repositories.token_repo import AsyncTokenRepository
+from app.utils.logger import logger
+
+
+@dataclass
+class PurgeReport:
+    """
+    Outcome of one purge pass.
+
+    Attributes:
+        expired_deleted: Expired tokens removed
+        revoked_deleted: Long-revoked (not yet expired) tokens removed
+        denials_deleted: Expired access token denylist rows removed
+        batches: DELETE statements issued
+        partitions_created: Future partitions created (partitioned mode)
+        partitions_dropped: Expired partitions dropped (partitioned mode)
+        seconds: Wall time of the pass, including pauses
+        rows_per_sec: Deletion throughput
+        lag_seconds: Age of the oldest expired token still in the table
+            after the pass (0 when fully caught up)
+        finished_at: When the pass ended
+    """
+    expired_deleted: int = 0
+    revoked_deleted: int = 0
+    denials_deleted: int = 0
+    batches: int = 0
+    partitions_created: int = 0
+    partitions_dropped: int = 0
+    seconds: float = 0.0
+    rows_per_sec: float = 0.0
+    lag_seconds: float = 0.0
+    finished_at: Optional[datetime] = None
+
+
+class TokenPurgeService:
+    """
+    Batched deleter for expired and long-revoked refresh tokens.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        batch_size: int = settings.TOKEN_PURGE_BATCH_SIZE,
+        batch_sleep: float = settings.TOKEN_PURGE_BATCH_SLEEP_SECONDS,
+        expired_grace: timedelta = timedelta(hours=settings.TOKEN_PURGE_EXPIRED_GRACE_HOURS),
+        revoked_retention: timedelta = timedelta(hours=settings.TOKEN_PURGE_REVOKED_RETENTION_HOURS),
+        partitioned: bool = settings.REFRESH_TOKENS_PARTITIONED,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.batch_sleep = batch_sleep
+        self.expired_grace = expired_grace
+        self.revoked_retention = revoked_retention
+        self.partitioned = partitioned
+        self.last_report: Optional[PurgeReport] = None
+
+    async def purge_once(self) -> PurgeReport:
+        """
+        Delete everything currently purgeable, one bounded batch at a time.
+        """
+        report = PurgeReport()
+        start = time.perf_counter()
+        now = datetime.utcnow()
+        expired_cutoff = now - self.expired_grace
+        revoked_cutoff = now - self.revoked_retention
+
+        if self.partitioned:
+            report.partitions_created, report.partitions_dropped = await self.maintain_partitions()
+        else:
+            report.expired_deleted, batches = await self._drain(
+                lambda repo: repo.delete_expired_batch(expired_cutoff, self.batch_size)
+            )
+            report.batches += batches
+        report.revoked_deleted, batches = await self._drain(
+            lambda repo: repo.delete_revoked_batch(revoked_cutoff, self.batch_size)
+        )
+        report.batches += batches
+        report.denials_deleted, batches = await self._drain(
+            lambda repo: repo.delete_expired_denials_batch(now, self.batch_size)
+        )
+        report.batches += batches
+
+        # In partitioned mode expired rows wait for their month to be dropped
+        oldest = None
+        if not self.partitioned:
+            async with self.session_factory() as db:
+                oldest = await AsyncTokenRepository(db).get_oldest_expired(expired_cutoff)
+
+        report.seconds = time.perf_counter() - start
+        total = report.expired_deleted + report.revoked_deleted + report.denials_deleted
+        report.rows_per_sec = total / report.seconds if report.seconds else 0.0
+        report.lag_seconds = (now - oldest).total_seconds() if oldest else 0.0
+        report.finished_at = datetime.utcnow()
+        self.last_report = report
+
+        logger.info(
+            f"Token purge: {report.expired_deleted} expired + {report.revoked_deleted} revoked "
+            f"+ {report.denials_deleted} denials "
+            f"in {report.batches} batches, {report.rows_per_sec:.0f} rows/s, "
+            f"lag {report.lag_seconds:.0f}s"
+        )
+        return report
+
+    async def maintain_partitions(self) -> Tuple[int, int]:
+        """
+        Keep future partitions ready and drop fully expired months.
+
+        Returns:
+            (partitions created, partitions dropped)
+        """
+        months_ahead = max(
+            settings.TOKEN_PARTITION_MONTHS_AHEAD,
+            settings.REFRESH_TOKEN_EXPIRE_DAYS // 28 + 1,
+        )
+        retention = timedelta(days=settings.TOKEN_PARTITION_RETENTION_DAYS) + self.expired_grace
+        async with self.session_factory() as db:
+            conn = await db.connection()
+            result = await conn.run_sync(partitions.maintain_partitions, months_ahead, retention)
+            await db.commit()
+        return result
+
+    async def _drain(
+        self, delete_batch: Callable[[AsyncTokenRepository], Awaitable[int]]
+    ) -> Tuple[int, int]:
+        """
+        Repeat a batch delete until a short batch shows nothing is left.
+
+        Returns:
+            (rows deleted, batches issued)
+        """
+        deleted = batches = 0
+        while True:
+            async with self.session_factory() as db:
+                count = await delete_batch(AsyncTokenRepository(db))
+            deleted += count
+            batches += 1
+            if count < self.batch_size:
+                return deleted, batches
+            await asyncio.sleep(self.batch_sleep)
+
+    async def run_forever(self, interval: float = settings.TOKEN_PURGE_INTERVAL_SECONDS) -> None:
+        """Purge every `interval` seconds until cancelled."""
+        while True:
+            try:
+                await self.purge_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep the loop alive; the next pass retries
+                logger.error(f"Token purge failed: {e}")
+            await asyncio.sleep(interval)
+
+    async def run_partition_maintenance_forever(
+        self, interval: float = settings.TOKEN_PARTITION_MAINTENANCE_SECONDS
+    ) -> None:
+        """Maintain partitions every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                created, dropped = await self.maintain_partitions()
+                if created or dropped:
+                    logger.info(f"Token partitions: {created} created, {dropped} dropped")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Token partition maintenance failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Last purge report (empty until the first pass finishes)."""
+        return asdict(self.last_report) if self.last_report else {}
+
+
+# Global purger used by the app lifespan and /admin/stats
+token_purge_service = TokenPurgeService()
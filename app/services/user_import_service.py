@@ -0,0 +1,128 @@
+"""
+Bulk User Import Service.
+
+Creates users from an NDJSON/CSV upload in batches. Per batch: validate
+rows, dedupe against the upload and the database with set-based queries,
+hash plain passwords across the hashing pool, then load everything with
+a single multi-row INSERT. Bad rows are reported, never fatal.
+"""
+
+import itertools
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
+
+from app.core.constants import IMPORT_BATCH_SIZE, ROLE_USER
+from app.core.hashing import get_password_hashes_async
+from app.core.tracing import trace_methods
+from app.repositories.role_repo import AsyncRoleRepository
+from app.repositories.user_repo import AsyncUserRepository
+from app.schemas.user import UserImportRecord, UserImportReport, UserImportRowError
+from app.utils.bulk_import import ParsedRecord
+
+
+def _first_error(exc: ValidationError) -> str:
+    """Compact message for the first validation error of a row."""
+    error = exc.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+@trace_methods
+class UserImportService:
+    def __init__(self, db: AsyncSession):
+        self.user_repo = AsyncUserRepository(db)
+        self.role_repo = AsyncRoleRepository(db)
+
+    async def import_users(
+        self,
+        records: Iterable[ParsedRecord],
+        default_role: str = ROLE_USER,
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> UserImportReport:
+        """
+        Import parsed (line, record) pairs and report what happened to each.
+        """
+        report = UserImportReport()
+        role_ids = {role.name: role.id for role in await self.role_repo.get_all()}
+        seen_usernames: set = set()
+        seen_emails: set = set()
+
+        records = iter(records)
+        while batch := list(itertools.islice(records, batch_size)):
+            report.received += len(batch)
+            await self._import_batch(batch, report, role_ids, default_role, seen_usernames, seen_emails)
+
+        report.errors.sort(key=lambda error: error.line)
+        report.failed = len(report.errors)
+        return report
+
+    async def _import_batch(
+        self,
+        batch: List[ParsedRecord],
+        report: UserImportReport,
+        role_ids: Dict[str, int],
+        default_role: str,
+        seen_usernames: set,
+        seen_emails: set,
+    ) -> None:
+        def reject(line: int, username: Optional[str], error: str) -> None:
+            report.errors.append(UserImportRowError(line=line, username=username, error=error))
+
+        # 1. Validate, and dedupe within the upload
+        valid = []
+        for line, data in batch:
+            if data is None:
+                reject(line, None, "Malformed row")
+                continue
+            try:
+                record = UserImportRecord.model_validate(data)
+            except ValidationError as e:
+                reject(line, data.get("username"), _first_error(e))
+                continue
+            role_name = record.role or default_role
+            if role_name not in role_ids:
+                reject(line, record.username, f"Unknown role '{role_name}'")
+            elif record.username in seen_usernames:
+                reject(line, record.username, "Duplicate username in upload")
+            elif record.email in seen_emails:
+                reject(line, record.username, "Duplicate email in upload")
+            else:
+                seen_usernames.add(record.username)
+                seen_emails.add(record.email)
+                valid.append((line, record, role_ids[role_name]))
+
+        # 2. Dedupe against existing users, one query for the whole batch
+        taken_usernames, taken_emails = await self.user_repo.find_existing(
+            (record.username for _, record, _ in valid),
+            (record.email for _, record, _ in valid),
+        )
+        pending = []
+        for line, record, role_id in valid:
+            if record.username in taken_usernames:
+                reject(line, record.username, "Username already taken")
+            elif record.email in taken_emails:
+                reject(line, record.username, "Email already registered")
+            else:
+                pending.append((line, record, role_id))
+
+        # 3. Hash plain passwords in the process pool
+        plain = [record.password for _, record, _ in pending if record.password_hash is None]
+        hashes = iter(await get_password_hashes_async(plain))
+
+        # 4. One multi-row INSERT for the batch
+        rows = [
+            {
+                "username": record.username,
+                "email": record.email,
+                "password_hash": record.password_hash or next(hashes),
+                "role_id": role_id,
+                "is_active": True,
+            }
+            for _, record, role_id in pending
+        ]
+        inserted = await self.user_repo.bulk_insert(rows)
+        report.created += len(inserted)
+        for line, record, _ in pending:
+            if record.username not in inserted:
+                reject(line, record.username, "Username or email already exists")
@@ -1,84 +1,216 @@
-from sqlalchemy.orm import Session
+from typing import AsyncIterator, Optional, Set
+from uuid import UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
-from app.schemas.user import UserCreate, UserUpdate
-from app.repositories.user_repo import UserRepository
-from app.repositories.role_repo import RoleRepository
-from app.core.security import get_password_hash
+from app.schemas.user import UserCreate, UserPage, UserResponse, UserUpdate
+from app.repositories.user_repo import AsyncUserRepository
+from app.core.constants import EXPORT_BATCH_SIZE, MAX_OFFSET, ROLE_USER
+from app.core.hashing import get_password_hash_async
+from app.core.principal import Principal, principal_cache
+from app.core.role_catalog import role_catalog
+from app.core.token_versions import token_versions
+from app.core.tracing import trace_methods
 from app.db.models.user import User
+from app.utils.export import USER_EXPORT_COLUMNS, rows_to_csv, rows_to_ndjson
+from app.utils.pagination import decode_cursor, encode_cursor
 
+@trace_methods
 class UserService:
-    def __init__(self, db: Session):
-        self.user_repo = UserRepository(db)
-        self.role_repo = RoleRepository(db)
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.user_repo = AsyncUserRepository(db)
 
-    def register_user(self, user_in: UserCreate):
+    async def register_user(self, user_in: UserCreate) -> Principal:
         """
         Register a new user in the system.
+        
+        The unique indexes are the real guarantee: the pre-check only
+        spares a bcrypt hash for obvious duplicates, and a signup that
+        loses a race to the same username or email gets the same 400.
         """
-        # 1. Check if user already exists
-        if self.user_repo.get_by_email(user_in.email):
+        # 1. Check if user already exists (username and email in one query)
+        self._raise_if_taken(user_in, *await self.user_repo.find_existing([user_in.username], [user_in.email]))
+
+        # 2. Get the default role (assuming "user" role exists from init_db)
+        user_role = await role_catalog.get_by_name(self.db, ROLE_USER)
+        if not user_role:
+            # Fallback or error if roles weren't seeded
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Default role 'user' not found in database"
+            )
+
+        # 3. Hash the password
+        hashed_password = await get_password_hash_async(user_in.password)
+
+        # 4. Create the user
+        try:
+            row = await self.user_repo.create(
+                user_in=user_in,
+                password_hash=hashed_password,
+                role_id=user_role.id
+            )
+        except IntegrityError:
+            # Lost a race: find out which constraint it was
+            self._raise_if_taken(user_in, *await self.user_repo.find_existing([user_in.username], [user_in.email]))
+            raise
+
+        return Principal(
+            id=row.id,
+            username=user_in.username,
+            email=user_in.email,
+            is_active=row.is_active,
+            created_at=row.created_at,
+            role=user_role,
+        )
+
+    @staticmethod
+    def _raise_if_taken(user_in: UserCreate, taken_usernames: Set[str], taken_emails: Set[str]) -> None:
+        if user_in.email in taken_emails:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-        
-        if self.user_repo.get_by_username(user_in.username):
+        if user_in.username in taken_usernames:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
             )
 
-        # 2. Get the default role (assuming "user" role exists from init_db)
-        user_role = self.role_repo.get_by_name("user")
-        if not user_role:
-            # Fallback or error if roles weren't seeded
+    async def get_all_users(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        role: Optional[str] = None,
+        is_active: Optional[bool] = None,
+    ) -> UserPage:
+        """
+        Get a page of users ordered by (created_at, id).
+        
+        `cursor` (keyset) is the normal way to page; `skip` (offset) is
+        only allowed up to MAX_OFFSET because deep offsets scan and discard
+        every preceding row.
+        """
+        if cursor and skip:
+            raise HTTPException(status_code=400, detail="Use either cursor or skip, not both")
+        if skip > MAX_OFFSET:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Default role 'user' not found in database"
+                status_code=400,
+                detail=f"skip is limited to {MAX_OFFSET}; use cursor pagination for deeper pages"
             )
 
-        # 3. Hash the password
-        hashed_password = get_password_hash(user_in.password)
+        after = None
+        if cursor:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
 
-        # 4. Create the user
-        return self.user_repo.create(
-            user_in=user_in,
-            password_hash=hashed_password,
-            role_id=user_role.id
+        role_id = None
+        if role is not None:
+            user_role = await role_catalog.get_by_name(self.db, role)
+            if not user_role:
+                return UserPage(items=[])
+            role_id = user_role.id
+
+        # Fetch one extra row to know whether another page exists
+        users = await self.user_repo.get_page(
+            limit=limit + 1, after=after, offset=skip, role_id=role_id, is_active=is_active
+        )
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+
+        return UserPage(
+            items=[UserResponse.model_validate(user) for user in users],
+            next_cursor=next_cursor
         )
 
-    def get_all_users(self, skip: int = 0, limit: int = 100):
+    async def export_users(self, fmt: str = "ndjson") -> AsyncIterator[str]:
         """
-        Get all users.
+        Stream all users as NDJSON or CSV, one chunk per cursor batch.
         """
-        return self.user_repo.get_all(skip=skip, limit=limit)
+        header = USER_EXPORT_COLUMNS if fmt == "csv" else ()
+        async for rows in self.user_repo.stream_export_rows(batch_size=EXPORT_BATCH_SIZE):
+            if fmt == "csv":
+                yield rows_to_csv(rows, header)
+                header = ()
+            else:
+                yield rows_to_ndjson(rows)
+        if header:
+            # No users at all: still emit the CSV header
+            yield rows_to_csv((), header)
 
-    def get_user_by_id(self, user_id: str):
+    async def get_user_by_id(self, user_id: UUID):
         """Get user by ID."""
-        user = self.user_repo.get_by_id(user_id)
+        user = await self.user_repo.get_by_id(user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return user
 
-    def update_user(self, current_user: User, user_in: UserUpdate):
+    async def update_user(self, user_id: UUID, user_in: UserUpdate):
         """
         Update user profile.
+        A password change also invalidates every token issued so far.
         """
+        current_user = await self.get_user_by_id(user_id)
+
         # 1. If updating email, check uniqueness
         if user_in.email and user_in.email != current_user.email:
-            if self.user_repo.get_by_email(user_in.email):
+            if await self.user_repo.get_by_email(user_in.email):
                 raise HTTPException(status_code=400, detail="Email already taken")
 
         # 2. If password provided, update the hash logic
         # We need to manually handle this because the Repo expects model fields
         if user_in.password:
-            hashed_pw = get_password_hash(user_in.password)
+            hashed_pw = await get_password_hash_async(user_in.password)
             current_user.password_hash = hashed_pw
+            current_user.token_version = User.token_version + 1
             # Remove password from the pydantic model so it doesn't try to update a non-existent field
             # We will use exclude_unset in repo, so we just set the specific field on the model we want
             # But the repo iterates over user_in. So we must clear user_in.password to None
             user_in.password = None 
             
         # 3. Call Repo
-        return self.user_repo.update(current_user, user_in)
\ No newline at end of file
+        user = await self.user_repo.update(current_user, user_in)
+        principal_cache.invalidate(user.id)
+        token_versions.set(user.id, user.token_version)
+        return user
+
+    async def deactivate_user(self, user_id: UUID):
+        """
+        Deactivate a user account and end all of its sessions.
+
+        Bumping the token version in the same UPDATE invalidates every
+        token, including for the token-only permission guard.
+        """
+        user = await self.get_user_by_id(user_id)
+        user.is_active = False
+        user.token_version = User.token_version + 1
+        user = await self.user_repo.save(user)
+        principal_cache.invalidate(user.id)
+        token_versions.set(user.id, user.token_version)
+        return user
+
+    async def change_user_role(self, user_id: UUID, role_name: str):
+        """
+        Assign a different role to a user.
+
+        Existing tokens carry the old role's permission mask, so the token
+        version is bumped too and the user must log in again.
+        """
+        role = await role_catalog.get_by_name(self.db, role_name)
+        if not role:
+            raise HTTPException(status_code=404, detail="Role not found")
+
+        user = await self.get_user_by_id(user_id)
+        user.role_id = role.id
+        user.token_version = User.token_version + 1
+        user = await self.user_repo.save(user)
+        principal_cache.invalidate(user.id)
+        token_versions.set(user.id, user.token_version)
+        return user
\ No newline at end of file
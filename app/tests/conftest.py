@@ -1,21 +1,44 @@
+import os
 import pytest
 from typing import Generator
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+# The suite signs up and logs in far more often than the default per-IP
+# limits allow; app/tests/test_rate_limit.py covers the limiter itself.
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# The lifespan would poll the app database, not the test one
+os.environ.setdefault("ACCESS_DENYLIST_SYNC_SECONDS", "0")
 
 from app.db.base import Base
-from app.api.deps import get_db
+from app.api.deps import get_db, get_async_db
+from app.core.role_catalog import role_catalog
+from app.core.tracing import instrument_engine
 from app.main import app
 
 # Use SQLite for testing (fast, in-memory)
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine over the same file. NullPool: every TestClient runs its own
+# event loop, so connections must not outlive the loop that opened them.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# Same statement tracing as the app engines (app/db/session.py)
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
 @pytest.fixture(scope="module")
 def db_session():
     # Create the database tables
@@ -23,11 +46,16 @@ def db_session():
     db = TestingSessionLocal()
     
     # Pre-seed roles since they are required for user creation
+    from app.core.permissions import DEFAULT_ROLE_PERMISSIONS
     from app.db.models.role import Role
+    from app.repositories.role_repo import RoleRepository
     if not db.query(Role).first():
-        db.add(Role(name="user", description="Normal User"))
-        db.add(Role(name="admin", description="Admin User"))
-        db.commit()
+        role_repo = RoleRepository(db)
+        permissions = role_repo.sync_permission_catalog()
+        for name, description in (("user", "Normal User"), ("admin", "Admin User")):
+            role = Role(name=name, description=description)
+            db.add(role)
+            role_repo.set_permissions(role, [permissions[p] for p in DEFAULT_ROLE_PERMISSIONS[name]])
 
     try:
         yield db
@@ -45,6 +73,32 @@ def client(db_session) -> Generator:
         finally:
             pass
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as c:
+        # Startup preloaded the catalog from the app database, not the test one
+        role_catalog.invalidate()
         yield c
+
+def admin_headers(client: TestClient, db_session, username: str) -> dict:
+    """Sign up `username`, promote it to admin and return its auth headers"""
+    from app.db.models.role import Role
+    from app.db.models.user import User
+
+    password = "strongpassword123"
+    client.post(
+        "/api/v1/users/signup",
+        json={"username": username, "email": f"{username}@example.com", "password": password},
+    )
+    admin = db_session.query(User).filter(User.username == username).one()
+    admin.role_id = db_session.query(Role).filter(Role.name == "admin").one().id
+    db_session.commit()
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": password},
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
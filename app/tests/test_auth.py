@@ -13,6 +13,29 @@ def test_signup(client: TestClient):
     content = response.json()
     assert content["email"] == "test@example.com"
     assert "id" in content
+    assert content["role"]["name"] == "user"
+
+def test_signup_conflicts_map_to_400(client: TestClient, monkeypatch):
+    from app.repositories.user_repo import AsyncUserRepository
+
+    body = {"username": "dupuser", "email": "dup@example.com", "password": "strongpassword123"}
+    assert client.post("/api/v1/users/signup", json=body).status_code == 201
+
+    response = client.post("/api/v1/users/signup", json={**body, "username": "dupuser2"})
+    assert response.status_code == 400 and response.json()["detail"] == "Email already registered"
+
+    # A concurrent signup that passes the pre-check loses on the unique index
+    original = AsyncUserRepository.find_existing
+    calls = []
+    async def racing(self, usernames, emails):
+        calls.append(1)
+        if len(calls) == 1:
+            return set(), set()
+        return await original(self, usernames, emails)
+    monkeypatch.setattr(AsyncUserRepository, "find_existing", racing)
+    response = client.post("/api/v1/users/signup", json={**body, "email": "dup2@example.com"})
+    assert response.status_code == 400 and response.json()["detail"] == "Username already taken"
+    assert len(calls) == 2
 
 def test_login(client: TestClient):
     # Ensure user exists first
@@ -36,3 +59,310 @@ def test_login(client: TestClient):
     content = response.json()
     assert "access_token" in content
     assert content["token_type"] == "bearer"
+
+def test_refresh_rotates_and_rejects_reuse(client: TestClient):
+    client.post(
+        "/api/v1/users/signup",
+        json={
+            "username": "refreshuser",
+            "email": "refresh@example.com",
+            "password": "strongpassword123"
+        },
+    )
+    tokens = client.post(
+        "/api/v1/auth/login",
+        json={"username": "refreshuser", "password": "strongpassword123"},
+    ).json()
+
+    response = client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 200
+    rotated = response.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+
+    # The old refresh token is single use
+    response = client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+    )
+    assert response.status_code == 401
+
+    # The successor still works
+    response = client.post(
+        "/api/v1/auth/refresh", json={"refresh_token": rotated["refresh_token"]}
+    )
+    assert response.status_code == 200
+
+def test_login_lockout_skips_password_check(client: TestClient, monkeypatch):
+    import time
+    from app.core.login_throttle import login_throttle
+    from app.services import auth_service
+
+    monkeypatch.setattr(login_throttle, "base_lockout", 0.2)
+
+    client.post(
+        "/api/v1/users/signup",
+        json={
+            "username": "lockeduser",
+            "email": "locked@example.com",
+            "password": "strongpassword123"
+        },
+    )
+    for _ in range(login_throttle.user_free_attempts + 1):
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"username": "lockeduser", "password": "wrongpassword"},
+        )
+        assert response.status_code == 401
+
+    # Locked out: rejected before bcrypt, even with the right password
+    verify_password_async = auth_service.verify_password_async
+
+    async def fail_verify(*args):
+        raise AssertionError("password verified while locked out")
+    monkeypatch.setattr(auth_service, "verify_password_async", fail_verify)
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"username": "LockedUser", "password": "strongpassword123"},
+    )
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    monkeypatch.setattr(auth_service, "verify_password_async", verify_password_async)
+
+    # Once the lockout passes, a successful login clears the username's failures
+    time.sleep(0.25)
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"username": "lockeduser", "password": "strongpassword123"},
+    )
+    assert response.status_code == 200
+    assert login_throttle.check("lockeduser") == 0.0
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"username": "lockeduser", "password": "wrongpassword"},
+    )
+    assert response.status_code == 401
+
+def test_metrics_endpoint_reports_layers(client: TestClient):
+    client.post(
+        "/api/v1/users/signup",
+        json={
+            "username": "metricsuser",
+            "email": "metrics@example.com",
+            "password": "strongpassword123"
+        },
+    )
+    client.post(
+        "/api/v1/auth/login",
+        json={"username": "metricsuser", "password": "strongpassword123"},
+    )
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'sentinel_http_request_duration_seconds_count{method="POST",route="/api/v1/auth/login",status="200"}' in body
+    assert 'sentinel_password_hash_duration_seconds_count{operation="verify"}' in body
+    assert 'sentinel_jwt_duration_seconds_count{operation="encode"}' in body
+    assert 'sentinel_tokens_issued_total{type="refresh"}' in body
+    assert 'sentinel_db_pool_saturation{pool="async"}' in body
+
+def test_traced_login_has_layer_spans(client: TestClient, monkeypatch, tmp_path):
+    import json
+    from app.core.tracing import OTLPFileExporter, RingBufferExporter, tracer
+
+    client.post(
+        "/api/v1/users/signup",
+        json={
+            "username": "traceuser",
+            "email": "trace@example.com",
+            "password": "strongpassword123"
+        },
+    )
+    exporter = RingBufferExporter(maxlen=10)
+    otlp = OTLPFileExporter(str(tmp_path / "traces.jsonl"))
+    monkeypatch.setattr(tracer, "enabled", True)
+    monkeypatch.setattr(tracer, "exporters", [exporter, otlp])
+    monkeypatch.setattr(tracer, "server_timing", True)
+
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"username": "traceuser", "password": "strongpassword123"},
+    )
+    assert response.status_code == 200
+    assert "AuthService.login;dur=" in response.headers["server-timing"]
+
+    (trace,) = exporter.recent()
+    spans = {span["name"]: span for span in trace["spans"]}
+    root = spans["POST /api/v1/auth/login"]
+    assert root["parent_id"] is None
+    assert spans["AuthService.login"]["parent_id"] == root["span_id"]
+    for name in (
+        "AsyncUserRepository.get_login_row",
+        "security.verify_password",
+        "security.create_token",
+        "AsyncTokenRepository.create",
+        "db.query",
+    ):
+        assert name in spans
+
+    # Written by the exporter's thread; close() flushes it
+    otlp.close()
+    (line,) = (tmp_path / "traces.jsonl").read_text().splitlines()
+    otlp_spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert {span["traceId"] for span in otlp_spans} == {root["trace_id"]}
+    assert len(otlp_spans) == len(trace["spans"])
+
+def test_introspect_batch_resolves_users_in_one_query(client: TestClient, db_session, monkeypatch):
+    from app.core.principal import principal_cache
+    from app.repositories.user_repo import AsyncUserRepository
+    from app.tests.conftest import admin_headers
+
+    headers = admin_headers(client, db_session, "introspectadmin")
+    tokens = []
+    for i in range(3):
+        client.post(
+            "/api/v1/users/signup",
+            json={"username": f"gateway{i}", "email": f"gateway{i}@example.com", "password": "strongpassword123"},
+        )
+        tokens.append(client.post(
+            "/api/v1/auth/login",
+            json={"username": f"gateway{i}", "password": "strongpassword123"},
+        ).json())
+
+    calls = []
+    original = AsyncUserRepository.get_auth_rows
+    async def counting(self, user_ids, **kwargs):
+        calls.append(set(user_ids))
+        return await original(self, user_ids, **kwargs)
+    monkeypatch.setattr(AsyncUserRepository, "get_auth_rows", counting)
+    principal_cache.clear()
+
+    batch = [t["access_token"] for t in tokens] + [tokens[0]["access_token"], tokens[1]["refresh_token"], "garbage"]
+    response = client.post("/api/v1/auth/introspect", json={"tokens": batch}, headers=headers)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["active"] for r in results] == [True, True, True, True, False, False]
+    assert [r["user"]["username"] for r in results[:4]] == ["gateway0", "gateway1", "gateway2", "gateway0"]
+    assert results[0]["user"]["role"] == "user"
+    assert results[0]["claims"]["type"] == "access" and "exp" in results[0]["claims"]
+    assert len(calls) == 1 and len(calls[0]) == 3
+
+    # Second call: claims and principals are cached, no query at all
+    response = client.post("/api/v1/auth/introspect", json={"tokens": batch[:3]}, headers=headers)
+    assert all(r["active"] for r in response.json()["results"]) and len(calls) == 1
+
+    # Introspection is not open to ordinary users
+    user_headers = {"Authorization": f"Bearer {tokens[0]['access_token']}"}
+    assert client.post("/api/v1/auth/introspect", json={"tokens": batch}, headers=user_headers).status_code == 403
+
+def test_logout_revokes_access_and_refresh_tokens(client: TestClient, db_session):
+    from app.tests.conftest import admin_headers
+
+    client.post(
+        "/api/v1/users/signup",
+        json={"username": "logoutuser", "email": "logout@example.com", "password": "strongpassword123"},
+    )
+    tokens = client.post(
+        "/api/v1/auth/login", json={"username": "logoutuser", "password": "strongpassword123"}
+    ).json()
+    other = client.post(
+        "/api/v1/auth/login", json={"username": "logoutuser", "password": "strongpassword123"}
+    ).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    admin = admin_headers(client, db_session, "logoutadmin")
+    introspect = lambda: [r["active"] for r in client.post(
+        "/api/v1/auth/introspect", json={"tokens": [tokens["access_token"], other["access_token"]]}, headers=admin
+    ).json()["results"]]
+    assert introspect() == [True, True]
+
+    # Someone else's refresh token is refused and nothing is revoked
+    response = client.post("/api/v1/auth/logout", json={"refresh_token": "garbage"}, headers=headers)
+    assert response.status_code == 401
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+    response = client.post("/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers)
+    assert response.status_code == 204
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 401
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    # The session's refresh token is no bearer credential either
+    refresh_headers = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+    assert client.get("/api/v1/users/me", headers=refresh_headers).status_code == 403
+    assert client.get("/api/v1/users/me/sessions", headers=refresh_headers).status_code == 403
+    # Cached introspection claims don't outlive the revocation; the other session is untouched
+    assert introspect() == [False, True]
+    assert client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {other['access_token']}"}).status_code == 200
+
+def test_sessions_list_and_revoke(client: TestClient):
+    client.post(
+        "/api/v1/users/signup",
+        json={"username": "sessionuser", "email": "sessions@example.com", "password": "strongpassword123"},
+    )
+    def login(user_agent):
+        return client.post(
+            "/api/v1/auth/login",
+            json={"username": "sessionuser", "password": "strongpassword123"},
+            headers={"User-Agent": user_agent},
+        ).json()
+    laptop = login("Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0")
+    phone = login("Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 Version/17.0 Mobile Safari/604.1")
+    tablet = login("curl/8.4.0")
+    headers = lambda tokens: {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    # Rotation keeps the session (and its device), the new access token included
+    laptop = client.post("/api/v1/auth/refresh", json={"refresh_token": laptop["refresh_token"]}).json()
+    sessions = client.get("/api/v1/users/me/sessions", headers=headers(laptop)).json()
+    assert [s["device"] for s in sessions] == ["Firefox on Linux", "curl", "Safari on iOS"]
+    assert [s["current"] for s in sessions] == [True, False, False]
+
+    # Ending one session stops its access tokens at once; a second attempt is a 404
+    phone_id = sessions[2]["session_id"]
+    assert client.delete(f"/api/v1/users/me/sessions/{phone_id}", headers=headers(laptop)).status_code == 204
+    assert client.delete(f"/api/v1/users/me/sessions/{phone_id}", headers=headers(laptop)).status_code == 404
+    assert client.get("/api/v1/users/me", headers=headers(phone)).status_code == 401
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": phone["refresh_token"]}).status_code == 401
+
+    response = client.post("/api/v1/users/me/sessions/revoke-others", headers=headers(laptop))
+    assert response.json() == {"revoked": 1}
+    assert client.get("/api/v1/users/me", headers=headers(tablet)).status_code == 401
+    assert client.get("/api/v1/users/me", headers=headers(laptop)).status_code == 200
+    assert [s["current"] for s in client.get("/api/v1/users/me/sessions", headers=headers(laptop)).json()] == [True]
+
+def test_token_version_bump_invalidates_every_token(client: TestClient, db_session):
+    from app.tests.conftest import admin_headers
+
+    client.post(
+        "/api/v1/users/signup",
+        json={"username": "versionuser", "email": "version@example.com", "password": "strongpassword123"},
+    )
+    login = lambda password="strongpassword123": client.post(
+        "/api/v1/auth/login", json={"username": "versionuser", "password": password}
+    ).json()
+    headers = lambda tokens: {"Authorization": f"Bearer {tokens['access_token']}"}
+    admin = admin_headers(client, db_session, "versionadmin")
+    first, second = login(), login()
+
+    # Global logout: one version bump ends both sessions, refresh tokens included
+    assert client.post("/api/v1/auth/logout-all", headers=headers(first)).status_code == 204
+    for tokens in (first, second):
+        assert client.get("/api/v1/users/me", headers=headers(tokens)).status_code == 401
+        assert client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    results = client.post(
+        "/api/v1/auth/introspect", json={"tokens": [second["access_token"]]}, headers=admin
+    ).json()["results"]
+    assert [r["active"] for r in results] == [False]
+
+    # New tokens carry the new version; the old sessions are no longer listed
+    third = login()
+    assert len(client.get("/api/v1/users/me/sessions", headers=headers(third)).json()) == 1
+
+    # A password change invalidates the tokens issued before it
+    response = client.patch("/api/v1/users/me", json={"password": "newstrongpassword456"}, headers=headers(third))
+    assert response.status_code == 200
+    assert client.get("/api/v1/users/me", headers=headers(third)).status_code == 401
+    fourth = login("newstrongpassword456")
+    assert client.get("/api/v1/users/me/sessions", headers=headers(fourth)).status_code == 200
+
+    # Deactivation reaches the token-only permission guard too
+    user_id = client.get("/api/v1/users/me", headers=headers(fourth)).json()["id"]
+    assert client.post(f"/api/v1/admin/users/{user_id}/deactivate", headers=admin).status_code == 200
+    assert client.get("/api/v1/users/me/sessions", headers=headers(fourth)).status_code == 401
@@ -0,0 +1,63 @@
+import asyncio
+import os
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.core.hashing import HashingExecutor
+from app.core.security import get_password_hash, verify_password
+from app.utils.exceptions import HashingUnavailableError
+
+
+def test_hashing_pool_round_trip():
+    executor = HashingExecutor(workers=1, max_queue=4)
+
+    async def run():
+        hashed = await executor.run(get_password_hash, "strongpassword123")
+        return await executor.run(verify_password, "strongpassword123", hashed)
+
+    try:
+        assert asyncio.run(run()) is True
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["completed"] == 2
+    assert stats["in_flight"] == 0
+    assert stats["hash_seconds_max"] > 0
+
+
+def test_hashing_pool_rejects_when_queue_full():
+    executor = HashingExecutor(workers=1, max_queue=0, retry_after=3)
+
+    async def run():
+        slow = asyncio.ensure_future(executor.run(time.sleep, 0.5))
+        await asyncio.sleep(0)  # let the first job take the only slot
+        with pytest.raises(HashingUnavailableError) as exc_info:
+            await executor.run(time.sleep, 0)
+        await slow
+        return exc_info.value
+
+    try:
+        error = asyncio.run(run())
+    finally:
+        executor.shutdown()
+
+    assert error.retry_after == 3
+    assert executor.stats()["rejected"] == 1
+
+
+def test_hashing_pool_recovers_from_dead_worker():
+    executor = HashingExecutor(workers=1, max_queue=4)
+
+    async def run():
+        with pytest.raises(BrokenProcessPool):
+            await executor.run(os._exit, 1)
+        # The broken pool was dropped; the next call starts a fresh one
+        return await executor.run(get_password_hash, "strongpassword123")
+
+    try:
+        assert asyncio.run(run()).startswith("$2")
+    finally:
+        executor.shutdown()
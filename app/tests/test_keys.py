@@ -0,0 +1,68 @@
+import json
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import JWTError, jwt
+
+from app.core import security
+from app.core.config import settings
+from app.core.keys import KeyRing
+
+
+def _write_keys(directory):
+    ec_key = ec.generate_private_key(ec.SECP256R1())
+    (directory / "current.pem").write_bytes(ec_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    # Retired key: public half only, verifies but never signs
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    (directory / "retired.pem").write_bytes(rsa_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ))
+    return rsa_key
+
+
+def test_key_ring_signs_with_active_kid_and_rejects_unknown_keys(tmp_path, monkeypatch):
+    retired_private = _write_keys(tmp_path)
+    ring = KeyRing.from_directory(str(tmp_path))
+    monkeypatch.setattr(security, "key_ring", ring)
+
+    assert ring.active.kid == "current" and ring.get("retired").private is None
+    token = security.create_token({"sub": "u1"})
+    assert jwt.get_unverified_header(token) == {"alg": "ES256", "kid": "current", "typ": "JWT"}
+    assert security.decode_token(token)["sub"] == "u1"
+
+    # Tokens signed by a key that is still in the ring keep verifying
+    old = jwt.encode({"sub": "u2"}, retired_private, algorithm="RS256", headers={"kid": "retired"})
+    assert security.decode_token(old)["sub"] == "u2"
+
+    # Unknown kid, or a kid-less HMAC token unless the migration flag is on
+    forged = jwt.encode({"sub": "u3"}, retired_private, algorithm="RS256", headers={"kid": "other"})
+    legacy = jwt.encode({"sub": "u4"}, settings.SECRET_KEY, algorithm="HS256")
+    for bad in (forged, legacy):
+        with pytest.raises(JWTError):
+            security.decode_token(bad)
+    monkeypatch.setattr(settings, "JWT_ACCEPT_LEGACY_HS256", True)
+    assert security.decode_token(legacy)["sub"] == "u4"
+
+
+def test_jwks_endpoint_serves_public_keys_with_etag(client, tmp_path, monkeypatch):
+    from app import main
+
+    monkeypatch.setattr(main, "key_ring", None)  # HS256
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200 and response.json() == {"keys": []}
+
+    _write_keys(tmp_path)
+    monkeypatch.setattr(main, "key_ring", KeyRing.from_directory(str(tmp_path)))
+    response = client.get("/.well-known/jwks.json")
+    assert response.status_code == 200
+    keys = json.loads(response.content)["keys"]
+    assert [(k["kid"], k["alg"], k["kty"]) for k in keys] == [("current", "ES256", "EC"), ("retired", "RS256", "RSA")]
+    assert all("d" not in k for k in keys)  # no private material
+    assert "max-age" in response.headers["cache-control"]
+
+    etag = response.headers["etag"]
+    cached = client.get("/.well-known/jwks.json", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.headers["etag"] == etag
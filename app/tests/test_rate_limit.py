@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.middlewares.rate_limit import (
+    MemoryBackend,
+    RateLimiter,
+    RateLimitMiddleware,
+    RateLimitRule,
+    parse_rules,
+)
+
+
+def _hits(backend, rule, times, key="k"):
+    async def run():
+        return [await backend.hit(key, rule, now) for now in times]
+    return asyncio.run(run())
+
+
+def test_parse_rules():
+    rules = parse_rules("POST /login=5/60, GET /x=10/1:route:sliding_window")
+    assert rules == [
+        RateLimitRule("POST", "/login", 5, 60.0),
+        RateLimitRule("GET", "/x", 10, 1.0, "route", "sliding_window"),
+    ]
+    with pytest.raises(ValueError):
+        parse_rules("POST /login=5/60:nonsense")
+
+
+def test_token_bucket_allows_burst_then_refills():
+    rule = RateLimitRule("POST", "/login", 3, 3.0)
+    results = _hits(MemoryBackend(shards=4), rule, [0.0, 0.0, 0.0, 0.0, 1.0, 1.0])
+    assert [r == 0.0 for r in results] == [True, True, True, False, True, False]
+    assert results[3] == pytest.approx(1.0)
+
+
+def test_sliding_window_weights_previous_window():
+    rule = RateLimitRule("POST", "/login", 2, 10.0, algorithm="sliding_window")
+    # Two hits fill window [0, 10); at t=15 the previous window still counts half
+    results = _hits(MemoryBackend(shards=4), rule, [0.0, 1.0, 2.0, 15.0, 15.0, 21.0])
+    assert [r == 0.0 for r in results] == [True, True, False, True, False, True]
+
+
+def test_memory_backend_evicts_idle_keys():
+    backend = MemoryBackend(shards=1, max_keys_per_shard=2)
+    rule = RateLimitRule("POST", "/login", 1, 1.0)
+
+    async def run():
+        await backend.hit("a", rule, 0.0)
+        await backend.hit("b", rule, 0.0)
+        await backend.hit("c", rule, 10.0)
+    asyncio.run(run())
+    assert backend.stats()["keys"] == 1
+
+
+def test_middleware_returns_429_per_username():
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login(payload: dict):
+        return payload
+
+    limiter = RateLimiter(parse_rules("POST /login=2/60:user"))
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    client = TestClient(app)
+
+    for _ in range(2):
+        response = client.post("/login", json={"username": "alice"})
+        # The buffered body still reaches the endpoint
+        assert response.json() == {"username": "alice"}
+    response = client.post("/login", json={"username": "Alice"})
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert client.post("/login", json={"username": "bob"}).status_code == 200
+    assert limiter.stats()["limited"] == 1
+
+
+def test_client_ip_ignores_client_supplied_forwarded_entries():
+    scope = lambda *values: {
+        "headers": [(b"x-forwarded-for", value) for value in values],
+        "client": ("10.0.0.1", 1234),
+    }
+    # The client wrote "6.6.6.6"; the proxy appended the real peer
+    spoofed = scope(b"6.6.6.6, 203.0.113.7")
+    assert RateLimiter([], trust_forwarded=True).client_ip(spoofed) == "203.0.113.7"
+    # Two trusted proxies: the outer one appended the client, the inner one the outer proxy
+    chained = scope(b"6.6.6.6, 203.0.113.7", b"10.0.0.2")
+    assert RateLimiter([], trust_forwarded=True, trusted_proxies=2).client_ip(chained) == "203.0.113.7"
+    assert RateLimiter([], trust_forwarded=False).client_ip(spoofed) == "10.0.0.1"
@@ -0,0 +1,146 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.permissions import USERS_READ, USERS_WRITE, permission_registry
+from app.core.security import decode_token
+from app.tests.conftest import admin_headers
+
+
+def _login(client: TestClient, username: str) -> str:
+    client.post(
+        "/api/v1/users/signup",
+        json={"username": username, "email": f"{username}@example.com", "password": "strongpassword123"},
+    )
+    return client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": "strongpassword123"},
+    ).json()["access_token"]
+
+
+def test_permission_registry_round_trip():
+    mask = permission_registry.mask([USERS_READ, USERS_WRITE])
+    assert mask == 0b11
+    assert permission_registry.names(mask) == [USERS_READ, USERS_WRITE]
+    with pytest.raises(ValueError):
+        permission_registry.mask(["users:fly"])
+
+
+def test_admin_routes_authorize_from_token_claim(client: TestClient, db_session, monkeypatch):
+    from app.core.principal import principal_cache
+    from app.repositories.user_repo import AsyncUserRepository
+
+    headers = admin_headers(client, db_session, "permadmin")
+    assert decode_token(headers["Authorization"][7:])["perm"] == permission_registry.all_mask
+
+    user_token = _login(client, "permuser")
+    assert decode_token(user_token)["perm"] == 0
+    response = client.get("/api/v1/admin/stats", headers={"Authorization": f"Bearer {user_token}"})
+    assert response.status_code == 403
+
+    # No user or role is loaded to authorize
+    async def fail(*args, **kwargs):
+        raise AssertionError("authorization must not hit the database")
+    monkeypatch.setattr(AsyncUserRepository, "get_by_id", fail)
+    principal_cache.clear()
+    assert client.get("/api/v1/admin/stats", headers=headers).status_code == 200
+
+
+def test_role_change_revokes_existing_tokens(client: TestClient, db_session):
+    headers = admin_headers(client, db_session, "roleadmin")
+    demoted = admin_headers(client, db_session, "demotedadmin")
+    assert client.get("/api/v1/admin/stats", headers=demoted).status_code == 200
+
+    user_id = decode_token(demoted["Authorization"][7:])["sub"]
+    response = client.put(f"/api/v1/admin/users/{user_id}/role", json={"role": "user"}, headers=headers)
+    assert response.status_code == 200 and response.json()["role"]["name"] == "user"
+
+    # The old token still claims the admin mask; its version no longer matches
+    assert client.get("/api/v1/admin/stats", headers=demoted).status_code == 401
+    new_token = client.post(
+        "/api/v1/auth/login", json={"username": "demotedadmin", "password": "strongpassword123"}
+    ).json()["access_token"]
+    assert client.get("/api/v1/admin/stats", headers={"Authorization": f"Bearer {new_token}"}).status_code == 403
+
+
+def test_role_permission_grants_apply_to_new_tokens(client: TestClient, db_session):
+    headers = admin_headers(client, db_session, "grantadmin")
+    old_token = _login(client, "grantuser")
+
+    response = client.put(
+        "/api/v1/admin/roles/user/permissions", json={"permissions": [USERS_READ]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert response.json()["permissions"] == [USERS_READ]
+    try:
+        new_token = client.post(
+            "/api/v1/auth/login", json={"username": "grantuser", "password": "strongpassword123"}
+        ).json()["access_token"]
+        assert client.get("/api/v1/admin/users", headers={"Authorization": f"Bearer {new_token}"}).status_code == 200
+        # Tokens issued before the grant keep their old mask until they expire
+        assert client.get("/api/v1/admin/users", headers={"Authorization": f"Bearer {old_token}"}).status_code == 403
+        # Granting users:read does not grant users:write
+        response = client.post(
+            f"/api/v1/admin/users/{decode_token(new_token)['sub']}/deactivate",
+            headers={"Authorization": f"Bearer {new_token}"},
+        )
+        assert response.status_code == 403
+    finally:
+        client.put("/api/v1/admin/roles/user/permissions", json={"permissions": []}, headers=headers)
+
+    response = client.put(
+        "/api/v1/admin/roles/user/permissions", json={"permissions": ["users:fly"]}, headers=headers
+    )
+    assert response.status_code == 400
+    roles = {role["name"]: role for role in client.get("/api/v1/admin/roles", headers=headers).json()}
+    assert roles["user"]["permissions"] == [] and roles["admin"]["permission_mask"] == permission_registry.all_mask
+
+
+def test_removing_role_permission_revokes_existing_tokens(client: TestClient, db_session):
+    headers = admin_headers(client, db_session, "shrinkadmin")
+    client.put("/api/v1/admin/roles/user/permissions", json={"permissions": [USERS_READ]}, headers=headers)
+    try:
+        token = _login(client, "shrinkuser")
+        assert decode_token(token)["perm"] == permission_registry.mask([USERS_READ])
+        assert client.get("/api/v1/admin/users", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    finally:
+        response = client.put("/api/v1/admin/roles/user/permissions", json={"permissions": []}, headers=headers)
+    assert response.status_code == 200
+
+    # The old token still claims users:read; its version no longer matches
+    assert client.get("/api/v1/admin/users", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+    new_token = client.post(
+        "/api/v1/auth/login", json={"username": "shrinkuser", "password": "strongpassword123"}
+    ).json()["access_token"]
+    assert client.get("/api/v1/admin/users", headers={"Authorization": f"Bearer {new_token}"}).status_code == 403
+    # Admins keep their role and their tokens
+    assert client.get("/api/v1/admin/users", headers=headers).status_code == 200
+
+
+def test_hot_user_queries_resolve_roles_from_catalog(client: TestClient, db_session):
+    from sqlalchemy import event
+    from app.core.principal import principal_cache
+    from app.core.role_catalog import role_catalog
+    from app.tests.conftest import async_engine
+
+    token = _login(client, "cataloguser")
+    headers = {"Authorization": f"Bearer {token}"}
+    principal_cache.clear()
+
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        client.post("/api/v1/auth/login", json={"username": "cataloguser", "password": "strongpassword123"})
+        me = client.get("/api/v1/users/me", headers=headers).json()
+        # Lean load, then a full load of the same user in one session
+        principal_cache.clear()
+        updated = client.patch("/api/v1/users/me", json={"email": "catalog2@example.com"}, headers=headers)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert me["role"]["name"] == "user"
+    assert updated.status_code == 200 and updated.json()["role"]["name"] == "user"
+    user_loads = [s for s in statements if "FROM users" in s]
+    assert "roles" not in user_loads[0] and "roles" not in user_loads[1]
+    assert role_catalog.stats()["roles"] == 2
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from app.core.security import hash_token
+from app.core.tokens import generate_token_id
+from app.db.models.role import Role
+from app.db.models.user import User
+from app.repositories.token_repo import AsyncTokenRepository
+from app.tests.conftest import TestingAsyncSessionLocal
+
+
+def _seed_user(db_session, username: str):
+    role = db_session.query(Role).filter(Role.name == "user").first()
+    user = User(
+        username=username,
+        email=f"{username}@example.com",
+        password_hash="x",
+        role_id=role.id,
+    )
+    db_session.add(user)
+    db_session.commit()
+    return user.id
+
+
+def test_concurrent_rotation_has_exactly_one_winner(db_session):
+    user_id = _seed_user(db_session, "rotationuser")
+    role_id = db_session.query(Role.id).filter(Role.name == "user").scalar()
+    expires_at = datetime.utcnow() + timedelta(days=1)
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            jti = generate_token_id()
+            await AsyncTokenRepository(db).create(user_id, jti, hash_token(jti), expires_at)
+
+        async def rotate():
+            async with TestingAsyncSessionLocal() as db:
+                repo = AsyncTokenRepository(db)
+                row = await repo.get_for_rotation(jti)
+                assert row.user_id == user_id and row.role_id == role_id
+                successor = generate_token_id()
+                return await repo.rotate(row.id, user_id, successor, hash_token(successor), expires_at)
+
+        return await asyncio.gather(rotate(), rotate())
+
+    assert sorted(asyncio.run(run())) == [False, True]
+
+
+def test_purge_deletes_expired_and_long_revoked_tokens(db_session):
+    from app.db.models.refresh_token import RefreshToken
+    from app.services.token_purge_service import TokenPurgeService
+
+    user_id = _seed_user(db_session, "purgeuser")
+    now = datetime.utcnow()
+
+    def token(expires_at, revoked_at=None):
+        jti = generate_token_id()
+        return RefreshToken(
+            user_id=user_id,
+            jti=jti,
+            token_digest=hash_token(jti),
+            expires_at=expires_at,
+            is_revoked=revoked_at is not None,
+            revoked_at=revoked_at,
+        )
+
+    db_session.add_all(
+        [token(now - timedelta(days=1)) for _ in range(5)]
+        + [token(now + timedelta(days=1), revoked_at=now - timedelta(days=2)) for _ in range(3)]
+        + [token(now + timedelta(days=1), revoked_at=now)]
+        + [token(now + timedelta(days=1))]
+    )
+    db_session.commit()
+
+    purger = TokenPurgeService(
+        session_factory=TestingAsyncSessionLocal,
+        batch_size=2,
+        batch_sleep=0,
+        expired_grace=timedelta(0),
+        revoked_retention=timedelta(days=1),
+    )
+    report = asyncio.run(purger.purge_once())
+
+    assert report.expired_deleted == 5
+    assert report.revoked_deleted == 3
+    assert report.lag_seconds == 0
+    remaining = db_session.query(RefreshToken).filter(RefreshToken.user_id == user_id).count()
+    assert remaining == 2
+
+
+def test_partition_month_boundaries():
+    from app.db.partitions import month_start, next_month, partition_name
+
+    start = month_start(datetime(2026, 12, 31, 23, 59, 59))
+    assert start == datetime(2026, 12, 1)
+    assert next_month(start) == datetime(2027, 1, 1)
+    assert partition_name(start) == "refresh_tokens_p2026_12"
+
+
+def test_refresh_token_exp_matches_stored_expiry():
+    from app.core.security import decode_token
+    from app.core.tokens import create_refresh_token, refresh_token_expires_at
+
+    expires_at = refresh_token_expires_at()
+    token = create_refresh_token("user-id", generate_token_id(), expires_at=expires_at)
+    assert datetime.utcfromtimestamp(decode_token(token)["exp"]) == expires_at
+
+
+def test_denylist_syncs_incrementally_and_prunes(db_session):
+    from app.core.denylist import AccessTokenDenylist
+    from app.db.models.revoked_access_token import RevokedAccessToken
+    from app.services.denylist_service import DenylistSyncService
+
+    now = datetime.utcnow()
+    db_session.add_all(
+        [RevokedAccessToken(jti=f"live{i}", expires_at=now + timedelta(minutes=5), revoked_at=now) for i in range(5)]
+        + [RevokedAccessToken(jti="gone", expires_at=now - timedelta(minutes=1), revoked_at=now)]
+    )
+    db_session.commit()
+
+    # Another worker's view: capacity 2 forces the filter to grow
+    denylist = AccessTokenDenylist(capacity=2, error_rate=0.01)
+    sync = DenylistSyncService(denylist=denylist, session_factory=TestingAsyncSessionLocal, batch_size=2)
+    assert asyncio.run(sync.sync_once()) == 5
+    assert all(denylist.is_revoked(f"live{i}") for i in range(5))
+    assert not denylist.is_revoked("gone") and not denylist.is_revoked("never")
+
+    # A later revocation is picked up; rows already seen are not re-added
+    db_session.add(RevokedAccessToken(jti="late", expires_at=now + timedelta(minutes=5), revoked_at=datetime.utcnow()))
+    db_session.commit()
+    assert asyncio.run(sync.sync_once()) == 1 and denylist.is_revoked("late")
+
+    denylist.add("stale", time.time() - 1)
+    assert denylist.prune() == 1 and len(denylist) == 6
+    # One stale entry out of seven is below the rebuild share
+    assert denylist.stats()["filter_stale"] == 1 and not denylist.is_revoked("stale")
+    denylist.add_many((f"old{i}", time.time() - 1) for i in range(6))
+    assert denylist.prune() == 6 and denylist.stats()["filter_stale"] == 0
+
+
+def test_hot_path_lookups_return_rows_from_one_cached_statement(db_session):
+    from sqlalchemy import event
+    from app.repositories.user_repo import AsyncUserRepository
+    from app.tests.conftest import async_engine
+
+    user_id = _seed_user(db_session, "hotpathuser")
+    expires_at = (datetime.utcnow() + timedelta(days=1)).replace(microsecond=0)
+    statements = []
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    async def run():
+        async with TestingAsyncSessionLocal() as db:
+            jti = generate_token_id()
+            await AsyncTokenRepository(db).create(user_id, jti, hash_token(jti), expires_at)
+        event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with TestingAsyncSessionLocal() as db:
+                users, tokens = AsyncUserRepository(db), AsyncTokenRepository(db)
+                rows = [await users.get_auth_row(user_id) for _ in range(2)]
+                login = await users.get_login_row("hotpathuser")
+                rotation = await tokens.get_for_rotation(jti, expires_at)
+                # Plain rows: nothing entered the session's identity map
+                assert len(db.identity_map) == 0
+                return rows, login, rotation
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    rows, login, rotation = asyncio.run(run())
+    assert rows[0] == rows[1] and rows[0].id == user_id and rows[0].token_version == 0
+    assert login.password_hash == "x" and rotation.user_id == user_id
+    # Same SQL text every call (what lets psycopg keep it prepared)
+    assert statements[0] == statements[1] and len(statements) == 4
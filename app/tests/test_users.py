@@ -1,5 +1,12 @@
+import csv
+import io
+import json
+
 from fastapi.testclient import TestClient
 
+from app.db.models.user import User
+from app.tests.conftest import admin_headers
+
 def test_get_users_me_unauthorized(client: TestClient):
     """Test that you cannot access /me without a token"""
     response = client.get("/api/v1/users/me")
@@ -29,3 +36,109 @@ def test_get_users_me_authorized(client: TestClient):
     )
     assert response.status_code == 200
     assert response.json()["username"] == username
+
+def test_update_me_invalidates_cached_principal(client: TestClient):
+    """Test that /me reflects an update even though the principal is cached"""
+    username = "cacheuser"
+    password = "strongpassword123"
+    client.post(
+        "/api/v1/users/signup",
+        json={"username": username, "email": "cache@example.com", "password": password},
+    )
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"username": username, "password": password},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Prime the cache
+    assert client.get("/api/v1/users/me", headers=headers).json()["email"] == "cache@example.com"
+
+    response = client.patch(
+        "/api/v1/users/me", headers=headers, json={"email": "cache2@example.com"}
+    )
+    assert response.status_code == 200
+
+    assert client.get("/api/v1/users/me", headers=headers).json()["email"] == "cache2@example.com"
+
+def test_admin_users_cursor_pagination(client: TestClient, db_session):
+    """Test that following next_cursor walks every user exactly once"""
+    for i in range(4):
+        client.post(
+            "/api/v1/users/signup",
+            json={"username": f"pageuser{i}", "email": f"page{i}@example.com", "password": "strongpassword123"},
+        )
+    headers = admin_headers(client, db_session, "pageadmin")
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = client.get("/api/v1/admin/users", headers=headers, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(user["id"] for user in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params = {"limit": 2, "cursor": page["next_cursor"]}
+
+    assert len(seen) == len(set(seen)) == db_session.query(User).count()
+
+    response = client.get("/api/v1/admin/users", headers=headers, params={"cursor": "garbage"})
+    assert response.status_code == 400
+    response = client.get("/api/v1/admin/users", headers=headers, params={"skip": 5000})
+    assert response.status_code == 422
+
+def test_admin_export_streams_all_users(client: TestClient, db_session):
+    """Test that NDJSON and CSV exports contain every user"""
+    headers = admin_headers(client, db_session, "exportadmin")
+    total = db_session.query(User).count()
+
+    response = client.get("/api/v1/admin/users/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == total
+    assert {"username": "exportadmin", "role": "admin", "is_active": True}.items() <= next(
+        row for row in rows if row["username"] == "exportadmin"
+    ).items()
+
+    response = client.get("/api/v1/admin/users/export", headers=headers, params={"format": "csv"})
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == total
+    assert set(rows[0]) == {"id", "username", "email", "role", "is_active", "created_at"}
+
+def test_admin_import_reports_per_row_errors(client: TestClient, db_session):
+    """Test that a bulk import creates valid rows and reports the rest"""
+    from app.core.security import get_password_hash, verify_password
+
+    headers = admin_headers(client, db_session, "importadmin")
+    prehashed = get_password_hash("prehashed123")
+    body = "\n".join(json.dumps(row) for row in [
+        {"username": "imported1", "email": "imported1@example.com", "password": "strongpassword123"},
+        {"username": "imported2", "email": "imported2@example.com", "password_hash": prehashed},
+        {"username": "imported1", "email": "other@example.com", "password": "strongpassword123"},
+        {"username": "importadmin", "email": "new@example.com", "password": "strongpassword123"},
+        {"username": "imported3", "email": "not-an-email", "password": "strongpassword123"},
+        {"username": "imported4", "email": "imported4@example.com"},
+    ]) + "\n{not json"
+
+    response = client.post("/api/v1/admin/users/import", headers=headers, content=body)
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["created"], report["failed"]) == (7, 2, 5)
+    assert [error["line"] for error in report["errors"]] == [3, 4, 5, 6, 7]
+
+    imported = db_session.query(User).filter(User.username == "imported2").one()
+    assert verify_password("prehashed123", imported.password_hash)
+    login = client.post(
+        "/api/v1/auth/login",
+        json={"username": "imported1", "password": "strongpassword123"},
+    )
+    assert login.status_code == 200
+
+    csv_body = "username,email,password,role\nimported5,imported5@example.com,strongpassword123,admin\n"
+    response = client.post(
+        "/api/v1/admin/users/import", headers=headers, content=csv_body, params={"format": "csv"}
+    )
+    assert response.json()["created"] == 1
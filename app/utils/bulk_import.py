@@ -0,0 +1,44 @@
+"""
+Bulk import parsers.
+
+Split an NDJSON or CSV upload into (line number, record) pairs. A line
+that cannot be parsed yields `None` as its record so the caller can
+report it and keep going.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+ParsedRecord = Tuple[int, Optional[Dict[str, Any]]]
+
+
+def parse_ndjson(text: str) -> Iterator[ParsedRecord]:
+    """Parse newline-delimited JSON objects; blank lines are skipped."""
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, None
+            continue
+        yield line_no, record if isinstance(record, dict) else None
+
+
+def parse_csv(text: str) -> Iterator[ParsedRecord]:
+    """Parse CSV with a header row; empty cells are treated as missing."""
+    reader = csv.DictReader(io.StringIO(text))
+    for row in reader:
+        if None in row:
+            # More cells than header columns
+            yield reader.line_num, None
+            continue
+        yield reader.line_num, {key: value for key, value in row.items() if value not in ("", None)}
+
+
+PARSERS = {
+    "ndjson": parse_ndjson,
+    "csv": parse_csv,
+}
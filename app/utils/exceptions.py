@@ -0,0 +1,19 @@
+"""
+Application Exceptions.
+
+Domain errors raised below the API layer. They are translated into
+HTTP responses by the exception handlers registered in app/main.py.
+"""
+
+
+class HashingUnavailableError(Exception):
+    """
+    Raised when the password hashing pool is saturated.
+
+    Callers should back off and retry after `retry_after` seconds
+    instead of queueing behind an unbounded backlog of bcrypt jobs.
+    """
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Password hashing capacity exhausted")
+        self.retry_after = retry_after
@@ -0,0 +1,67 @@
+"""
+Bulk export serializers.
+
+Turn batches of plain row tuples into NDJSON or CSV text. Rows are
+formatted directly (no ORM entities, no Pydantic validation) so a full
+dump costs one pass over the result set.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+# Columns of a user export row, in output order
+USER_EXPORT_COLUMNS = ("id", "username", "email", "role", "is_active", "created_at")
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _converter(value: Any) -> Optional[Callable[[Any], Any]]:
+    """Pick how a column is rendered: UUIDs/datetimes to strings, scalars as-is."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return None
+    if hasattr(value, "isoformat"):
+        return lambda v: v.isoformat() if v is not None else None
+    return lambda v: str(v) if v is not None else None
+
+
+def _plain_rows(rows: Sequence[Sequence[Any]]) -> Iterable[Sequence[Any]]:
+    """
+    Convert rows to JSON/CSV-ready values.
+
+    Converters are chosen once per batch from the first row (a batch comes
+    from one SELECT, so column types don't change) instead of type-checking
+    every value.
+    """
+    if not rows:
+        return rows
+    converters = [(i, fn) for i, fn in enumerate(map(_converter, rows[0])) if fn is not None]
+    if not converters:
+        return rows
+    plain = []
+    for row in rows:
+        row = list(row)
+        for i, fn in converters:
+            row[i] = fn(row[i])
+        plain.append(row)
+    return plain
+
+
+def rows_to_ndjson(rows: Sequence[Sequence[Any]], columns: Sequence[str] = USER_EXPORT_COLUMNS) -> str:
+    """Serialize rows as newline-delimited JSON objects."""
+    dumps = json.dumps
+    return "".join(dumps(dict(zip(columns, row))) + "\n" for row in _plain_rows(rows))
+
+
+def rows_to_csv(rows: Sequence[Sequence[Any]], header: Sequence[str] = ()) -> str:
+    """Serialize rows as CSV, preceded by `header` when given."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(header)
+    writer.writerows(_plain_rows(rows))
+    return buffer.getvalue()
@@ -0,0 +1,64 @@
+"""
+User-Agent helpers for session metadata.
+
+Turns a User-Agent header into a short label ("Firefox on Linux") for
+session listings. Deliberately coarse: it only has to help a user tell
+their own devices apart, so a first-match table of common tokens is
+enough and no parser dependency is needed.
+"""
+
+import re
+from typing import Optional, Tuple
+
+USER_AGENT_MAX_LENGTH = 255
+
+# First match wins: order matters where UAs embed each other's tokens
+# (Edge and Opera contain "Chrome", Chrome contains "Safari").
+_BROWSERS: Tuple[Tuple[str, str], ...] = (
+    (r"Edg(e|A|iOS)?/", "Edge"),
+    (r"OPR/|Opera", "Opera"),
+    (r"Firefox/|FxiOS/", "Firefox"),
+    (r"Chrome/|CriOS/", "Chrome"),
+    (r"Safari/", "Safari"),
+    (r"curl/", "curl"),
+    (r"python-requests/|python-httpx/|aiohttp/", "Python"),
+    (r"okhttp/", "Android app"),
+)
+_PLATFORMS: Tuple[Tuple[str, str], ...] = (
+    (r"iPhone|iPad|iPod", "iOS"),
+    (r"Android", "Android"),
+    (r"Windows", "Windows"),
+    (r"Mac OS X|Macintosh", "macOS"),
+    (r"CrOS", "ChromeOS"),
+    (r"Linux", "Linux"),
+)
+_BROWSER_PATTERNS = tuple((re.compile(pattern), name) for pattern, name in _BROWSERS)
+_PLATFORM_PATTERNS = tuple((re.compile(pattern), name) for pattern, name in _PLATFORMS)
+
+
+def _first_match(user_agent: str, patterns) -> Optional[str]:
+    for pattern, name in patterns:
+        if pattern.search(user_agent):
+            return name
+    return None
+
+
+def describe_user_agent(user_agent: Optional[str]) -> Optional[str]:
+    """
+    Short device label for a User-Agent, e.g. "Chrome on Windows".
+
+    Returns:
+        The label, or None if nothing recognisable was found
+    """
+    if not user_agent:
+        return None
+    browser = _first_match(user_agent, _BROWSER_PATTERNS)
+    platform = _first_match(user_agent, _PLATFORM_PATTERNS)
+    if browser and platform:
+        return f"{browser} on {platform}"
+    return browser or platform
+
+
+def truncate_user_agent(user_agent: Optional[str]) -> Optional[str]:
+    """User-Agent clipped to the stored column length."""
+    return user_agent[:USER_AGENT_MAX_LENGTH] if user_agent else None
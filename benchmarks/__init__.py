@@ -0,0 +1,12 @@
+"""
+Benchmarks package.
+
+Latency/throughput benchmarks for SentinelAuth hot paths.
+Run any module from the repo root, e.g.:
+
+    python -m benchmarks.bench_token_rotation
+
+By default each benchmark uses a throwaway SQLite database. Set
+BENCH_DATABASE_URL to a (disposable!) PostgreSQL database to measure
+against the production dialect; its tables are dropped and recreated.
+"""
@@ -0,0 +1,95 @@
+"""
+Auth hot-path lookups: ORM entities vs prebuilt Core statements.
+
+orm:  the entity loads these paths used (AsyncUserRepository.get_by_id /
+      get_by_username, RefreshToken with its user joined): statement
+      built per call, entity construction, identity map
+core: AsyncUserRepository.get_auth_row / get_login_row and
+      AsyncTokenRepository.get_for_rotation: one statement object per
+      query built at import, plain rows
+
+Each case runs in a fresh session per call, like a request. Besides
+wall time it prints process CPU per call (the event loop plus the
+driver thread), which is what the Core path saves; on PostgreSQL with
+psycopg the prebuilt statements are also prepared server-side
+(DB_PREPARE_THRESHOLD).
+
+    python -m benchmarks.bench_hot_queries [iterations]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from benchmarks.harness import create_bench_database, measure_async, report
+
+from app.core.security import hash_token
+from app.db.models.refresh_token import RefreshToken
+from app.db.models.role import Role
+from app.db.models.user import User
+from app.repositories.token_repo import AsyncTokenRepository
+from app.repositories.user_repo import AsyncUserRepository
+
+USERS = 1000
+
+
+async def measure_cpu(name, fn, iterations):
+    """measure_async, plus process CPU microseconds per call."""
+    cpu = time.process_time()
+    result = await measure_async(name, fn, iterations, warmup=50)
+    return result, (time.process_time() - cpu) / (iterations + 50) * 1e6
+
+
+async def main(iterations: int) -> None:
+    SessionFactory, async_engine, AsyncSessionFactory = create_bench_database()
+    expires_at = (datetime.utcnow() + timedelta(days=7)).replace(microsecond=0)
+    with SessionFactory() as db:
+        role_id = db.query(Role).filter(Role.name == "user").one().id
+        db.execute(insert(User), [
+            {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x", "role_id": role_id}
+            for i in range(USERS)
+        ])
+        users = db.execute(select(User.id, User.username)).all()
+        db.execute(insert(RefreshToken), [
+            {"user_id": user_id, "jti": f"jti{i}", "token_digest": hash_token(f"jti{i}"), "expires_at": expires_at}
+            for i, (user_id, _) in enumerate(users)
+        ])
+        db.commit()
+
+    def session_call(repo_class, call):
+        async def run(i: int) -> None:
+            async with AsyncSessionFactory() as db:
+                assert await call(repo_class(db), i % USERS) is not None
+        return run
+
+    pairs = [
+        (
+            ("orm: get_by_id (entity)", session_call(AsyncUserRepository, lambda r, i: r.get_by_id(users[i].id))),
+            ("core: get_auth_row", session_call(AsyncUserRepository, lambda r, i: r.get_auth_row(users[i].id))),
+        ),
+        (
+            ("orm: get_by_username (entity)", session_call(AsyncUserRepository, lambda r, i: r.get_by_username(users[i].username))),
+            ("core: get_login_row", session_call(AsyncUserRepository, lambda r, i: r.get_login_row(users[i].username))),
+        ),
+        (
+            ("orm: get_by_jti (token + joined user)", session_call(AsyncTokenRepository, lambda r, i: r.get_by_jti(f"jti{i}", expires_at))),
+            ("core: get_for_rotation", session_call(AsyncTokenRepository, lambda r, i: r.get_for_rotation(f"jti{i}", expires_at))),
+        ),
+    ]
+    for pair in pairs:
+        results = []
+        cpu = {}
+        for name, fn in pair:
+            result, cpu[name] = await measure_cpu(name, fn, iterations)
+            results.append(result)
+        report(results, baseline=results[0].name)
+        orm, core = (name for name, _ in pair)
+        print(f"cpu/call: {cpu[orm]:.0f} us -> {cpu[core]:.0f} us ({cpu[orm] - cpu[core]:.0f} us saved)\n")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 3000))
@@ -0,0 +1,68 @@
+"""
+Gateway token validation: one get_current_user-style check per token vs
+one batch introspection call for the same tokens.
+
+per-token: decode_token + get_by_id for each token (cold principal cache)
+batch (cold): AuthService.introspect with both caches cleared (one IN query)
+batch (warm): AuthService.introspect with cached claims and principals
+
+    python -m benchmarks.bench_introspection [batch] [iterations]
+"""
+
+import asyncio
+import sys
+from uuid import UUID
+
+from sqlalchemy import insert, select
+
+from benchmarks.harness import create_bench_database, measure_async, report
+
+from app.core.principal import access_claims_cache, principal_cache
+from app.core.security import decode_token
+from app.core.tokens import create_access_token
+from app.db.models.role import Role
+from app.db.models.user import User
+from app.repositories.user_repo import AsyncUserRepository
+from app.services.auth_service import AuthService
+
+
+async def main(batch: int, iterations: int) -> None:
+    SessionFactory, async_engine, AsyncSessionFactory = create_bench_database()
+    with SessionFactory() as db:
+        role_id = db.query(Role).filter(Role.name == "user").one().id
+        db.execute(insert(User), [
+            {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x", "role_id": role_id}
+            for i in range(batch)
+        ])
+        db.commit()
+        user_ids = db.scalars(select(User.id)).all()
+    tokens = [create_access_token(user_id=str(user_id), role="user") for user_id in user_ids]
+
+    async def per_token(_: int) -> None:
+        async with AsyncSessionFactory() as db:
+            repo = AsyncUserRepository(db)
+            for token in tokens:
+                assert await repo.get_by_id(UUID(decode_token(token)["sub"]))
+
+    async def batch_cold(_: int) -> None:
+        access_claims_cache.clear()
+        principal_cache.clear()
+        async with AsyncSessionFactory() as db:
+            assert all(result.active for result in await AuthService(db).introspect(tokens))
+
+    async def batch_warm(_: int) -> None:
+        async with AsyncSessionFactory() as db:
+            assert all(result.active for result in await AuthService(db).introspect(tokens))
+
+    results = [
+        await measure_async(f"per-token x{batch}", per_token, iterations, warmup=1),
+        await measure_async(f"introspect x{batch} (cold)", batch_cold, iterations, warmup=1),
+        await measure_async(f"introspect x{batch} (warm)", batch_warm, iterations, warmup=1),
+    ]
+    await async_engine.dispose()
+    report(results, baseline=results[0].name)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*(args + [500, 20][len(args):])))
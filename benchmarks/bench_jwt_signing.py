@@ -0,0 +1,57 @@
+"""
+JWT sign/verify cost per algorithm, with key objects parsed once (key
+ring) versus a PEM parsed on every call.
+
+    python -m benchmarks.bench_jwt_signing [iterations]
+"""
+
+import sys
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwt
+
+from benchmarks.harness import measure, report
+
+from app.core.keys import SigningKey
+
+CLAIMS = {"sub": "2b1f5c1e-7d7a-4b47-9c61-0f5e6f1d2a3b", "type": "access", "role": "user", "exp": 4102444800}
+
+
+def _pem(private_key) -> bytes:
+    return private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+
+
+def main(iterations: int) -> None:
+    secret = "benchmark-secret"
+    keys = {
+        "RS256": _pem(rsa.generate_private_key(public_exponent=65537, key_size=3072)),
+        "ES256": _pem(ec.generate_private_key(ec.SECP256R1())),
+    }
+
+    hs_token = jwt.encode(CLAIMS, secret, algorithm="HS256")
+    results = [
+        measure("HS256 encode", lambda i: jwt.encode(CLAIMS, secret, algorithm="HS256"), iterations),
+        measure("HS256 decode", lambda i: jwt.decode(hs_token, secret, algorithms=["HS256"]), iterations),
+    ]
+    for algorithm, pem in keys.items():
+        key = SigningKey.from_pem("bench", pem)
+        token = jwt.encode(CLAIMS, key.private, algorithm=algorithm, headers={"kid": key.kid})
+        public_pem = key.public.to_pem()
+        results += [
+            measure(f"{algorithm} encode (key ring)",
+                    lambda i: jwt.encode(CLAIMS, key.private, algorithm=algorithm), iterations),
+            measure(f"{algorithm} encode (PEM per call)",
+                    lambda i: jwt.encode(CLAIMS, pem, algorithm=algorithm), iterations),
+            measure(f"{algorithm} decode (key ring)",
+                    lambda i: jwt.decode(token, key.public, algorithms=[algorithm]), iterations),
+            measure(f"{algorithm} decode (PEM per call)",
+                    lambda i: jwt.decode(token, public_pem, algorithms=[algorithm]), iterations),
+        ]
+    report(results)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,64 @@
+"""
+Rate limiter middleware overhead per request, in microseconds.
+
+Calls RateLimitMiddleware directly around a no-op ASGI app (no server,
+no HTTP parsing) and subtracts the cost of calling the app bare.
+
+    python -m benchmarks.bench_rate_limit [iterations]
+"""
+
+import asyncio
+import statistics
+import sys
+
+from benchmarks.harness import measure_async, report
+
+from app.middlewares.rate_limit import RateLimiter, RateLimitMiddleware, parse_rules
+
+
+async def noop_app(scope, receive, send):
+    pass
+
+
+async def receive():
+    return {"type": "http.request", "body": b'{"username": "bench"}', "more_body": False}
+
+
+async def send(message):
+    pass
+
+
+def scope(path: str, client: str = "10.0.0.1"):
+    return {"type": "http", "method": "POST", "path": path, "headers": [], "client": (client, 1234)}
+
+
+async def main(iterations: int) -> None:
+    limiter = RateLimiter(parse_rules(
+        # Limits high enough that every benchmark request is allowed
+        "POST /bucket=1000000000/1:ip,"
+        "POST /window=1000000000/1:ip:sliding_window,"
+        "POST /user=1000000000/1:user"
+    ))
+    middleware = RateLimitMiddleware(noop_app, limiter)
+    unlimited, bucket, window, user = scope("/other"), scope("/bucket"), scope("/window"), scope("/user")
+    many_ips = [scope("/bucket", f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}") for i in range(100000)]
+
+    cases = [
+        ("bare app", lambda i: noop_app(bucket, receive, send)),
+        ("no rule for route", lambda i: middleware(unlimited, receive, send)),
+        ("token bucket, one ip", lambda i: middleware(bucket, receive, send)),
+        ("sliding window, one ip", lambda i: middleware(window, receive, send)),
+        ("token bucket, 100k ips", lambda i: middleware(many_ips[i % len(many_ips)], receive, send)),
+        ("token bucket, username from body", lambda i: middleware(user, receive, send)),
+    ]
+    results = [await measure_async(name, fn, iterations, warmup=1000) for name, fn in cases]
+    report(results)
+
+    bare = statistics.fmean(results[0].samples)
+    for result in results[1:]:
+        overhead = (statistics.fmean(result.samples) - bare) * 1e6
+        print(f"{result.name}: {overhead:.2f} us overhead")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000))
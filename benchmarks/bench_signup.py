@@ -0,0 +1,67 @@
+"""
+Signup database path: the old register sequence vs UserService.register_user.
+
+bcrypt is excluded (both cases use a pre-computed hash) so the numbers
+isolate the round trips, which is what changed; with bcrypt included
+signups/sec is bounded by the hashing pool either way.
+
+before: get_by_email -> get_by_username -> role get_by_name -> ORM add,
+        commit, refresh (users joined to roles)
+after:  one find_existing query -> role catalog -> INSERT ... RETURNING, commit
+
+    python -m benchmarks.bench_signup [iterations]
+"""
+
+import asyncio
+import sys
+
+from sqlalchemy import select
+
+from benchmarks.harness import create_bench_database, measure_async, report
+
+from app.core.security import get_password_hash
+from app.db.models.role import Role
+from app.db.models.user import User
+from app.schemas.user import UserCreate
+from app.services import user_service
+from app.services.user_service import UserService
+
+PASSWORD = "benchmark-password"
+
+
+async def main(iterations: int) -> None:
+    SessionFactory, async_engine, AsyncSessionFactory = create_bench_database()
+    password_hash = get_password_hash(PASSWORD)
+
+    async def precomputed_hash(password: str) -> str:
+        return password_hash
+
+    def user_in(prefix: str, i: int) -> UserCreate:
+        return UserCreate(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", password=PASSWORD)
+
+    async def before(i: int) -> None:
+        new = user_in("before", i)
+        async with AsyncSessionFactory() as db:
+            assert (await db.scalars(select(User).where(User.email == new.email))).first() is None
+            assert (await db.scalars(select(User).where(User.username == new.username))).first() is None
+            role = (await db.scalars(select(Role).where(Role.name == "user"))).first()
+            user = User(username=new.username, email=new.email, password_hash=password_hash, role_id=role.id)
+            db.add(user)
+            await db.commit()
+            await db.refresh(user)
+
+    async def after(i: int) -> None:
+        async with AsyncSessionFactory() as db:
+            await UserService(db).register_user(user_in("after", i))
+
+    user_service.get_password_hash_async = precomputed_hash
+    results = [
+        await measure_async("before: 3 lookups + insert + refresh", before, iterations),
+        await measure_async("after: 1 lookup + INSERT RETURNING", after, iterations),
+    ]
+    await async_engine.dispose()
+    report(results, baseline=results[0].name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000))
@@ -0,0 +1,76 @@
+"""
+Refresh-token rotation: legacy multi-commit path vs atomic rotate().
+
+legacy: user get_by_id -> token get_by_jti (ORM, joined user+role) ->
+        revoke (commit + refresh) -> create (commit + refresh)
+atomic: get_for_rotation (one row query) -> rotate (UPDATE ... RETURNING
+        + INSERT, one commit; a single statement on PostgreSQL)
+
+Both run one session per rotation, like a request would.
+
+    python -m benchmarks.bench_token_rotation [iterations]
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.harness import create_bench_database, measure_async, report
+
+from app.core.security import hash_token, verify_token_digest
+from app.core.tokens import generate_token_id
+from app.db.models.role import Role
+from app.db.models.user import User
+from app.repositories.token_repo import AsyncTokenRepository
+from app.repositories.user_repo import AsyncUserRepository
+
+
+async def main(iterations: int) -> None:
+    SessionFactory, async_engine, AsyncSessionFactory = create_bench_database()
+    with SessionFactory() as db:
+        role = db.query(Role).filter(Role.name == "user").one()
+        user = User(username="bench", email="bench@example.com", password_hash="x", role_id=role.id)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    expires_at = datetime.utcnow() + timedelta(days=7)
+
+    async def issue() -> str:
+        jti = generate_token_id()
+        async with AsyncSessionFactory() as db:
+            await AsyncTokenRepository(db).create(user_id, jti, hash_token(jti), expires_at)
+        return jti
+
+    state = {"jti": await issue()}
+
+    async def legacy(_: int) -> None:
+        async with AsyncSessionFactory() as db:
+            token_repo = AsyncTokenRepository(db)
+            user = await AsyncUserRepository(db).get_by_id(user_id)
+            token = await token_repo.get_by_jti(state["jti"])
+            assert user and token and verify_token_digest(state["jti"], token.token_digest)
+            await token_repo.revoke(token)
+            new_jti = generate_token_id()
+            await token_repo.create(user_id, new_jti, hash_token(new_jti), expires_at)
+            state["jti"] = new_jti
+
+    async def atomic(_: int) -> None:
+        async with AsyncSessionFactory() as db:
+            token_repo = AsyncTokenRepository(db)
+            row = await token_repo.get_for_rotation(state["jti"])
+            assert row and verify_token_digest(state["jti"], row.token_digest)
+            new_jti = generate_token_id()
+            assert await token_repo.rotate(row.id, user_id, new_jti, hash_token(new_jti), expires_at)
+            state["jti"] = new_jti
+
+    results = [
+        await measure_async("rotation: legacy (4 steps, 2 commits)", legacy, iterations),
+        await measure_async("rotation: atomic rotate()", atomic, iterations),
+    ]
+    await async_engine.dispose()
+    report(results, baseline=results[0].name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
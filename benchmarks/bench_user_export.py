@@ -0,0 +1,89 @@
+"""
+Full user dump: paging /admin/users-style ORM pages vs the streaming export.
+
+pages:  get_page() ORM entities -> UserResponse.model_validate -> JSON
+export: stream_export_rows() plain tuples over a server-side cursor -> NDJSON
+
+Reports rows/sec and checks the export against a target (default
+25,000 rows/s, which the aiosqlite driver clears with margin; pass a higher
+target when running against PostgreSQL via BENCH_DATABASE_URL).
+
+    python -m benchmarks.bench_user_export [users] [target_rows_per_sec]
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from benchmarks.harness import create_bench_database, measure_async, report
+
+from app.core.constants import MAX_PAGE_SIZE
+from app.db.models.role import Role
+from app.db.models.user import User
+from app.repositories.user_repo import AsyncUserRepository
+from app.schemas.user import UserResponse
+from app.services.user_service import UserService
+
+
+async def main(users: int, target: float) -> None:
+    SessionFactory, async_engine, AsyncSessionFactory = create_bench_database()
+    with SessionFactory() as db:
+        role_id = db.query(Role).filter(Role.name == "user").one().id
+        start = datetime.utcnow() - timedelta(days=365)
+        db.execute(insert(User), [
+            {
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password_hash": "x",
+                "role_id": role_id,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(users)
+        ])
+        db.commit()
+
+    async def pages(_: int) -> None:
+        async with AsyncSessionFactory() as db:
+            repo = AsyncUserRepository(db)
+            after, count = None, 0
+            while True:
+                page = await repo.get_page(limit=MAX_PAGE_SIZE, after=after)
+                if not page:
+                    break
+                for user in page:
+                    UserResponse.model_validate(user).model_dump_json()
+                count += len(page)
+                after = (page[-1].created_at, page[-1].id)
+            assert count == users
+
+    async def export(_: int) -> None:
+        async with AsyncSessionFactory() as db:
+            lines = 0
+            async for chunk in UserService(db).export_users("ndjson"):
+                lines += chunk.count("\n")
+            assert lines == users
+
+    results = [
+        await measure_async("full dump: ORM pages + UserResponse", pages, 3, warmup=1),
+        await measure_async("full dump: streaming NDJSON export", export, 3, warmup=1),
+    ]
+    await async_engine.dispose()
+    report(results, baseline=results[0].name)
+
+    for result in results:
+        print(f"{result.name}: {users * result.ops_per_sec:,.0f} rows/s")
+    rows_per_sec = users * results[1].ops_per_sec
+    verdict = "PASS" if rows_per_sec >= target else "FAIL"
+    print(f"export target {target:,.0f} rows/s: {verdict}")
+    if rows_per_sec < target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(
+        int(args[0]) if args else 50000,
+        float(args[1]) if len(args) > 1 else 25000.0,
+    ))
@@ -0,0 +1,60 @@
+"""
+Onboarding users: one-by-one register path vs the bulk import pipeline.
+
+Rows carry a pre-computed bcrypt hash so the comparison isolates the
+database work (bcrypt cost is the same either way and parallelizes
+across the hashing pool).
+
+single: get_by_email -> get_by_username -> role lookup -> create (commit)
+bulk:   UserImportService batches (set-based dedupe + multi-row INSERT)
+
+    python -m benchmarks.bench_user_import [users]
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks.harness import create_bench_database
+
+from app.core.security import get_password_hash
+from app.repositories.role_repo import AsyncRoleRepository
+from app.repositories.user_repo import AsyncUserRepository
+from app.schemas.user import UserCreate
+from app.services.user_import_service import UserImportService
+
+
+async def main(users: int) -> None:
+    SessionFactory, async_engine, AsyncSessionFactory = create_bench_database()
+    password_hash = get_password_hash("benchmark-password")
+
+    start = time.perf_counter()
+    async with AsyncSessionFactory() as db:
+        user_repo, role_repo = AsyncUserRepository(db), AsyncRoleRepository(db)
+        for i in range(users):
+            user_in = UserCreate(username=f"single{i}", email=f"single{i}@example.com", password="x" * 8)
+            assert not await user_repo.get_by_email(user_in.email)
+            assert not await user_repo.get_by_username(user_in.username)
+            role = await role_repo.get_by_name("user")
+            await user_repo.create(user_in, password_hash, role.id)
+    single = time.perf_counter() - start
+
+    records = (
+        (i + 1, {"username": f"bulk{i}", "email": f"bulk{i}@example.com", "password_hash": password_hash})
+        for i in range(users)
+    )
+    start = time.perf_counter()
+    async with AsyncSessionFactory() as db:
+        report = await UserImportService(db).import_users(records)
+    bulk = time.perf_counter() - start
+    assert report.created == users, report.errors[:5]
+
+    await async_engine.dispose()
+    print(f"{'case':<40} {'rows/s':>10} {'seconds':>9}")
+    print(f"{'single: register path per user':<40} {users / single:>10.0f} {single:>9.2f}")
+    print(f"{'bulk: UserImportService':<40} {users / bulk:>10.0f} {bulk:>9.2f}")
+    print(f"bulk: {single / bulk:.2f}x vs single")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
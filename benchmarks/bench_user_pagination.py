@@ -0,0 +1,66 @@
+"""
+Admin user listing: OFFSET pages vs keyset (cursor) pages at several depths.
+
+offset: ORDER BY created_at, id OFFSET depth LIMIT page
+keyset: WHERE (created_at, id) > cursor ORDER BY created_at, id LIMIT page
+
+    python -m benchmarks.bench_user_pagination [users] [iterations]
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from benchmarks.harness import create_bench_database, measure_async, report
+
+from app.db.models.role import Role
+from app.db.models.user import User
+from app.repositories.user_repo import AsyncUserRepository
+
+PAGE_SIZE = 100
+
+
+async def main(users: int, iterations: int) -> None:
+    SessionFactory, async_engine, AsyncSessionFactory = create_bench_database()
+    with SessionFactory() as db:
+        role_id = db.query(Role).filter(Role.name == "user").one().id
+        start = datetime.utcnow() - timedelta(days=365)
+        db.execute(insert(User), [
+            {
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "password_hash": "x",
+                "role_id": role_id,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(users)
+        ])
+        db.commit()
+
+    results = []
+    for depth in (0, users // 2, users - PAGE_SIZE):
+        # The cursor a client would hold after paging down to `depth`
+        async with AsyncSessionFactory() as db:
+            previous = await AsyncUserRepository(db).get_page(limit=1, offset=depth - 1) if depth else []
+        after = (previous[0].created_at, previous[0].id) if previous else None
+
+        async def offset_page(_: int, depth: int = depth) -> None:
+            async with AsyncSessionFactory() as db:
+                assert await AsyncUserRepository(db).get_page(limit=PAGE_SIZE, offset=depth)
+
+        async def keyset_page(_: int, after=after) -> None:
+            async with AsyncSessionFactory() as db:
+                assert await AsyncUserRepository(db).get_page(limit=PAGE_SIZE, after=after)
+
+        results.append(await measure_async(f"offset page @ {depth}", offset_page, iterations))
+        results.append(await measure_async(f"keyset page @ {depth}", keyset_page, iterations))
+
+    await async_engine.dispose()
+    report(results, baseline=results[0].name)
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*(args + [50000, 200][len(args):])))
@@ -0,0 +1,30 @@
+"""
+Compare two saved benchmark runs.
+
+    python -m benchmarks.compare baseline.json current.json [--threshold 0.10]
+
+Exits 1 if any case's ops/sec dropped more than the threshold.
+"""
+
+import argparse
+import sys
+
+from benchmarks.harness import compare_results, load_results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions between two result files")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed ops/sec drop (fraction)")
+    args = parser.parse_args()
+
+    regressions = compare_results(load_results(args.current), load_results(args.baseline), args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Benchmark harness.
+
+Shared helpers for the benchmark modules: a disposable database, timing
+loops for sync and async callables, result reporting, and JSON result
+files with a regression check against a stored baseline.
+"""
+
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Add project root to python path and provide the settings app.core.config
+# requires, so benchmarks run without a .env file.
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'sentinel_app.db')}"
+)
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db.base import Base
+from app.db.models.role import Role
+from app.db.session import get_async_database_url, get_connect_args, get_sync_database_url
+
+
+@dataclass
+class BenchResult:
+    """
+    Timing samples for one benchmark case.
+
+    Attributes:
+        name: Case name
+        samples: Per-operation latencies in seconds
+        total_seconds: Wall time of the measured loop
+    """
+    name: str
+    samples: List[float] = field(repr=False)
+    total_seconds: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        return len(self.samples) / self.total_seconds if self.total_seconds else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile, q in [0, 100]."""
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "iterations": len(self.samples),
+            "ops_per_sec": self.ops_per_sec,
+            "mean_ms": statistics.fmean(self.samples) * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+        }
+
+
+def measure(name: str, fn: Callable[[int], Any], iterations: int, warmup: int = 10) -> BenchResult:
+    """Time `fn(i)` for i in range(iterations) after `warmup` untimed calls."""
+    for i in range(warmup):
+        fn(-1 - i)
+    samples = []
+    clock = time.perf_counter
+    start = clock()
+    for i in range(iterations):
+        t0 = clock()
+        fn(i)
+        samples.append(clock() - t0)
+    return BenchResult(name, samples, clock() - start)
+
+
+async def measure_async(
+    name: str, fn: Callable[[int], Awaitable[Any]], iterations: int, warmup: int = 10
+) -> BenchResult:
+    """Async counterpart of measure(): awaits `fn(i)` sequentially."""
+    for i in range(warmup):
+        await fn(-1 - i)
+    samples = []
+    clock = time.perf_counter
+    start = clock()
+    for i in range(iterations):
+        t0 = clock()
+        await fn(i)
+        samples.append(clock() - t0)
+    return BenchResult(name, samples, clock() - start)
+
+
+def report(results: List[BenchResult], baseline: Optional[str] = None) -> None:
+    """Print a results table; with `baseline`, also print speedups against it."""
+    print(f"{'case':<40} {'ops/s':>10} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for result in results:
+        row = result.as_dict()
+        print(
+            f"{row['name']:<40} {row['ops_per_sec']:>10.1f} {row['mean_ms']:>9.3f} "
+            f"{row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} {row['p99_ms']:>9.3f}"
+        )
+    if baseline:
+        base = next(r for r in results if r.name == baseline)
+        for result in results:
+            if result is not base:
+                speedup = statistics.fmean(base.samples) / statistics.fmean(result.samples)
+                print(f"{result.name}: {speedup:.2f}x vs {baseline}")
+
+
+def save_results(results: List[BenchResult], path: str, suite: str) -> None:
+    """Write results plus run metadata as JSON (input for compare_results)."""
+    document = {
+        "suite": suite,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": bench_database_url().split("://", 1)[0],
+        "results": [result.as_dict() for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    print(f"Results written to {path}")
+
+
+def load_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read a save_results file, keyed by case name."""
+    with open(path, encoding="utf-8") as f:
+        return {row["name"]: row for row in json.load(f)["results"]}
+
+
+def compare_results(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float = 0.10,
+) -> List[str]:
+    """
+    Print per-case changes against a baseline and return regressed cases.
+
+    A case regresses when its throughput drops by more than `threshold`
+    (a fraction, 0.10 = 10%); p99 is shown for context only, since tail
+    latency of short runs is too noisy to gate on. Cases missing from
+    either side are listed but never count as regressions.
+    """
+    regressions = []
+    print(f"{'case':<40} {'ops/s':>10} {'base':>10} {'change':>8} {'p99 ms':>9} {'base':>9}")
+    for name, row in current.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<40} {row['ops_per_sec']:>10.1f} {'(new)':>10}")
+            continue
+        change = row["ops_per_sec"] / base["ops_per_sec"] - 1 if base["ops_per_sec"] else 0.0
+        regressed = change < -threshold
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:<40} {row['ops_per_sec']:>10.1f} {base['ops_per_sec']:>10.1f} {change:>+8.1%} "
+            f"{row['p99_ms']:>9.3f} {base['p99_ms']:>9.3f}{flag}"
+        )
+        if regressed:
+            regressions.append(name)
+    for name in baseline.keys() - current.keys():
+        print(f"{name:<40} {'(missing)':>10}")
+    return regressions
+
+
+def bench_database_url() -> str:
+    """Database for benchmarks: BENCH_DATABASE_URL or a temp SQLite file."""
+    return os.environ.get("BENCH_DATABASE_URL") or (
+        f"sqlite:///{os.path.join(tempfile.gettempdir(), 'sentinel_bench.db')}"
+    )
+
+
+def create_bench_database() -> Tuple[sessionmaker, AsyncEngine, async_sessionmaker]:
+    """
+    Recreate the schema in the benchmark database and seed default roles.
+
+    Returns:
+        (sync session factory, async engine, async session factory)
+    """
+    url = bench_database_url()
+    engine = create_engine(get_sync_database_url(url))
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    SessionFactory = sessionmaker(bind=engine, autoflush=False)
+    with SessionFactory() as db:
+        db.add_all([Role(name="user", description="Normal User"), Role(name="admin", description="Admin User")])
+        db.commit()
+
+    async_url = get_async_database_url(url)
+    async_engine = create_async_engine(async_url, connect_args=get_connect_args(async_url))
+    AsyncSessionFactory = async_sessionmaker(
+        bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+    return SessionFactory, async_engine, AsyncSessionFactory
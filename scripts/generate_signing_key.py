@@ -0,0 +1,60 @@
+"""
+Generate a JWT Signing Key.
+
+Writes a new private key as <kid>.pem into the key ring directory
+(JWT_KEYS_DIR). The kid defaults to today's date.
+
+Usage:
+    python scripts/generate_signing_key.py --dir ./keys --algorithm ES256
+    python scripts/generate_signing_key.py --dir ./keys --algorithm RS256 --kid 2026-10-rsa
+
+Rotation: add the new key, restart (it is published in the JWKS but not
+yet used), wait for resource servers' JWKS caches to refresh, set
+JWT_ACTIVE_KID to it and restart. Keep the old key until the tokens it
+signed have expired (REFRESH_TOKEN_EXPIRE_DAYS), optionally reduced to
+its public half so it can no longer sign.
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+# Add project root to python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CURVES = {"ES256": ec.SECP256R1, "ES384": ec.SECP384R1, "ES512": ec.SECP521R1}
+
+
+def generate(algorithm: str):
+    if algorithm in CURVES:
+        return ec.generate_private_key(CURVES[algorithm]())
+    return rsa.generate_private_key(public_exponent=65537, key_size=3072)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a JWT signing key")
+    parser.add_argument("--dir", required=True, help="Key ring directory (JWT_KEYS_DIR)")
+    parser.add_argument("--algorithm", default="ES256", choices=["RS256", "RS384", "RS512", *CURVES])
+    parser.add_argument("--kid", default=date.today().isoformat(), help="Key ID (file name without .pem)")
+    args = parser.parse_args()
+
+    path = os.path.join(args.dir, f"{args.kid}.pem")
+    if os.path.exists(path):
+        sys.exit(f"{path} already exists")
+    os.makedirs(args.dir, exist_ok=True)
+
+    pem = generate(args.algorithm).private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    print(f"Wrote {path} (kid={args.kid}, {args.algorithm})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Bulk Import Users Script.
+
+Creates users from an NDJSON or CSV file (columns: username, email and
+either password or a bcrypt password_hash; optional role). Plain
+passwords are hashed across the hashing process pool.
+
+Usage:
+    python scripts/import_users.py users.ndjson [--format csv] [--default-role user]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add project root to python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.constants import IMPORT_BATCH_SIZE, ROLE_USER
+from app.core.hashing import hashing_executor
+from app.db.session import AsyncSessionLocal, async_engine
+from app.services.user_import_service import UserImportService
+from app.utils.bulk_import import PARSERS
+from app.utils.logger import logger
+
+
+async def import_file(path: str, fmt: str, default_role: str, batch_size: int) -> int:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        text = f.read()
+    hashing_executor.start()
+    try:
+        async with AsyncSessionLocal() as db:
+            report = await UserImportService(db).import_users(
+                PARSERS[fmt](text), default_role=default_role, batch_size=batch_size
+            )
+    finally:
+        hashing_executor.shutdown()
+        await async_engine.dispose()
+
+    for error in report.errors:
+        logger.warning(f"line {error.line} ({error.username or '-'}): {error.error}")
+    logger.info(f"Received {report.received}, created {report.created}, failed {report.failed}")
+    return 1 if report.failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import users from NDJSON or CSV")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(PARSERS), help="Defaults to the file extension")
+    parser.add_argument("--default-role", default=ROLE_USER)
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    sys.exit(asyncio.run(import_file(args.path, fmt, args.default_role, args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.session import engine, SessionLocal
 from app.db.base import Base
+from app.core.permissions import DEFAULT_ROLE_PERMISSIONS
 from app.db.models.role import Role
+from app.repositories.role_repo import RoleRepository
 from app.utils.logger import logger
 
 def init_db(db: Session) -> None:
@@ -28,13 +30,15 @@ def init_db(db: Session) -> None:
     Base.metadata.create_all(bind=engine)
     logger.info("Database tables created/verified.")
 
-    # 2. Create Default Roles
-    roles = ["admin", "user"]
-    for role_name in roles:
+    # 2. Create Default Roles (with their default permissions)
+    role_repo = RoleRepository(db)
+    permissions = role_repo.sync_permission_catalog()
+    for role_name, granted in DEFAULT_ROLE_PERMISSIONS.items():
         role = db.query(Role).filter(Role.name == role_name).first()
         if not role:
             role = Role(name=role_name, description=f"Default {role_name} role")
             db.add(role)
+            role_repo.set_permissions(role, [permissions[name] for name in granted])
             logger.info(f"Created role: {role_name}")
         else:
             logger.info(f"Role exists: {role_name}")
@@ -0,0 +1,297 @@
+"""
+HTTP Load Generator.
+
+Drives a mixed auth workload (signup, login, refresh, /me, admin list)
+against a running server (--url) or the ASGI app in-process (--asgi).
+
+Open loop: requests are scheduled at the target arrival rate whatever
+the server's response times, so a slow server is not "helped" by a client
+that waits. Each latency is reported twice:
+- service: from when the request was actually sent
+- corrected: from when it was scheduled to be sent, which includes the
+  time it waited for a free connection slot (coordinated omission corrected)
+
+Usage:
+    python scripts/load_test.py --url http://localhost:8000 --rate 200 --duration 60
+    python scripts/load_test.py --asgi --mix login=1,refresh=4,me=20 --ramp 0:20,30:200,60:200
+
+The server's rate limiter and login throttle will reject most of a load
+test's traffic from one IP; disable them (RATE_LIMIT_ENABLED=false,
+LOGIN_THROTTLE_ENABLED=false) on the target. --asgi does so itself.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+# Add project root to python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+API = "/api/v1"
+PASSWORD = "loadtest-password"
+OPERATIONS = ("signup", "login", "refresh", "me", "admin_list")
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse "login=1,me=20" into normalized operation weights."""
+    weights = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    return {name: weight / total for name, weight in weights.items() if weight > 0}
+
+
+def parse_ramp(spec: Optional[str], rate: float, duration: float) -> List[Tuple[float, float]]:
+    """
+    Parse "t0:rate0,t1:rate1,..." (seconds:requests per second) into a
+    piecewise-linear arrival profile. Without a ramp the rate is constant.
+    """
+    if not spec:
+        return [(0.0, rate), (duration, rate)]
+    points = sorted((float(t), float(r)) for t, r in (p.split(":") for p in spec.split(",")))
+    if points[0][0] > 0:
+        points.insert(0, (0.0, points[0][1]))
+    return points
+
+
+def schedule(profile: List[Tuple[float, float]]) -> List[float]:
+    """Intended send times (seconds from start) for an arrival-rate profile."""
+    times = []
+    t = 0.0
+    end = profile[-1][0]
+    while t < end:
+        # Rate at t by linear interpolation between profile points
+        for (t0, r0), (t1, r1) in zip(profile, profile[1:]):
+            if t0 <= t <= t1:
+                rate = r0 + (r1 - r0) * ((t - t0) / (t1 - t0) if t1 > t0 else 0)
+                break
+        if rate <= 0:
+            t += 0.01
+            continue
+        times.append(t)
+        t += 1.0 / rate
+    return times
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+class VirtualUsers:
+    """
+    Accounts used by the workload. Refresh tokens are single-use, so a
+    user is checked out while its refresh is in flight.
+    """
+
+    def __init__(self):
+        self.access: List[str] = []
+        self.idle: asyncio.Queue = asyncio.Queue()
+        self.admin_token: Optional[str] = None
+        self.counter = 0
+
+    def next_name(self) -> str:
+        self.counter += 1
+        return f"load{os.getpid()}x{self.counter}"
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, float], max_in_flight: int):
+        self.client = client
+        self.mix = mix
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.users = VirtualUsers()
+        self.service: Dict[str, List[float]] = defaultdict(list)
+        self.corrected: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, Counter] = defaultdict(Counter)
+
+    async def _signup_and_login(self, username: str) -> Tuple[int, Optional[dict]]:
+        response = await self.client.post(
+            f"{API}/users/signup",
+            json={"username": username, "email": f"{username}@example.com", "password": PASSWORD},
+        )
+        if response.status_code != 201:
+            return response.status_code, None
+        response = await self.client.post(f"{API}/auth/login", json={"username": username, "password": PASSWORD})
+        return response.status_code, response.json() if response.status_code == 200 else None
+
+    async def setup(self, users: int, admin_username: Optional[str], admin_password: Optional[str]) -> None:
+        """Create the virtual users (and log the admin in) before measuring."""
+        results = await asyncio.gather(*(self._signup_and_login(self.users.next_name()) for _ in range(users)))
+        for status, tokens in results:
+            if tokens is None:
+                raise SystemExit(f"Setup failed: HTTP {status} creating a virtual user")
+            self.users.access.append(tokens["access_token"])
+            self.users.idle.put_nowait(tokens)
+        if admin_username:
+            response = await self.client.post(
+                f"{API}/auth/login", json={"username": admin_username, "password": admin_password}
+            )
+            if response.status_code != 200:
+                raise SystemExit(f"Admin login failed: HTTP {response.status_code}")
+            self.users.admin_token = response.json()["access_token"]
+
+    async def _request(self, op: str) -> httpx.Response:
+        users = self.users
+        if op == "signup":
+            username = users.next_name()
+            return await self.client.post(
+                f"{API}/users/signup",
+                json={"username": username, "email": f"{username}@example.com", "password": PASSWORD},
+            )
+        if op == "login":
+            # Log in as an existing virtual user (signup order is stable)
+            username = f"load{os.getpid()}x{random.randint(1, len(users.access))}"
+            return await self.client.post(f"{API}/auth/login", json={"username": username, "password": PASSWORD})
+        if op == "refresh":
+            tokens = await users.idle.get()
+            try:
+                response = await self.client.post(
+                    f"{API}/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+                )
+                if response.status_code == 200:
+                    tokens = response.json()
+                return response
+            finally:
+                users.idle.put_nowait(tokens)
+        if op == "me":
+            token = random.choice(users.access)
+            return await self.client.get(f"{API}/users/me", headers={"Authorization": f"Bearer {token}"})
+        return await self.client.get(
+            f"{API}/admin/users", params={"limit": 50},
+            headers={"Authorization": f"Bearer {users.admin_token}"},
+        )
+
+    async def fire(self, op: str, intended: float) -> None:
+        async with self.slots:
+            sent = time.perf_counter()
+            try:
+                response = await self._request(op)
+                error = None if response.status_code < 400 else str(response.status_code)
+            except httpx.TimeoutException:
+                error = "timeout"
+            except httpx.HTTPError as e:
+                error = type(e).__name__
+            done = time.perf_counter()
+        if error:
+            self.errors[op][error] += 1
+        else:
+            self.service[op].append(done - sent)
+            self.corrected[op].append(done - intended)
+
+    async def run(self, send_times: List[float]) -> float:
+        ops, weights = zip(*self.mix.items())
+        plan = random.choices(ops, weights=weights, k=len(send_times))
+        tasks = []
+        start = time.perf_counter()
+        for offset, op in zip(send_times, plan):
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(self.fire(op, intended)))
+        await asyncio.gather(*tasks)
+        return time.perf_counter() - start
+
+    def report(self, elapsed: float, scheduled: int) -> dict:
+        rows = {}
+        for op in self.mix:
+            ok = sorted(self.corrected[op])
+            service = sorted(self.service[op])
+            errors = dict(self.errors[op])
+            rows[op] = {
+                "ok": len(ok),
+                "errors": errors,
+                "throughput": len(ok) / elapsed if elapsed else 0.0,
+                "corrected_ms": {f"p{q}": percentile(ok, q) * 1000 for q in (50, 90, 99, 99.9)},
+                "service_ms": {f"p{q}": percentile(service, q) * 1000 for q in (50, 90, 99, 99.9)},
+                "max_ms": (ok[-1] * 1000) if ok else 0.0,
+            }
+        return {"elapsed_seconds": elapsed, "scheduled": scheduled, "operations": rows}
+
+
+def print_report(result: dict) -> None:
+    print(f"\n{result['scheduled']} requests scheduled in {result['elapsed_seconds']:.1f}s")
+    print(
+        f"{'op':<11} {'ok':>7} {'req/s':>8} {'p50':>8} {'p90':>8} {'p99':>8} {'p99.9':>8} "
+        f"{'svc p99':>8} {'max':>8}  errors"
+    )
+    for op, row in result["operations"].items():
+        c, s = row["corrected_ms"], row["service_ms"]
+        errors = ", ".join(f"{k}x{v}" for k, v in sorted(row["errors"].items())) or "-"
+        print(
+            f"{op:<11} {row['ok']:>7} {row['throughput']:>8.1f} {c['p50']:>8.1f} {c['p90']:>8.1f} "
+            f"{c['p99']:>8.1f} {c['p99.9']:>8.1f} {s['p99']:>8.1f} {row['max_ms']:>8.1f}  {errors}"
+        )
+    print("Latencies in ms, corrected for coordinated omission; 'svc p99' is measured from the actual send.")
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    mix = parse_mix(args.mix)
+    if "admin_list" in mix and not args.admin_username:
+        raise SystemExit("admin_list needs --admin-username/--admin-password")
+    send_times = schedule(parse_ramp(args.ramp, args.rate, args.duration))
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+
+    if args.asgi:
+        os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+        os.environ.setdefault("LOGIN_THROTTLE_ENABLED", "false")
+        from app.main import app
+
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout) as client:
+                return await run_test(client, mix, send_times, args)
+
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        return await run_test(client, mix, send_times, args)
+
+
+async def run_test(client: httpx.AsyncClient, mix: Dict[str, float], send_times: List[float], args) -> dict:
+    test = LoadTest(client, mix, args.max_in_flight)
+    print(f"Creating {args.users} virtual users...")
+    await test.setup(args.users, args.admin_username, args.admin_password)
+    print(f"Sending {len(send_times)} requests over {send_times[-1] if send_times else 0:.0f}s...")
+    elapsed = await test.run(send_times)
+    return test.report(elapsed, len(send_times))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Open-loop load generator for SentinelAuth")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server")
+    target.add_argument("--asgi", action="store_true", help="Drive app.main:app in-process")
+    parser.add_argument("--mix", default="login=1,refresh=4,me=20", help="Operation weights, e.g. signup=1,me=10")
+    parser.add_argument("--rate", type=float, default=50.0, help="Requests per second (constant profile)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds (constant profile)")
+    parser.add_argument("--ramp", help="Rate profile 't:rate,...', e.g. 0:10,30:200,60:200 (overrides --rate/--duration)")
+    parser.add_argument("--users", type=int, default=50, help="Virtual users created before the run")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Concurrent requests / connections")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--admin-username")
+    parser.add_argument("--admin-password")
+    parser.add_argument("--json", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
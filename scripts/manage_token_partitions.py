@@ -0,0 +1,72 @@
+"""
+Manage refresh_tokens Partitions Script (PostgreSQL).
+
+Commands:
+    convert   Turn refresh_tokens into a monthly-partitioned table
+    revert    Turn it back into a single plain table
+    maintain  Create upcoming partitions and drop fully expired ones
+    list      Show existing partitions
+
+Usage:
+    python scripts/manage_token_partitions.py maintain
+"""
+
+import argparse
+import sys
+import os
+from datetime import timedelta
+
+# Add project root to python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db import partitions
+from app.db.session import engine
+from app.utils.logger import logger
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage refresh_tokens partitions")
+    parser.add_argument("command", choices=["convert", "revert", "maintain", "list"])
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        logger.error("Partitioning is only supported on PostgreSQL.")
+        sys.exit(1)
+
+    with engine.begin() as conn:
+        partitioned = partitions.is_partitioned(conn)
+
+        if args.command == "convert":
+            if partitioned:
+                logger.info("refresh_tokens is already partitioned.")
+                return
+            partitions.partition_refresh_tokens(conn, months_ahead=settings.TOKEN_PARTITION_MONTHS_AHEAD)
+            logger.info("refresh_tokens converted. Set REFRESH_TOKENS_PARTITIONED=True.")
+
+        elif args.command == "revert":
+            if not partitioned:
+                logger.info("refresh_tokens is not partitioned.")
+                return
+            partitions.unpartition_refresh_tokens(conn)
+            logger.info("refresh_tokens reverted. Set REFRESH_TOKENS_PARTITIONED=False.")
+
+        elif not partitioned:
+            logger.error("refresh_tokens is not partitioned; run 'convert' first.")
+            sys.exit(1)
+
+        elif args.command == "maintain":
+            created, dropped = partitions.maintain_partitions(
+                conn,
+                months_ahead=settings.TOKEN_PARTITION_MONTHS_AHEAD,
+                retention=timedelta(days=settings.TOKEN_PARTITION_RETENTION_DAYS),
+            )
+            logger.info(f"Partitions created: {created}, dropped: {dropped}")
+
+        else:
+            for name, start in partitions.list_partitions(conn):
+                logger.info(f"{name}: expires_at in {start:%Y-%m}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Purge Refresh Tokens Script.
+
+Deletes expired and long-revoked refresh tokens in bounded batches.
+Suitable for cron when the in-app purger (TOKEN_PURGE_ENABLED) is off.
+
+Usage:
+    python scripts/purge_tokens.py [--batch-size N] [--sleep SECONDS]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add project root to python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.db.session import async_engine
+from app.services.token_purge_service import TokenPurgeService
+from app.utils.logger import logger
+
+
+async def purge(batch_size: int, sleep: float) -> None:
+    purger = TokenPurgeService(batch_size=batch_size, batch_sleep=sleep)
+    try:
+        report = await purger.purge_once()
+        logger.info(
+            f"Deleted {report.expired_deleted + report.revoked_deleted} tokens "
+            f"({report.rows_per_sec:.0f} rows/s, {report.seconds:.1f}s, lag {report.lag_seconds:.0f}s)"
+        )
+    finally:
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Purge expired and revoked refresh tokens")
+    parser.add_argument("--batch-size", type=int, default=settings.TOKEN_PURGE_BATCH_SIZE)
+    parser.add_argument("--sleep", type=float, default=settings.TOKEN_PURGE_BATCH_SLEEP_SECONDS)
+    args = parser.parse_args()
+    asyncio.run(purge(args.batch_size, args.sleep))
+
+
+if __name__ == "__main__":
+    main()
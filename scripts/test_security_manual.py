@@ -17,7 +17,7 @@ from jose import jwt
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.security import get_password_hash, verify_password, decode_token
-from app.core.tokens import create_access_token, create_refresh_token
+from app.core.tokens import create_access_token, create_refresh_token, generate_token_id
 from app.core.constants import TOKEN_TYPE_ACCESS, TOKEN_TYPE_REFRESH
 
 def test_password_hashing():
@@ -59,7 +59,8 @@ def test_tokens():
     print("✅ Access token verified")
     
     # 2. Refresh Token
-    refresh_token = create_refresh_token(user_id)
+    jti = generate_token_id()
+    refresh_token = create_refresh_token(user_id, jti)
     print(f"Refresh Token Generated: {refresh_token[:20]}...")
     
     # Decode
@@ -68,6 +69,7 @@ def test_tokens():
     
     assert payload_refresh["sub"] == user_id
     assert payload_refresh["type"] == TOKEN_TYPE_REFRESH
+    assert payload_refresh["jti"] == jti
     # Refresh token implies much longer expiry
     assert payload_refresh["exp"] > payload["exp"]
     print("✅ Refresh token verified")